@@ -1,13 +1,12 @@
-from functools import lru_cache
+"""Single-bed rotation demo: 1 bed, 20 years, 10-action palette.
 
-import pandas as pd
-
-from les_state_reduction import (
-    SoilBounds,
-    SoilBuckets,
-    SoilDelta,
-    apply_soil_delta_guarded,
-)
+Importing this module only defines the input tables; the dynamics live in
+:mod:`les.optimizer`. Call :func:`build_problem` / :func:`run` (or execute the
+module) to solve.
+"""
+from les.optimizer import RotationProblem, RotationState, solve
+from les.optimizer.report import plan_frame, plan_rows, plan_summary
+from les_state_reduction import SoilBounds
 
 # --- "Simple version" demo: 1 bed, 1 year (4 seasonal slots), 10-action palette ---
 # Prices: AUD/kg (seeded from earlier discussion; treat as illustrative inputs).
@@ -128,18 +127,6 @@ DISEASE_HALF_LIFE = 8
 
 actions = list(prices.keys())
 
-def expand_series(series, total_len):
-    if not series:
-        raise ValueError("Series cannot be empty")
-    out = []
-    while len(out) < total_len:
-        out.extend(series)
-    return out[:total_len]
-
-for act in actions:
-    yields[act] = expand_series(yields[act], T)
-    costs[act] = expand_series(costs[act], T)
-
 def validate_inputs():
     sets = [
         ("prices", prices),
@@ -158,142 +145,63 @@ def validate_inputs():
         elif mapping_keys != keys:
             raise ValueError(f"Action keys mismatch in {name}: {mapping_keys ^ keys}")
 
+    # Yields and costs are seasonal cycles, repeated over the horizon.
     for act in keys or []:
         if prices[act] < 0:
             raise ValueError(f"Negative price for {act}")
-        if len(yields[act]) != T:
-            raise ValueError(f"Yield length for {act} does not match T={T}")
-        if len(costs[act]) != T:
-            raise ValueError(f"Cost length for {act} does not match T={T}")
+        if not yields[act]:
+            raise ValueError(f"Yield cycle for {act} is empty")
+        if not costs[act]:
+            raise ValueError(f"Cost cycle for {act} is empty")
         if any(y < 0 for y in yields[act]):
             raise ValueError(f"Negative yield for {act}")
         if any(c < 0 for c in costs[act]):
             raise ValueError(f"Negative cost for {act}")
 
-validate_inputs()
-
-def clamp(v, lo, hi):
-    return max(lo, min(hi, v))
-
-def disease_decay_factor(half_life_seasons: int) -> float:
-    if half_life_seasons <= 0:
-        raise ValueError("half-life must be positive")
-    return 0.5 ** (1.0 / half_life_seasons)
-
-def step_soil(N, C, S, D, act):
-    dN, dC, dS = soil_delta[act]
-    dD = disease_delta[act]
-    state = SoilBuckets(n=N, c=C, s=S, d=D, f=0)
-    decayed = int(round(D * disease_decay_factor(DISEASE_HALF_LIFE)))
-    delta = SoilDelta(dn=dN, dc=dC, ds=dS, dd=dD + (decayed - D))
-    limits = {"n": N_MAX, "c": C_MAX, "s": S_MAX, "d": D_MAX}
-    bounds = SoilBounds(min_n=N_MIN, min_c=C_MIN, min_s=S_MIN, max_d=D_MAX)
-    try:
-        updated = apply_soil_delta_guarded(state, delta, limits, bounds)
-    except ValueError:
-        return None
-    return (updated.n, updated.c, updated.s, updated.d)
-
-def step_resources(K, act):
-    water_use, dK = resource_delta[act]
-    if water_use > W_BUDGET:
-        return None
-    if K + dK < 0:
-        return None
-    K2 = clamp(K + dK, 0, K_MAX)
-    return K2
-
-def profit(act, t_idx):
-    return prices[act] * yields[act][t_idx] - costs[act][t_idx]
-
-def allowed(prev_family, act_family):
-    # Simple rotation rule: no same family consecutively,
-    # but "Cover" resets pressure (allow following any, and allow cover after anything).
-    if act_family == "Cover":
-        return True
-    if prev_family == "Cover":
-        return True
-    return act_family != prev_family
 
-@lru_cache(None)
-def dp(t, N, C, S, D, K, prev_fam, tomato_cd):
-    # Return (best_value, best_action, next_state_tuple)
-    if t == T:
-        return (0.0, None, None)
+def build_problem(horizon=T):
+    validate_inputs()
+    return RotationProblem.from_tables(
+        prices, family, yields, costs,
+        soil_delta, disease_delta, resource_delta,
+        horizon=horizon,
+        n_max=N_MAX, c_max=C_MAX, s_max=S_MAX, d_max=D_MAX,
+        bounds=SoilBounds(
+            min_n=N_MIN, min_c=C_MIN, min_s=S_MIN, max_d=D_MAX
+        ),
+        disease_half_life=DISEASE_HALF_LIFE,
+        water_budget=W_BUDGET,
+        k_max=K_MAX,
+        cooldown_crop="Tomato",
+        cooldown_seasons=2 * SEASONS_PER_YEAR,
+    )
 
-    best = (-1e18, None, None)
-    for act in actions:
-        fam = family[act]
-        if not allowed(prev_fam, fam):
-            continue
-        if act == "Tomato" and tomato_cd > 0:
-            continue
-
-        nxt_soil = step_soil(N, C, S, D, act)
-        if nxt_soil is None:
-            continue
-        N2, C2, S2, D2 = nxt_soil
-
-        K2 = step_resources(K, act)
-        if K2 is None:
-            continue
-
-        next_cd = max(0, tomato_cd - 1)
-        if act == "Tomato":
-            next_cd = 2 * SEASONS_PER_YEAR
-
-        val_next, _, _ = dp(t + 1, N2, C2, S2, D2, K2, fam, next_cd)
-        val = profit(act, t) + val_next
-
-        if val > best[0]:
-            best = (val, act, (N2, C2, S2, D2, K2, fam, next_cd))
-    return best
 
 # Initial state (example)
 N0, C0, S0, D0 = 4, 4, 4, 1
 K0 = 2
-prev_fam0 = "None"
+prev_fam0 = None
 tomato_cd0 = 0
 
-best_total, _, _ = dp(0, N0, C0, S0, D0, K0, prev_fam0, tomato_cd0)
+INITIAL = RotationState(
+    N0, C0, S0, D0, K0, family=prev_fam0, cooldown=tomato_cd0
+)
 
-# Reconstruct policy
-rows = []
-N, C, S, D, K, prev_fam, tomato_cd = (N0, C0, S0, D0, K0, prev_fam0, tomato_cd0)
-for t in range(T):
-    val, act, nxt = dp(t, N, C, S, D, K, prev_fam, tomato_cd)
-    if act is None:
-        rows.append({"Season": t+1, "Action": None, "Family": None, "Profit(AUD)": None,
-                     "N": N, "C": C, "S": S, "D": D, "K": K,
-                     "N_next": None, "C_next": None, "S_next": None, "D_next": None,
-                     "K_next": None, "W_used": None})
-        break
-    N2, C2, S2, D2, K2, fam, tomato_cd2 = nxt
-    rows.append({
-        "Season": t+1,
-        "Action": act,
-        "Family": family[act],
-        "Price(AUD/kg)": prices[act],
-        "Yield(kg/bed)": yields[act][t],
-        "Cost(AUD/bed)": costs[act][t],
-        "Profit(AUD)": round(profit(act, t), 2),
-        "N": N, "C": C, "S": S, "D": D, "K": K,
-        "N_next": N2, "C_next": C2, "S_next": S2, "D_next": D2,
-        "K_next": K2, "W_used": resource_delta[act][0],
-    })
-    N, C, S, D, K, prev_fam, tomato_cd = N2, C2, S2, D2, K2, fam, tomato_cd2
 
-plan = pd.DataFrame(rows)
+def run(initial=INITIAL, horizon=T):
+    """Solve the demo; return ``(plan, summary)``. Needs pandas."""
+    problem = build_problem(horizon)
+    steps = solve(problem, keep_values=False).plan(initial)
+    plan = plan_frame(plan_rows(problem, initial, steps))
+    return plan, plan_summary(problem, initial, steps)
+
+
+def main():
+    plan, summary = run()
+    print(plan.to_string(index=False))
+    for key, value in summary.items():
+        print(f"{key}: {value}")
 
-summary = {
-    "Total profit (AUD)": round(plan["Profit(AUD)"].dropna().sum(), 2),
-    "End soil (N,C,S,D)": (N, C, S, D),
-    "End resources (K)": (K,),
-    "Constraints": (
-        f"N,C,S >= ({N_MIN},{C_MIN},{S_MIN}); D <= {D_MAX}; "
-        "no same-family back-to-back (Cover resets); "
-        "Tomato cooldown 2 years."
-    ),
-}
 
-plan, summary
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,90 @@
 """Threshold-based alert engine for LES."""
 from __future__ import annotations
 from typing import Dict, List, Tuple, Optional
+from weakref import WeakKeyDictionary
 
 from .state import StateRegistry, state
 
 
+class _RegistryView:
+    """Alerts last computed for one registry and the version they reflect."""
+
+    def __init__(self, version: int, thresholds_version: int) -> None:
+        self.version = version
+        self.thresholds_version = thresholds_version
+        self.active: Dict[str, List[str]] = {}
+
+
 class AlertEngine:
-    """Simple threshold alert engine."""
+    """Simple threshold alert engine.
+
+    For registries that track changes, :meth:`check` only re-evaluates
+    variables written since the previous check and keeps the alerts of the
+    others; registries without change tracking are checked in full.
+    """
 
     def __init__(self) -> None:
         self._thresholds: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        self._thresholds_version = 0
+        self._views: "WeakKeyDictionary[StateRegistry, _RegistryView]" = (
+            WeakKeyDictionary()
+        )
 
     def register_threshold(self, key: str, low: Optional[float] = None, high: Optional[float] = None) -> None:
         """Register acceptable range for a variable."""
         self._thresholds[key] = (low, high)
+        self._thresholds_version += 1
 
-    def check(self, registry: StateRegistry = state) -> List[str]:
-        """Check all thresholds and return alert messages."""
+    def _evaluate(self, registry: StateRegistry, key: str) -> List[str]:
+        low, high = self._thresholds[key]
+        try:
+            value = registry.get(key)
+        except KeyError:
+            return []
+        if value is None:
+            return []
         alerts: List[str] = []
-        for key, (low, high) in self._thresholds.items():
-            try:
-                value = registry.get(key)
-            except KeyError:
-                continue
-            if value is None:
-                continue
-            if low is not None and value < low:
-                alerts.append(f"{key} below threshold ({value} < {low})")
-            if high is not None and value > high:
-                alerts.append(f"{key} above threshold ({value} > {high})")
+        if low is not None and value < low:
+            alerts.append(f"{key} below threshold ({value} < {low})")
+        if high is not None and value > high:
+            alerts.append(f"{key} above threshold ({value} > {high})")
         return alerts
 
+    def check(self, registry: StateRegistry = state) -> List[str]:
+        """Check all thresholds and return alert messages."""
+        if not hasattr(registry, "changes_since"):
+            return [
+                alert
+                for key in self._thresholds
+                for alert in self._evaluate(registry, key)
+            ]
+
+        view = self._views.get(registry)
+        if view is None or view.thresholds_version != self._thresholds_version:
+            view = _RegistryView(registry.version, self._thresholds_version)
+            self._views[registry] = view
+            keys = list(self._thresholds)
+        else:
+            since, view.version = view.version, registry.version
+            keys = [
+                key
+                for key in registry.changes_since(since)
+                if key in self._thresholds
+            ]
+        for key in keys:
+            alerts = self._evaluate(registry, key)
+            if alerts:
+                view.active[key] = alerts
+            else:
+                view.active.pop(key, None)
+        active = view.active
+        return [
+            alert
+            for key in self._thresholds
+            if key in active
+            for alert in active[key]
+        ]
+
 
 # Global alert engine instance with default thresholds
 alert_engine = AlertEngine()
@@ -1,28 +1,88 @@
 """Simple CLI for interacting with the Living Environment System."""
 import argparse
+from typing import Dict, Iterable, Optional
 
-from .modules.events.logger import get_recent_events, log_event
+from .modules.events.logger import (
+    get_recent_events,
+    log_event,
+    query_events,
+    use_event_store,
+)
 from .modules.events.types import EventType
 
-def show_recent_events(limit: int = 5) -> None:
-    """Print recent events to stdout."""
-    events = get_recent_events(limit)
+
+def _print_events(events: Iterable[Dict[str, str]]) -> None:
     for event in events:
         print(f"{event['timestamp']} - {event['event_type']}: {event['details']}")
 
+
+def show_recent_events(limit: int = 5) -> None:
+    """Print recent events to stdout."""
+    _print_events(get_recent_events(limit))
+
+
+def show_events(
+    event_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> None:
+    """Print events matching a type and ``[since, until)`` timestamp range."""
+    _print_events(query_events(event_type, since, until, limit))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Living Environment System CLI")
     parser.add_argument("--show-events", action="store_true", help="Display recent events")
-    parser.add_argument("--limit", type=int, default=5, help="Number of events to display")
-    parser.add_argument("--log-event", nargs=2, metavar=("TYPE", "DETAILS"), help="Log a new event")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Number of events to display (default 5; all for queries)",
+    )
+    parser.add_argument(
+        "--log-event",
+        nargs=2,
+        metavar=("TYPE", "DETAILS"),
+        help="Log a new event",
+    )
+    parser.add_argument(
+        "--type",
+        dest="event_type",
+        help="Only show events of this type, e.g. "
+        + ", ".join(t.value for t in EventType),
+    )
+    parser.add_argument(
+        "--since", help="Only show events at or after this ISO timestamp"
+    )
+    parser.add_argument(
+        "--until", help="Only show events before this ISO timestamp"
+    )
+    parser.add_argument(
+        "--db", help="Use the indexed SQLite event store at this path"
+    )
+    parser.add_argument(
+        "--migrate-csv",
+        action="store_true",
+        help="Import the CSV event log into an empty --db store",
+    )
     args = parser.parse_args()
 
+    if args.db:
+        use_event_store(args.db, migrate_csv=args.migrate_csv)
+    elif args.migrate_csv:
+        parser.error("--migrate-csv requires --db")
+
     if args.log_event:
         event_type, details = args.log_event
         log_event(event_type, details)
 
     if args.show_events:
-        show_recent_events(args.limit)
+        if args.event_type or args.since or args.until:
+            show_events(args.event_type, args.since, args.until, args.limit)
+        else:
+            show_recent_events(5 if args.limit is None else args.limit)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,177 @@
+"""Multi-rate coupling of LES modules on a shared simulation clock.
+
+Each module registers a step callable and its own interval in seconds. The
+coupler keeps a heap of due times and jumps the shared clock straight to the
+next due module, so a seasonal optimizer registered next to a 1 s pump loop is
+only called once per season instead of at the pump's rate. Modules that want
+``dt`` in other units (e.g. hours for
+:func:`les.modules.energy.usage.update_energy_usage`) register a ``dt_scale``.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+
+SECONDS_PER_HOUR = 3600.0
+SECONDS_PER_DAY = 24 * SECONDS_PER_HOUR
+
+
+@dataclass
+class ModuleStats:
+    """Wall-clock cost of a module's steps and how many of them raised."""
+
+    steps: int = 0
+    errors: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.steps if self.steps else 0.0
+
+
+@dataclass
+class _Module:
+    name: str
+    step: Callable[[float], Any]
+    interval: float
+    dt_scale: float
+    priority: int
+    origin: float
+    last_time: float
+    calls: int = 0
+    pending: int = -1
+    stats: ModuleStats = field(default_factory=ModuleStats)
+
+
+class Coupler:
+    """Drive modules with different step intervals from one timeline.
+
+    Parameters
+    ----------
+    start:
+        Initial simulation time in seconds.
+    clock:
+        Wall clock used to measure per-module step cost.
+    """
+
+    def __init__(
+        self,
+        start: float = 0.0,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.now = start
+        self.clock = clock
+        self._modules: Dict[str, _Module] = {}
+        self._heap: list[tuple[float, int, int, str]] = []
+        self._seq = itertools.count()
+
+    def register(
+        self,
+        name: str,
+        step: Callable[[float], Any],
+        interval: float,
+        *,
+        dt_scale: float = 1.0,
+        offset: float = 0.0,
+        priority: int = 0,
+    ) -> None:
+        """Register ``step(dt)`` to run every ``interval`` seconds.
+
+        Parameters
+        ----------
+        name:
+            Unique module name, used for stats.
+        step:
+            Callable receiving the elapsed time since its previous call (or
+            since registration) multiplied by ``dt_scale``.
+        interval:
+            Seconds between calls.
+        dt_scale:
+            Unit conversion for ``dt``, e.g. ``1 / SECONDS_PER_HOUR``.
+        offset:
+            Extra delay before the first call.
+        priority:
+            Lower values run first when several modules are due at once.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if name in self._modules:
+            raise ValueError(f"Module {name!r} is already registered")
+        module = _Module(
+            name, step, interval, dt_scale, priority,
+            self.now + offset, self.now,
+        )
+        self._modules[name] = module
+        self._schedule(module)
+
+    def _schedule(self, module: _Module) -> None:
+        # Due times come from the module's own grid so rounding never
+        # accumulates.
+        module.pending = next(self._seq)
+        due = module.origin + (module.calls + 1) * module.interval
+        entry = (due, module.priority, module.pending, module.name)
+        heapq.heappush(self._heap, entry)
+
+    def unregister(self, name: str) -> None:
+        # Heap entries of removed modules are discarded lazily when popped.
+        del self._modules[name]
+
+    @property
+    def stats(self) -> Dict[str, ModuleStats]:
+        return {name: module.stats for name, module in self._modules.items()}
+
+    def next_due(self) -> float | None:
+        while self._heap:
+            _, _, seq, name = self._heap[0]
+            module = self._modules.get(name)
+            if module is not None and module.pending == seq:
+                return self._heap[0][0]
+            heapq.heappop(self._heap)
+        return None
+
+    def step(self) -> str | None:
+        """Jump to the next due module and run it; return its name.
+
+        An exception from the module's step propagates, but the module is
+        still rescheduled and the failure is counted in its stats.
+        """
+        due = self.next_due()
+        if due is None:
+            return None
+        name = heapq.heappop(self._heap)[3]
+        module = self._modules[name]
+        self.now = due
+        dt = (due - module.last_time) * module.dt_scale
+        module.last_time = due
+
+        started = self.clock()
+        try:
+            module.step(dt)
+        except Exception:
+            module.stats.errors += 1
+            raise
+        finally:
+            cost = self.clock() - started
+            module.stats.steps += 1
+            module.stats.total_s += cost
+            module.stats.max_s = max(module.stats.max_s, cost)
+            module.calls += 1
+            if self._modules.get(name) is module:
+                self._schedule(module)
+        return name
+
+    def run_until(self, until: float) -> int:
+        """Run every step due at or before ``until``; return how many ran."""
+        count = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > until:
+                break
+            self.step()
+            count += 1
+        self.now = max(self.now, until)
+        return count
@@ -1,5 +1,33 @@
 """Event utilities for the Living Environment System."""
-from .logger import log_event, get_recent_events
+from .logger import (
+    BufferedEventWriter,
+    close_event_store,
+    disable_buffered_writes,
+    enable_buffered_writes,
+    get_recent_events,
+    log_event,
+    close_segmented_log,
+    query_events,
+    use_event_store,
+    use_segmented_log,
+)
+from .segments import SegmentedEventLog
+from .store import SQLiteEventStore, migrate_csv
 from .types import EventType
 
-__all__ = ["log_event", "get_recent_events", "EventType"]
+__all__ = [
+    "log_event",
+    "get_recent_events",
+    "query_events",
+    "EventType",
+    "BufferedEventWriter",
+    "enable_buffered_writes",
+    "disable_buffered_writes",
+    "SQLiteEventStore",
+    "use_event_store",
+    "close_event_store",
+    "migrate_csv",
+    "SegmentedEventLog",
+    "use_segmented_log",
+    "close_segmented_log",
+]
@@ -0,0 +1,65 @@
+"""Measure event logging throughput, synchronous versus buffered.
+
+Run ``python -m les.modules.events.benchmark [--events N]`` to print the
+events per second of both write paths into a temporary CSV file.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict
+
+from . import logger
+
+
+def measure(events: int, path: Path, buffered: bool, **writer_kwargs) -> float:
+    """Log ``events`` events to ``path`` and return events per second.
+
+    The buffered timing includes the final flush, so both numbers cover
+    getting every row into the file.
+    """
+    saved_log, saved_file = logger._EVENT_LOG, logger._EVENT_LOG_FILE
+    logger._EVENT_LOG = deque(maxlen=logger._EVENT_LOG_MAXLEN)
+    logger._EVENT_LOG_FILE = path
+    try:
+        writer = None
+        if buffered:
+            writer = logger.enable_buffered_writes(**writer_kwargs)
+        started = time.perf_counter()
+        for i in range(events):
+            logger.log_event("benchmark", f"event {i}")
+        if writer is not None:
+            writer.flush()
+        elapsed = time.perf_counter() - started
+    finally:
+        if buffered:
+            logger.disable_buffered_writes()
+        logger._EVENT_LOG, logger._EVENT_LOG_FILE = saved_log, saved_file
+    return events / elapsed if elapsed > 0 else float("inf")
+
+
+def run(events: int = 10_000) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        return {
+            mode: measure(
+                events, Path(tmp) / f"{mode}.csv", buffered=mode == "buffered"
+            )
+            for mode in ("sync", "buffered")
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--events", type=int, default=10_000, help="Events to log per run"
+    )
+    args = parser.parse_args()
+    for mode, rate in run(args.events).items():
+        print(f"{mode:>8}: {rate:,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,242 @@
 """Event logging utilities for the Living Environment System."""
 from __future__ import annotations
 
+import atexit
 import csv
+import io
+import os
+import queue
+import threading
+import time
+from collections import deque
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Deque, Dict, List, Optional, Union
 
+from .segments import SegmentedEventLog
+from .store import SQLiteEventStore, TimeBound, TypeFilter
 from .types import EventType
 
-# In-memory list of event dictionaries
-_EVENT_LOG: List[Dict[str, str]] = []
+# Bounded in-memory ring of the most recent event dictionaries
+_EVENT_LOG_MAXLEN = 1000
+_EVENT_LOG: Deque[Dict[str, str]] = deque(maxlen=_EVENT_LOG_MAXLEN)
 
 # CSV file to persist events between runs
 _EVENT_LOG_FILE = Path(__file__).with_name("events.csv")
 
+# Default location of the indexed SQLite event store
+_EVENT_DB_FILE = Path(__file__).with_name("events.db")
+
+# Default folder of the segmented event log
+_EVENT_SEGMENT_DIR = Path(__file__).with_name("events")
+
+_FIELDNAMES = ["timestamp", "event_type", "details"]
+
+
+class BufferedEventWriter:
+    """Append events to a CSV file from a background thread.
+
+    The file stays open and rows are written in batches. Buffers are flushed
+    every ``flush_every`` events, every ``flush_interval`` seconds and on
+    :meth:`close`, so callers of :meth:`write` never wait on disk I/O.
+
+    Parameters
+    ----------
+    path:
+        CSV file to append to; the header is written if it is new or empty.
+    flush_every:
+        Flush after this many buffered events.
+    flush_interval:
+        Flush at least this often (seconds) while events are pending.
+    fsync:
+        Also ``os.fsync`` on every flush; the file is always synced on close.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        path: Path,
+        flush_every: int = 256,
+        flush_interval: float = 0.2,
+        fsync: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.written = 0
+        self.flushes = 0
+        self._queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self._closed = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        self._file = self.path.open("a", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=_FIELDNAMES)
+        if new_file:
+            self._writer.writeheader()
+        self._thread = threading.Thread(
+            target=self._run, name="les-event-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, entry: Dict[str, str]) -> None:
+        if self._closed:
+            raise ValueError("Event writer is closed")
+        self._queue.put(entry)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every event written so far is flushed to the file."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _flush(self, sync: bool) -> None:
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        self.flushes += 1
+
+    def _run(self) -> None:
+        pending = 0
+        deadline = None
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is self._STOP:
+                self._flush(sync=True)
+                self._file.close()
+                return
+            if isinstance(item, threading.Event):
+                if pending:
+                    self._flush(self.fsync)
+                    pending, deadline = 0, None
+                item.set()
+                continue
+            if item is not None:
+                self._writer.writerow(item)
+                self.written += 1
+                pending += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if pending and (
+                pending >= self.flush_every or time.monotonic() >= deadline
+            ):
+                self._flush(self.fsync)
+                pending, deadline = 0, None
+
+
+# Optional background writer; ``None`` keeps the synchronous append per event.
+_WRITER: Optional[BufferedEventWriter] = None
+
+
+def enable_buffered_writes(**kwargs) -> BufferedEventWriter:
+    """Route :func:`log_event` through a :class:`BufferedEventWriter`.
+
+    Keyword arguments are passed to the writer. The writer is closed at
+    interpreter exit or by :func:`disable_buffered_writes`.
+    """
+    global _WRITER
+    disable_buffered_writes()
+    _WRITER = BufferedEventWriter(_EVENT_LOG_FILE, **kwargs)
+    return _WRITER
+
+
+def disable_buffered_writes() -> None:
+    """Flush and close the background writer, if any."""
+    global _WRITER
+    if _WRITER is not None:
+        _WRITER.close()
+        _WRITER = None
+
+
+atexit.register(disable_buffered_writes)
+
+# Optional indexed backend; ``None`` keeps the CSV log.
+_STORE: Optional[SQLiteEventStore] = None
+
+
+def use_event_store(
+    path: Union[str, Path, None] = None, migrate_csv: bool = False
+) -> SQLiteEventStore:
+    """Send events to a :class:`SQLiteEventStore` instead of the CSV log.
+
+    With ``migrate_csv`` an existing CSV log is imported into a store that
+    holds no events yet.
+    """
+    global _STORE
+    close_event_store()
+    _STORE = SQLiteEventStore(_EVENT_DB_FILE if path is None else path)
+    if migrate_csv and not len(_STORE) and _EVENT_LOG_FILE.exists():
+        _STORE.import_csv(_EVENT_LOG_FILE)
+    return _STORE
+
+
+def close_event_store() -> None:
+    global _STORE
+    if _STORE is not None:
+        _STORE.close()
+        _STORE = None
+
+
+atexit.register(close_event_store)
+
+# Optional segmented backend; ``None`` keeps the flat CSV log.
+_SEGMENTS: Optional[SegmentedEventLog] = None
+
+
+def use_segmented_log(
+    directory: Union[str, Path, None] = None,
+    migrate_csv: bool = False,
+    **kwargs,
+) -> SegmentedEventLog:
+    """Send events to a rotated :class:`SegmentedEventLog`.
+
+    Keyword arguments configure rotation, compression and retention. With
+    ``migrate_csv`` the flat CSV log is imported into an empty segmented log.
+    """
+    global _SEGMENTS
+    close_segmented_log()
+    if directory is None:
+        directory = _EVENT_SEGMENT_DIR
+    _SEGMENTS = SegmentedEventLog(directory, **kwargs)
+    if migrate_csv and not len(_SEGMENTS) and _EVENT_LOG_FILE.exists():
+        _SEGMENTS.import_csv(_EVENT_LOG_FILE)
+    return _SEGMENTS
+
+
+def close_segmented_log() -> None:
+    global _SEGMENTS
+    if _SEGMENTS is not None:
+        _SEGMENTS.close()
+        _SEGMENTS = None
+
+
+atexit.register(close_segmented_log)
+
+
 def log_event(event_type: Union[str, EventType], details: str) -> None:
     """Log an event with a type and details.
 
-    The event is stored in-memory and appended to a CSV file for persistence.
+    The event is stored in-memory and appended to the backend selected by
+    :func:`use_event_store` or :func:`use_segmented_log`, or else to a CSV
+    file for persistence (by the background writer when
+    :func:`enable_buffered_writes` is active).
     ``event_type`` may be either a string or an :class:`EventType` enum member.
     """
     event_type_str = event_type.value if isinstance(event_type, EventType) else event_type
@@ -27,18 +246,134 @@ def log_event(event_type: Union[str, EventType], details: str) -> None:
         "details": details,
     }
     _EVENT_LOG.append(entry)
+    if _STORE is not None:
+        _STORE.append(entry)
+        return
+    if _SEGMENTS is not None:
+        _SEGMENTS.append(entry)
+        return
+    if _WRITER is not None and _WRITER.path == _EVENT_LOG_FILE:
+        _WRITER.write(entry)
+        return
     _EVENT_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
     file_exists = _EVENT_LOG_FILE.exists()
     with _EVENT_LOG_FILE.open("a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["timestamp", "event_type", "details"])
+        writer = csv.DictWriter(f, fieldnames=_FIELDNAMES)
         if not file_exists:
             writer.writeheader()
         writer.writerow(entry)
 
+
+def _split_records(data: bytes, at_start: bool) -> List[bytes]:
+    """Split the tail of a CSV file into whole records, oldest first.
+
+    A newline starts a record only if an even number of quotes follows it up
+    to the end of the file, so quoted fields containing newlines stay intact.
+    The leading fragment is dropped unless ``data`` begins at the file start.
+    """
+    records: List[bytes] = []
+    current: List[bytes] = []
+    quotes = 0
+    pieces = data.split(b"\n")
+    for index in range(len(pieces) - 1, -1, -1):
+        current.append(pieces[index])
+        quotes += pieces[index].count(b'"')
+        if quotes % 2 == 0 and (index > 0 or at_start):
+            record = b"\n".join(reversed(current))
+            if record.strip():
+                records.append(record)
+            current = []
+    records.reverse()
+    return records
+
+
+def tail_events(
+    path: Path, limit: int, block_size: int = 1 << 16
+) -> List[Dict[str, str]]:
+    """Return the last ``limit`` events of a CSV log by reading it backwards.
+
+    Only the header line and enough blocks from the end of the file to hold
+    ``limit`` records are read, so the cost does not grow with the log size.
+    """
+    if limit <= 0:
+        return []
+    with path.open("rb") as f:
+        header = f.readline()
+        fieldnames = next(csv.reader([header.decode()]), None) or _FIELDNAMES
+        end = f.seek(0, os.SEEK_END)
+        pos, data = end, b""
+        records: List[bytes] = []
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+            records = _split_records(data, at_start=pos == 0)
+            if len(records) > limit:
+                break
+    if pos == 0 and records:
+        records = records[1:]  # header row
+    text = b"\n".join(records[-limit:]).decode()
+    stream = io.StringIO(text, newline="")
+    return list(csv.DictReader(stream, fieldnames=fieldnames))
+
+
 def get_recent_events(limit: int = 5) -> List[Dict[str, str]]:
-    """Return the most recent events up to ``limit`` entries."""
-    if not _EVENT_LOG and _EVENT_LOG_FILE.exists():
-        with _EVENT_LOG_FILE.open("r", newline="") as f:
-            reader = csv.DictReader(f)
-            _EVENT_LOG.extend(reader)
-    return _EVENT_LOG[-limit:]
+    """Return the most recent events up to ``limit`` entries.
+
+    Events are served from the in-memory ring when it holds enough of them;
+    otherwise the active backend (or the tail of the CSV file) is read and
+    re-seeds the ring.
+    """
+    backends = _STORE is not None or _SEGMENTS is not None
+    if len(_EVENT_LOG) < limit and (backends or _EVENT_LOG_FILE.exists()):
+        if _STORE is not None:
+            events = _STORE.recent(limit)
+        elif _SEGMENTS is not None:
+            events = _SEGMENTS.recent(limit)
+        else:
+            if _WRITER is not None:
+                _WRITER.flush()
+            events = tail_events(_EVENT_LOG_FILE, limit)
+        _EVENT_LOG.clear()
+        _EVENT_LOG.extend(events)
+        return events
+    return list(islice(reversed(_EVENT_LOG), limit))[::-1]
+
+
+def query_events(
+    event_type: TypeFilter = None,
+    since: TimeBound = None,
+    until: TimeBound = None,
+    limit: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """Return events of ``event_type`` with ``since <= timestamp < until``.
+
+    The indexed store or the segmented log answers the query when active;
+    otherwise the CSV log is scanned. With ``limit`` only the most recent
+    matches are returned.
+    """
+    if _STORE is not None:
+        return _STORE.query(event_type, since, until, limit)
+    if _SEGMENTS is not None:
+        return _SEGMENTS.query(event_type, since, until, limit)
+    if not _EVENT_LOG_FILE.exists():
+        return []
+    if _WRITER is not None:
+        _WRITER.flush()
+    type_str = event_type
+    if isinstance(event_type, EventType):
+        type_str = event_type.value
+    lower = since.isoformat() if isinstance(since, datetime) else since
+    upper = until.isoformat() if isinstance(until, datetime) else until
+    matches: Deque[Dict[str, str]] = deque(maxlen=limit)
+    with _EVENT_LOG_FILE.open("r", newline="") as f:
+        for row in csv.DictReader(f):
+            if type_str is not None and row["event_type"] != type_str:
+                continue
+            if lower is not None and row["timestamp"] < lower:
+                continue
+            if upper is not None and row["timestamp"] >= upper:
+                continue
+            matches.append(row)
+    return list(matches)
@@ -0,0 +1,481 @@
+"""Segmented event log with rotation, compressed cold segments and retention.
+
+Events are appended to one small open CSV segment through a write buffer
+that is flushed every ``flush_every`` events, ``flush_interval`` seconds, on
+rotation and on close. When the segment exceeds ``max_bytes`` (UTF-8 bytes)
+or spans more than ``max_age`` seconds it is rotated: recorded in
+``manifest.json`` with its first/last timestamp and row count, and handed to
+a background thread that seals it (compresses it with zstd when the
+``zstandard`` package is installed, otherwise gzip) and applies retention,
+so the appending thread never waits for either. Recent-event and range
+queries consult the manifest and only open the segments that can hold
+matching events, and the newest events are served from an in-memory tail
+ring; retention drops the oldest sealed segments.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import (
+    IO,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .store import TimeBound, TypeFilter, _bound, _type
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - stdlib fallback
+    zstandard = None
+
+_FIELDNAMES = ["timestamp", "event_type", "details"]
+MANIFEST_NAME = "manifest.json"
+
+
+def _zstd_open(path: Path, mode: str) -> IO[bytes]:
+    return zstandard.open(path, mode)
+
+
+# Compression name -> (file suffix, binary opener)
+_CODECS: Dict[str, Tuple[str, Callable[[Path, str], IO[bytes]]]] = {
+    "gzip": (".gz", gzip.open),
+}
+if zstandard is not None:  # pragma: no cover - depends on optional package
+    _CODECS["zstd"] = (".zst", _zstd_open)
+
+
+def default_compression() -> str:
+    return "zstd" if "zstd" in _CODECS else "gzip"
+
+
+def _extra_bytes(entry: Dict[str, str]) -> int:
+    """UTF-8 bytes beyond one per character in the values of ``entry``."""
+    return sum(
+        len(value.encode("utf-8")) - len(value)
+        for value in entry.values()
+        if isinstance(value, str) and not value.isascii()
+    )
+
+
+@dataclass
+class SegmentInfo:
+    """Manifest record of one sealed segment."""
+
+    name: str
+    first: str
+    last: str
+    count: int
+    compression: Optional[str]
+
+    def overlaps(self, since: Optional[str], until: Optional[str]) -> bool:
+        return (since is None or self.last >= since) and (
+            until is None or self.first < until
+        )
+
+
+class SegmentedEventLog:
+    """Append-only event log split into rotated segments.
+
+    Parameters
+    ----------
+    directory:
+        Folder holding the segments and manifest.
+    max_bytes:
+        Seal the open segment once it grows past this size.
+    max_age:
+        Seal the open segment once its events span more than this many seconds.
+    compression:
+        ``"gzip"``, ``"zstd"`` or ``None`` for sealed segments; defaults to
+        zstd when available.
+    retain_segments:
+        Keep at most this many sealed segments.
+    retain_age:
+        Drop sealed segments whose newest event is older than this many
+        seconds before the newest logged event.
+    flush_every:
+        Flush the open segment after this many buffered events.
+    flush_interval:
+        Flush at least this often (seconds) while events are pending.
+    tail:
+        Number of newest events kept in memory for :meth:`recent` and for
+        queries over the open segment.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = 4 * 1024 * 1024,
+        max_age: Optional[float] = None,
+        compression: Optional[str] = "auto",
+        retain_segments: Optional[int] = None,
+        retain_age: Optional[float] = None,
+        flush_every: int = 256,
+        flush_interval: float = 0.2,
+        tail: int = 1000,
+    ) -> None:
+        if compression == "auto":
+            compression = default_compression()
+        if compression is not None and compression not in _CODECS:
+            raise ValueError(f"Unsupported compression {compression!r}")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self.retain_segments = retain_segments
+        self.retain_age = retain_age
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+        self._writer: Optional[csv.DictWriter] = None
+        self._open_size = 0
+        self._pending = 0
+        self._deadline = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._sealer: Optional[ThreadPoolExecutor] = None
+        # Newest events, oldest first, whatever segment they belong to.
+        self._tail: Deque[Dict[str, str]] = deque(maxlen=tail)
+        self._open_first: Optional[str] = None
+        self._open_last: Optional[str] = None
+        self._open_count = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # -- manifest --------------------------------------------------------
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_NAME
+
+    def _load(self) -> None:
+        data = {"next": 1, "segments": []}
+        if self.manifest_path.exists():
+            data = json.loads(self.manifest_path.read_text())
+        self.segments: List[SegmentInfo] = [
+            SegmentInfo(**s) for s in data["segments"]
+        ]
+        self._next = data["next"]
+        # Leftovers of a seal interrupted after the manifest write, and
+        # rotated segments whose background seal never ran.
+        for info in self.segments:
+            raw = self.directory / self._raw_name(info.name)
+            if info.compression is not None and raw.exists():
+                raw.unlink()
+            elif info.compression is None and self.compression is not None:
+                self._submit_seal(info)
+        open_path = self._open_path
+        if open_path.exists():
+            with open_path.open("r", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    self._track(row["timestamp"])
+                    self._tail.append(row)
+
+    def _save(self) -> None:
+        data = {
+            "next": self._next,
+            "segments": [asdict(info) for info in self.segments],
+        }
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=1))
+        os.replace(tmp, self.manifest_path)
+
+    @staticmethod
+    def _raw_name(name: str) -> str:
+        return name.split(".csv", 1)[0] + ".csv"
+
+    @property
+    def _open_path(self) -> Path:
+        return self.directory / f"events-{self._next:06d}.csv"
+
+    # -- writing ---------------------------------------------------------
+    def _track(self, timestamp: str) -> None:
+        if self._open_first is None:
+            self._open_first = timestamp
+        self._open_last = timestamp
+        self._open_count += 1
+
+    def append(self, entry: Dict[str, str]) -> None:
+        with self._lock:
+            if self._open_first is not None and self.max_age is not None:
+                start = datetime.fromisoformat(self._open_first)
+                age = datetime.fromisoformat(entry["timestamp"]) - start
+                if age > timedelta(seconds=self.max_age):
+                    self._rotate()
+            if self._file is None:
+                path = self._open_path
+                self._open_size = path.stat().st_size if path.exists() else 0
+                self._file = path.open("a", newline="", encoding="utf-8")
+                self._writer = csv.DictWriter(
+                    self._file, fieldnames=_FIELDNAMES
+                )
+                if not self._open_size:
+                    self._open_size += self._writer.writeheader()
+            # writerow returns the characters written; no tell() flush.
+            self._open_size += self._writer.writerow(entry)
+            self._open_size += _extra_bytes(entry)
+            self._track(entry["timestamp"])
+            self._tail.append(dict(entry))
+            if self._open_size >= self.max_bytes:
+                self._rotate()
+                return
+            self._pending += 1
+            now = time.monotonic()
+            if self._pending == 1:
+                self._deadline = now + self.flush_interval
+                self._start_timer()
+            if self._pending >= self.flush_every or now >= self._deadline:
+                self._flush()
+
+    def _start_timer(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self) -> None:
+        if self._file is not None and self._pending:
+            self._file.flush()
+        self._pending = 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def flush(self) -> None:
+        """Write buffered events of the open segment to disk."""
+        with self._lock:
+            self._flush()
+
+    def seal(self) -> Optional[SegmentInfo]:
+        """Seal the open segment now; return its manifest record."""
+        with self._lock:
+            future = self._rotate()
+        return None if future is None else future.result()
+
+    def wait_sealed(self, timeout: Optional[float] = None) -> None:
+        """Block until every rotated segment has been sealed."""
+        with self._lock:
+            sealer = self._sealer
+        if sealer is not None:
+            # One worker runs jobs in order, so a no-op marks the end.
+            sealer.submit(lambda: None).result(timeout)
+
+    def _rotate(self) -> Optional[Future]:
+        """Close the open segment and queue its seal; needs the lock."""
+        self._flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+        if not self._open_count:
+            return None
+        info = SegmentInfo(
+            self._open_path.name,
+            self._open_first,
+            self._open_last,
+            self._open_count,
+            None,
+        )
+        self.segments.append(info)
+        self._next += 1
+        self._open_first = self._open_last = None
+        self._open_count = 0
+        # Readable as plain CSV until the background seal replaces it.
+        self._save()
+        return self._submit_seal(info)
+
+    def _submit_seal(self, info: SegmentInfo) -> Future:
+        if self._sealer is None:
+            self._sealer = ThreadPoolExecutor(
+                1, thread_name_prefix="les-segment-seal"
+            )
+        return self._sealer.submit(self._seal, info)
+
+    def _seal(self, info: SegmentInfo) -> SegmentInfo:
+        """Compress a rotated segment and apply retention (sealer thread)."""
+        raw = self.directory / info.name
+        sealed = info
+        if self.compression is not None:
+            suffix, opener = _CODECS[self.compression]
+            name = info.name + suffix
+            tmp = self.directory / (name + ".tmp")
+            with raw.open("rb") as src, opener(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp, self.directory / name)
+            sealed = replace(info, name=name, compression=self.compression)
+        with self._lock:
+            if info in self.segments:
+                self.segments[self.segments.index(info)] = sealed
+            elif sealed is not info:  # pruned while compressing
+                (self.directory / sealed.name).unlink(missing_ok=True)
+            self._prune()
+            self._save()
+        if sealed is not info:
+            raw.unlink(missing_ok=True)
+        return sealed
+
+    def _prune(self) -> List[str]:
+        removed = []
+        newest = self._open_last
+        if newest is None and self.segments:
+            newest = self.segments[-1].last
+        cutoff = None
+        if self.retain_age is not None and newest is not None:
+            retain = timedelta(seconds=self.retain_age)
+            cutoff = (datetime.fromisoformat(newest) - retain).isoformat()
+        keep = self.retain_segments
+        while self.segments and (
+            (keep is not None and len(self.segments) > keep)
+            or (cutoff is not None and self.segments[0].last < cutoff)
+        ):
+            info = self.segments.pop(0)
+            (self.directory / info.name).unlink(missing_ok=True)
+            removed.append(info.name)
+        return removed
+
+    def prune(self) -> List[str]:
+        """Apply the retention policy; return the names of removed segments."""
+        with self._lock:
+            removed = self._prune()
+            if removed:
+                self._save()
+            return removed
+
+    def import_csv(self, csv_path: Union[str, Path]) -> int:
+        """Append every row of a flat CSV event log, rotating as needed."""
+        count = 0
+        with Path(csv_path).open("r", newline="") as f:
+            for row in csv.DictReader(f):
+                self.append(row)
+                count += 1
+        return count
+
+    # -- reading ---------------------------------------------------------
+    def _read_segment(self, info: SegmentInfo) -> List[Dict[str, str]]:
+        try:
+            return self._read_file(info)
+        except FileNotFoundError:
+            if info.compression is not None:
+                raise
+        # Sealed or pruned in the background since the caller listed it.
+        raw = self._raw_name(info.name)
+        with self._lock:
+            current = [s for s in self.segments if s.name.startswith(raw)]
+        return self._read_file(current[0]) if current else []
+
+    def _read_file(self, info: SegmentInfo) -> List[Dict[str, str]]:
+        path = self.directory / info.name
+        if info.compression is None:
+            with path.open("r", newline="", encoding="utf-8") as f:
+                return list(csv.DictReader(f))
+        opener = _CODECS[info.compression][1]
+        with opener(path, "rb") as raw, io.TextIOWrapper(
+            raw, newline="", encoding="utf-8"
+        ) as f:
+            return list(csv.DictReader(f))
+
+    def _read_open(self) -> List[Dict[str, str]]:
+        if not self._open_count:
+            return []
+        if len(self._tail) >= self._open_count:
+            return list(self._tail)[-self._open_count:]
+        self._flush()
+        path = self._open_path
+        if not path.exists():
+            return []
+        with path.open("r", newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def _newest_first(
+        self, since: Optional[str] = None, until: Optional[str] = None
+    ) -> Iterator[List[Dict[str, str]]]:
+        with self._lock:
+            open_rows = self._read_open()
+            open_first, open_last = self._open_first, self._open_last
+            segments = list(self.segments)
+        if open_rows and (since is None or open_last >= since) and (
+            until is None or open_first < until
+        ):
+            yield open_rows
+        for info in reversed(segments):
+            if info.overlaps(since, until):
+                yield self._read_segment(info)
+
+    def recent(self, limit: int = 5) -> List[Dict[str, str]]:
+        """Return the last ``limit`` events, oldest first.
+
+        Served from the tail ring when it holds enough events; otherwise only
+        as many sealed segments as needed are decompressed.
+        """
+        if limit <= 0:
+            return []
+        with self._lock:
+            if limit <= len(self._tail):
+                return list(self._tail)[-limit:]
+        events: List[Dict[str, str]] = []
+        for rows in self._newest_first():
+            events[:0] = rows
+            if len(events) >= limit:
+                break
+        return events[-limit:]
+
+    def query(
+        self,
+        event_type: TypeFilter = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, str]]:
+        """Return matching events, oldest first.
+
+        Segments outside the range are skipped.
+        """
+        type_str = _type(event_type)
+        lower, upper = _bound(since), _bound(until)
+        events: List[Dict[str, str]] = []
+        for rows in self._newest_first(lower, upper):
+            events[:0] = [
+                row
+                for row in rows
+                if (type_str is None or row["event_type"] == type_str)
+                and (lower is None or row["timestamp"] >= lower)
+                and (upper is None or row["timestamp"] < upper)
+            ]
+            if limit is not None and len(events) >= limit:
+                break
+        return events if limit is None else events[-limit:]
+
+    def __len__(self) -> int:
+        return sum(info.count for info in self.segments) + self._open_count
+
+    def close(self) -> None:
+        """Flush the open segment and wait for background seals to finish."""
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = self._writer = None
+            sealer, self._sealer = self._sealer, None
+        if sealer is not None:
+            sealer.shutdown(wait=True)
+
+    def __enter__(self) -> "SegmentedEventLog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,252 @@
+"""Cached sensor readings with TTL and stale-while-revalidate.
+
+Probe reads block for a full conversion (about a second), which consumers such
+as the alert engine, pump controller and metrics exporter should never wait
+for. :class:`ReadingCache` keeps the last good value per sensor and answers
+from memory. When a value is older than its TTL the cached value is still
+returned, flagged stale, while one background refresh per sensor runs on a
+thread pool. Successful reads are published into a
+:class:`~les.state.StateRegistry` from those worker threads; registry
+subscribers are notified later, on whichever thread collects the changes.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from les.state import StateRegistry
+
+from .polling import (
+    NITRATE_PROBE,
+    ORP_PROBE,
+    BusPool,
+    Probe,
+    ProbeReading,
+    poll_all,
+)
+
+ReadingSource = Callable[[], Optional[float]]
+
+
+class Quality(str, Enum):
+    """How trustworthy a cached value is."""
+
+    FRESH = "fresh"
+    STALE = "stale"
+    MISSING = "missing"
+
+
+@dataclass(frozen=True)
+class CachedReading:
+    """Last good value of a sensor.
+
+    ``timestamp`` is on the cache's clock (monotonic by default) and ``error``
+    describes the most recent failed refresh, if it failed.
+    """
+
+    value: Optional[float]
+    timestamp: Optional[float]
+    quality: Quality
+    error: Optional[str] = None
+
+
+@dataclass
+class _Entry:
+    source: ReadingSource
+    state_key: Optional[str]
+    ttl: float
+    value: Optional[float] = None
+    timestamp: Optional[float] = None
+    error: Optional[str] = None
+    inflight: Optional[Future] = None
+
+
+class ReadingCache:
+    """Serve sensor values from memory and refresh them in the background.
+
+    Parameters
+    ----------
+    registry:
+        Registry receiving each successful reading under the sensor's state
+        key; ``None`` disables publishing.
+    ttl:
+        Default seconds a reading counts as fresh.
+    max_workers:
+        Threads available for concurrent refreshes.
+    clock:
+        Monotonic clock, injectable for tests.
+    on_close:
+        Callables run by :meth:`close` after the refresh threads stop, e.g.
+        to release bus handles the sources use.
+    """
+
+    def __init__(
+        self,
+        registry: Optional[StateRegistry] = None,
+        ttl: float = 5.0,
+        max_workers: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+        on_close: Iterable[Callable[[], None]] = (),
+    ) -> None:
+        self.registry = registry
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._on_close: List[Callable[[], None]] = list(on_close)
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="les-readings"
+        )
+
+    def register(
+        self,
+        name: str,
+        source: ReadingSource,
+        state_key: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Add a sensor read by ``source``, published under ``state_key``."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[name] = _Entry(source, state_key, ttl)
+
+    def get(self, name: str) -> CachedReading:
+        """Return the cached reading without blocking.
+
+        A missing or expired value schedules a background refresh; concurrent
+        callers share a single in-flight refresh per sensor.
+        """
+        entry = self._entries[name]
+        now = self.clock()
+        with self._lock:
+            value, timestamp, error = entry.value, entry.timestamp, entry.error
+        if timestamp is None:
+            quality = Quality.MISSING
+        elif now - timestamp <= entry.ttl:
+            return CachedReading(value, timestamp, Quality.FRESH, error)
+        else:
+            quality = Quality.STALE
+        self._refresh(name, entry)
+        return CachedReading(value, timestamp, quality, error)
+
+    def value(self, name: str) -> Optional[float]:
+        return self.get(name).value
+
+    def refresh(
+        self, name: str, wait: bool = False, timeout: Optional[float] = None
+    ) -> Future:
+        """Start (or join) a refresh of ``name``; optionally wait for it."""
+        future = self._refresh(name, self._entries[name])
+        if wait:
+            future.result(timeout)
+        return future
+
+    def refresh_all(
+        self, wait: bool = False, timeout: Optional[float] = None
+    ) -> None:
+        futures = [
+            self._refresh(name, entry)
+            for name, entry in list(self._entries.items())
+        ]
+        if wait:
+            for future in futures:
+                future.result(timeout)
+
+    def _refresh(self, name: str, entry: _Entry) -> Future:
+        with self._lock:
+            if entry.inflight is None:
+                entry.inflight = self._executor.submit(self._read, name, entry)
+            return entry.inflight
+
+    def _read(self, name: str, entry: _Entry) -> Optional[float]:
+        try:
+            value = entry.source()
+            error = None if value is not None else "no reading"
+        except Exception as exc:  # noqa: BLE001 - a bad probe keeps its entry
+            value, error = None, f"{type(exc).__name__}: {exc}"
+        with self._lock:
+            if value is not None:
+                entry.value = value
+                entry.timestamp = self.clock()
+            entry.error = error
+            entry.inflight = None
+        if value is not None and self.registry is not None and entry.state_key:
+            try:
+                self.registry.set(entry.state_key, value)
+            except KeyError:
+                self.registry.register(entry.state_key, value)
+        return value
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for close in self._on_close:
+            close()
+        self._on_close.clear()
+
+    def __enter__(self) -> "ReadingCache":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class _SharedPoll:
+    """Sample a group of probes in one :func:`poll_all` call.
+
+    Each probe gets its own reading source. The first source to refresh
+    polls the whole group; the others take its leftover readings while they
+    are younger than ``max_age`` seconds. One poll at a time keeps worker
+    threads from interleaving transactions on the shared bus handles.
+    """
+
+    def __init__(
+        self, probes: Sequence[Probe], pool: BusPool, max_age: float
+    ) -> None:
+        self.probes = list(probes)
+        self.pool = pool
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pending: Dict[str, ProbeReading] = {}
+
+    def source(self, name: str) -> ReadingSource:
+        def read() -> Optional[float]:
+            with self._lock:
+                reading = self._pending.pop(name, None)
+                if (
+                    reading is None
+                    or time.time() - reading.timestamp > self.max_age
+                ):
+                    self._pending = poll_all(self.probes, self.pool)
+                    reading = self._pending.pop(name)
+            return reading.value
+
+        return read
+
+
+def nutrient_cache(
+    registry: Optional[StateRegistry] = None,
+    ttl: float = 5.0,
+    i2c_bus: int = 1,
+    pool: Optional[BusPool] = None,
+) -> ReadingCache:
+    """Cache for the nitrate and ORP probes as ``aq.nitrate``/``aq.orp``.
+
+    Both probes are sampled together on bus handles from ``pool``; without
+    one the cache opens its own and closes it in :meth:`ReadingCache.close`.
+    """
+    on_close = []
+    if pool is None:
+        pool = BusPool()
+        on_close.append(pool.close)
+    cache = ReadingCache(registry, ttl=ttl, on_close=on_close)
+    probes = [
+        replace(probe, bus=i2c_bus) for probe in (NITRATE_PROBE, ORP_PROBE)
+    ]
+    poll = _SharedPoll(probes, pool, max_age=ttl)
+    cache.register("nitrate", poll.source(NITRATE_PROBE.name), "aq.nitrate")
+    cache.register("orp", poll.source(ORP_PROBE.name), "aq.orp")
+    return cache
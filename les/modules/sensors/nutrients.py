@@ -3,6 +3,8 @@ from __future__ import annotations
 import time
 from typing import Optional
 
+from .polling import ProbePending, parse_ezo_response
+
 
 def _poll_probe(address: int, i2c_bus: int = 1) -> Optional[float]:
     """Read a value from an Atlas Scientific I²C probe.
@@ -17,8 +19,8 @@ def _poll_probe(address: int, i2c_bus: int = 1) -> Optional[float]:
     Returns
     -------
     Optional[float]
-        Parsed floating point value from the probe, or ``None`` if unavailable
-        or invalid.
+        Parsed floating point value from the probe, or ``None`` if unavailable,
+        still converting or invalid.
     """
     try:
         import smbus2
@@ -29,10 +31,9 @@ def _poll_probe(address: int, i2c_bus: int = 1) -> Optional[float]:
     bus.write_byte(address, ord("R"))
     time.sleep(1.0)
     data = bus.read_i2c_block_data(address, 0, 32)
-    text = bytes([d for d in data if d != 0]).decode().strip()
     try:
-        return float(text)
-    except ValueError:
+        return parse_ezo_response(data)
+    except ProbePending:
         return None
 
 
@@ -0,0 +1,253 @@
+"""Concurrent polling of Atlas Scientific EZO probes with asyncio.
+
+An EZO probe needs roughly a second between the ``R`` command and a valid
+reading. :func:`poll_probes` sends ``R`` to every probe up front, waits out the
+conversion time once, and collects all results concurrently, so a rack of
+probes samples in about one conversion time instead of one per probe. Bus
+handles are opened once per bus number and reused via :class:`BusPool`.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+# Status codes in the first byte of an EZO I2C response.
+EZO_SUCCESS = 1
+EZO_SYNTAX_ERROR = 2
+EZO_PENDING = 254
+EZO_NO_DATA = 255
+
+
+class ProbePending(Exception):
+    """Raised when a probe has not finished its conversion yet."""
+
+
+@dataclass(frozen=True)
+class Probe:
+    """An EZO probe on an I2C bus.
+
+    Parameters
+    ----------
+    name:
+        Key used for the probe's reading.
+    address:
+        I2C address of the probe.
+    bus:
+        I2C bus number.
+    conversion_s:
+        Seconds to wait between the read command and fetching the result.
+    """
+
+    name: str
+    address: int
+    bus: int = 1
+    conversion_s: float = 1.0
+
+
+NITRATE_PROBE = Probe("nitrate", 0x64)
+ORP_PROBE = Probe("orp", 0x62)
+
+
+@dataclass
+class ProbeReading:
+    """Outcome of polling one probe."""
+
+    value: Optional[float]
+    attempts: int
+    timestamp: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.value is not None
+
+
+def parse_ezo_response(data: Sequence[int]) -> Optional[float]:
+    """Parse an EZO I2C response into a float.
+
+    A leading status byte is honoured when present: ``PENDING`` raises
+    :class:`ProbePending`, other non-success codes yield ``None``.
+    """
+    data = list(data)
+    if data and data[0] == EZO_PENDING:
+        raise ProbePending
+    if data and data[0] in (EZO_SUCCESS, EZO_SYNTAX_ERROR, EZO_NO_DATA):
+        if data[0] != EZO_SUCCESS:
+            return None
+        data = data[1:]
+    try:
+        return float(bytes(d for d in data if d != 0).decode().strip())
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+def _smbus_factory(bus: int) -> Any:
+    try:
+        import smbus2
+    except ImportError:  # pragma: no cover - hardware dependency
+        return None
+    return smbus2.SMBus(bus)
+
+
+class BusPool:
+    """Open bus handles, one per bus number, reused across polls.
+
+    Parameters
+    ----------
+    factory:
+        Callable opening a handle for a bus number; defaults to
+        ``smbus2.SMBus``. Returning ``None`` marks the bus unavailable.
+    """
+
+    def __init__(self, factory: Callable[[int], Any] = _smbus_factory) -> None:
+        self.factory = factory
+        self._handles: Dict[int, Any] = {}
+
+    def handle(self, bus: int) -> Any:
+        if bus not in self._handles:
+            self._handles[bus] = self.factory(bus)
+        return self._handles[bus]
+
+    def close(self) -> None:
+        for handle in self._handles.values():
+            close = getattr(handle, "close", None)
+            if close is not None:
+                close()
+        self._handles.clear()
+
+    def __enter__(self) -> "BusPool":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+@dataclass
+class FakeBus:
+    """In-memory stand-in for ``smbus2.SMBus`` used in tests and simulations.
+
+    ``values`` maps addresses to the text a probe returns (or a callable
+    producing it). ``pending`` and ``failures`` map addresses to the number of
+    upcoming reads that report "still converting" or raise ``OSError``.
+    """
+
+    values: Mapping[int, Any]
+    pending: Dict[int, int] = field(default_factory=dict)
+    failures: Dict[int, int] = field(default_factory=dict)
+    writes: List[tuple[int, int]] = field(default_factory=list)
+    closed: bool = False
+
+    def write_byte(self, address: int, value: int) -> None:
+        self.writes.append((address, value))
+
+    def read_i2c_block_data(
+        self, address: int, register: int, length: int
+    ) -> List[int]:
+        if self.failures.get(address, 0) > 0:
+            self.failures[address] -= 1
+            raise OSError(f"I2C read from {address:#x} failed")
+        if self.pending.get(address, 0) > 0:
+            self.pending[address] -= 1
+            return [EZO_PENDING] + [0] * (length - 1)
+        value = self.values[address]
+        text = str(value() if callable(value) else value)
+        data = [EZO_SUCCESS] + [ord(c) for c in text]
+        return (data + [0] * length)[:length]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+async def _poll_one(
+    probe: Probe,
+    handle: Any,
+    lock: asyncio.Lock,
+    retries: int,
+    retry_delay: float,
+) -> ProbeReading:
+    if handle is None:
+        return ProbeReading(None, 0, time.time(), error="bus unavailable")
+    error = None
+    for attempt in range(1, retries + 2):
+        try:
+            async with lock:
+                handle.write_byte(probe.address, ord("R"))
+            await asyncio.sleep(probe.conversion_s)
+            async with lock:
+                data = handle.read_i2c_block_data(probe.address, 0, 32)
+            value = parse_ezo_response(data)
+        except ProbePending:
+            error = "pending"
+        except OSError as exc:
+            error = str(exc) or type(exc).__name__
+        else:
+            if value is not None:
+                return ProbeReading(value, attempt, time.time())
+            error = "invalid response"
+        await asyncio.sleep(retry_delay)
+    return ProbeReading(None, retries + 1, time.time(), error=error)
+
+
+async def poll_probes(
+    probes: Iterable[Probe],
+    pool: BusPool,
+    *,
+    timeout: float = 3.0,
+    retries: int = 1,
+    retry_delay: float = 0.1,
+) -> Dict[str, ProbeReading]:
+    """Poll all ``probes`` concurrently; return readings keyed by probe name.
+
+    Parameters
+    ----------
+    probes:
+        Probes to sample.
+    pool:
+        Bus handles to use; kept open for the next poll.
+    timeout:
+        Per-probe limit in seconds, including retries.
+    retries:
+        Extra attempts after a failed, pending or unparsable read.
+    retry_delay:
+        Pause before a retry.
+    """
+    probes = list(probes)
+    # Transactions on one bus must not interleave; locks belong to this loop.
+    locks = {probe.bus: asyncio.Lock() for probe in probes}
+
+    async def guarded(probe: Probe) -> ProbeReading:
+        poll = _poll_one(
+            probe,
+            pool.handle(probe.bus),
+            locks[probe.bus],
+            retries,
+            retry_delay,
+        )
+        try:
+            return await asyncio.wait_for(poll, timeout)
+        except asyncio.TimeoutError:
+            return ProbeReading(None, 0, time.time(), error="timeout")
+
+    readings = await asyncio.gather(*(guarded(probe) for probe in probes))
+    return {probe.name: reading for probe, reading in zip(probes, readings)}
+
+
+def poll_all(
+    probes: Iterable[Probe], pool: Optional[BusPool] = None, **kwargs: Any
+) -> Dict[str, ProbeReading]:
+    """Synchronous wrapper around :func:`poll_probes` for non-async callers."""
+    if pool is not None:
+        return asyncio.run(poll_probes(probes, pool, **kwargs))
+    with BusPool() as pool:
+        return asyncio.run(poll_probes(probes, pool, **kwargs))
@@ -0,0 +1,90 @@
+"""Crop rotation optimizer for the Living Environment System.
+
+The problem and tabular solver are imported eagerly; the other submodules
+pull in heavier dependencies (multiprocessing, shared memory, argparse) and
+are loaded on first access to one of their names.
+"""
+from importlib import import_module
+
+from .problem import Crop, RotationProblem, RotationState
+from .tabular import (
+    INFEASIBLE,
+    PlanStep,
+    RotationModel,
+    SolveStats,
+    TabularSolution,
+    compile_model,
+    reward_table,
+    solve,
+)
+
+# Re-exported name -> submodule it is loaded from on first access.
+_LAZY = {
+    "PolicyEvaluation": "evaluate",
+    "base_tables": "evaluate",
+    "evaluate_policy": "evaluate",
+    "Bed": "multibed",
+    "MultiBedSolution": "multibed",
+    "solve_multibed": "multibed",
+    "PrunedSolution": "pruning",
+    "PruneStats": "pruning",
+    "certify_monotone": "pruning",
+    "solve_pruned": "pruning",
+    "plan_frame": "report",
+    "plan_rows": "report",
+    "plan_summary": "report",
+    "Scenario": "scenarios",
+    "run_sweep": "scenarios",
+    "StationaryPolicy": "stationary",
+    "seasonal_period": "stationary",
+    "solve_stationary": "stationary",
+}
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+__all__ = [
+    "PolicyEvaluation",
+    "base_tables",
+    "evaluate_policy",
+    "Bed",
+    "MultiBedSolution",
+    "solve_multibed",
+    "Crop",
+    "RotationProblem",
+    "RotationState",
+    "PrunedSolution",
+    "PruneStats",
+    "certify_monotone",
+    "solve_pruned",
+    "plan_frame",
+    "plan_rows",
+    "plan_summary",
+    "Scenario",
+    "StationaryPolicy",
+    "seasonal_period",
+    "solve_stationary",
+    "run_sweep",
+    "INFEASIBLE",
+    "PlanStep",
+    "RotationModel",
+    "SolveStats",
+    "TabularSolution",
+    "compile_model",
+    "reward_table",
+    "solve",
+]
@@ -0,0 +1,70 @@
+"""Command-line entry point: ``python -m les.optimizer PROBLEM.json``."""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from dataclasses import replace
+from pathlib import Path
+from typing import Sequence
+
+from .problem import RotationState
+from .report import PLAN_COLUMNS, format_table, plan_rows, plan_summary
+from .scenarios import load_problem
+from .tabular import solve
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m les.optimizer",
+        description="Solve a crop rotation problem",
+    )
+    parser.add_argument(
+        "problem", type=Path, help="JSON file with the problem tables"
+    )
+    parser.add_argument(
+        "--initial",
+        type=int,
+        nargs=5,
+        required=True,
+        metavar=("N", "C", "S", "D", "K"),
+        help="Initial bed state",
+    )
+    parser.add_argument(
+        "--family", default=None, help="Family planted last season"
+    )
+    parser.add_argument(
+        "--cooldown", type=int, default=0, help="Seasons of cooldown left"
+    )
+    parser.add_argument(
+        "--horizon", type=int, default=None, help="Override the horizon"
+    )
+    parser.add_argument(
+        "--format", choices=("table", "csv", "json"), default="table"
+    )
+    args = parser.parse_args(argv)
+
+    problem = load_problem(args.problem)
+    if args.horizon is not None:
+        problem = replace(problem, horizon=args.horizon)
+    initial = RotationState(
+        *args.initial, family=args.family, cooldown=args.cooldown
+    )
+    solution = solve(problem, keep_values=False)
+    steps = solution.plan(initial)
+    rows = plan_rows(problem, initial, steps)
+    summary = plan_summary(problem, initial, steps)
+
+    if args.format == "json":
+        json.dump({"summary": summary, "plan": rows}, sys.stdout, indent=2)
+        print()
+    elif args.format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=PLAN_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        print(format_table(rows))
+        for key, value in summary.items():
+            print(f"{key}: {value}")
+    return 0 if len(steps) == problem.horizon else 1
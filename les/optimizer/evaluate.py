@@ -0,0 +1,145 @@
+"""Score a fixed rotation plan or policy against many scenarios at once.
+
+Re-optimizing per scenario is unnecessary when the question is what an already
+chosen plan earns under other prices or yield shocks. Here every scenario is a
+row of ``prices (n, A)``, ``yields (n, A, T)`` and ``costs (n, A, T)`` arrays;
+trajectories for all rows advance together through the compiled transitions
+and profits are gathered from those arrays in one vectorized pass.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from .problem import RotationProblem, RotationState
+from .tabular import RotationModel, TabularSolution, compile_model
+
+
+@dataclass(eq=False)
+class PolicyEvaluation:
+    """Per-scenario results of :func:`evaluate_policy`.
+
+    ``feasible[i]`` is ``False`` when scenario ``i`` hit an action that is
+    infeasible in its soil/resource state; ``actions`` is ``-1`` from then on
+    and ``profits`` only counts the seasons executed before that point.
+    """
+
+    profits: np.ndarray
+    feasible: np.ndarray
+    actions: np.ndarray
+    end_states: np.ndarray
+
+
+def base_tables(
+    problem: RotationProblem,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``prices (A,)``, ``yields (A, T)`` and ``costs (A, T)``."""
+    horizon = problem.horizon
+    prices = np.array([crop.price for crop in problem.crops], dtype=np.float64)
+    yields = np.array(
+        [[crop.yield_at(t) for t in range(horizon)] for crop in problem.crops],
+        dtype=np.float64,
+    ).reshape(len(prices), horizon)
+    costs = np.array(
+        [[crop.cost_at(t) for t in range(horizon)] for crop in problem.crops],
+        dtype=np.float64,
+    ).reshape(len(prices), horizon)
+    return prices, yields, costs
+
+
+def evaluate_policy(
+    model: RotationModel | RotationProblem,
+    plan: TabularSolution | Sequence[int | str],
+    initial: RotationState | Sequence[RotationState],
+    *,
+    prices: np.ndarray | None = None,
+    yields: np.ndarray | None = None,
+    costs: np.ndarray | None = None,
+) -> PolicyEvaluation:
+    """Evaluate ``plan`` for every scenario row without re-solving.
+
+    Parameters
+    ----------
+    model:
+        Compiled model (or problem) providing the transitions.
+    plan:
+        A :class:`TabularSolution` whose state-feedback policy is followed, or
+        a fixed sequence of crop names/indices, one per season.
+    initial:
+        Starting state shared by all scenarios, or one per scenario.
+    prices, yields, costs:
+        Scenario tables broadcastable to ``(n, A)``, ``(n, A, T)`` and
+        ``(n, A, T)``. Missing tables fall back to the problem's own values.
+    """
+    if isinstance(model, RotationProblem):
+        model = compile_model(model)
+    problem = model.problem
+    horizon = problem.horizon
+    base_prices, base_yields, base_costs = base_tables(problem)
+    prices = base_prices if prices is None else np.asarray(prices, float)
+    yields = base_yields if yields is None else np.asarray(yields, float)
+    costs = base_costs if costs is None else np.asarray(costs, float)
+
+    initials = (
+        [initial] if isinstance(initial, RotationState) else list(initial)
+    )
+    codes = np.array(
+        [model.encode(state) for state in initials], dtype=np.int64
+    )
+    n = np.broadcast_shapes(
+        codes.shape, prices.shape[:-1], yields.shape[:-2], costs.shape[:-2]
+    ) or (1,)
+    if len(n) != 1:
+        raise ValueError(
+            "Scenario tables must have a single leading scenario axis"
+        )
+    n_actions = len(problem.crops)
+    prices = np.broadcast_to(prices, n + (n_actions,))
+    yields = np.broadcast_to(yields, n + (n_actions, horizon))
+    costs = np.broadcast_to(costs, n + (n_actions, horizon))
+    codes = np.broadcast_to(codes, n).copy()
+
+    if isinstance(plan, TabularSolution):
+        policy = plan.policy
+        sequence = None
+    else:
+        names = problem.crop_names
+        sequence = np.array(
+            [names.index(a) if isinstance(a, str) else int(a) for a in plan],
+            dtype=np.int64,
+        )
+        if len(sequence) != horizon:
+            raise ValueError(
+                f"Plan length {len(sequence)} does not match horizon {horizon}"
+            )
+
+    # Walk all trajectories forward together; scenarios only differ in rewards
+    # and initial states, so the per-step work is a handful of gathers.
+    actions = np.full(n + (horizon,), -1, dtype=np.int16)
+    feasible = np.ones(n, dtype=bool)
+    for t in range(horizon):
+        act = (
+            policy[t, codes].astype(np.int64)
+            if sequence is None
+            else np.full(n, sequence[t])
+        )
+        ok = feasible & (act >= 0)
+        nxt = np.where(ok, model.next_state[np.maximum(act, 0), codes], -1)
+        ok &= nxt >= 0
+        actions[ok, t] = act[ok]
+        codes = np.where(ok, nxt, codes)
+        feasible = ok
+
+    taken = np.maximum(actions, 0)
+    rows = np.arange(n[0])[:, None]
+    seasons = np.arange(horizon)[None, :]
+    season_profit = (
+        prices[rows, taken] * yields[rows, taken, seasons]
+        - costs[rows, taken, seasons]
+    )
+    profits = np.where(actions >= 0, season_profit, 0.0).sum(axis=1)
+    return PolicyEvaluation(
+        profits=profits, feasible=feasible, actions=actions, end_states=codes
+    )
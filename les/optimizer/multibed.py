@@ -0,0 +1,340 @@
+"""Multi-bed rotation planning with shared per-season resources.
+
+Beds are coupled only through farm-wide water and compost budgets per season.
+Those constraints are priced out with Lagrange multipliers, which decomposes
+the joint problem into independent single-bed DPs. Beds that share a
+:class:`RotationProblem` share one DP solve (the dense policy covers every
+initial state), and distinct problems are solved in parallel on a
+:class:`~concurrent.futures.ProcessPoolExecutor`. The multipliers follow a
+normalized projected subgradient step; a final repair pass re-plans beds
+against the remaining capacity so the returned plan respects the budgets.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from .problem import RotationProblem, RotationState
+from .tabular import TabularSolution, compile_model, reward_table, solve
+
+
+@dataclass(frozen=True)
+class Bed:
+    """A bed to plan: its rotation problem and starting state."""
+
+    problem: RotationProblem
+    initial: RotationState
+
+
+@dataclass(eq=False)
+class MultiBedSolution:
+    """Joint plan for all beds.
+
+    ``actions[b, t]`` is the crop index planted in bed ``b`` at season ``t``;
+    rows of ``-1`` mark beds for which no plan fits the remaining budgets.
+    """
+
+    actions: np.ndarray
+    profits: np.ndarray
+    water_used: np.ndarray
+    compost_used: np.ndarray
+    water_price: np.ndarray
+    compost_price: np.ndarray
+    upper_bound: float
+    iterations: int
+
+    @property
+    def total_profit(self) -> float:
+        return float(self.profits[self.actions[:, 0] >= 0].sum())
+
+    @property
+    def unplanned(self) -> list[int]:
+        return [int(b) for b in np.flatnonzero(self.actions[:, 0] < 0)]
+
+    @property
+    def gap(self) -> float:
+        """Relative gap between the Lagrangian bound and the plan's profit."""
+        scale = max(abs(self.upper_bound), 1e-9)
+        return (self.upper_bound - self.total_profit) / scale
+
+
+def _usage(problem: RotationProblem) -> tuple[np.ndarray, np.ndarray]:
+    water = np.array([crop.water for crop in problem.crops], dtype=np.float64)
+    compost = np.array(
+        [max(0, -crop.compost) for crop in problem.crops], dtype=np.float64
+    )
+    return water, compost
+
+
+def _priced_rewards(
+    problem: RotationProblem,
+    rewards: np.ndarray,
+    water_price: np.ndarray,
+    compost_price: np.ndarray,
+) -> np.ndarray:
+    water, compost = _usage(problem)
+    return (
+        rewards
+        - water_price[:, None] * water[None, :]
+        - compost_price[:, None] * compost[None, :]
+    )
+
+
+def _solve_group(
+    problem: RotationProblem,
+    rewards: np.ndarray,
+    initials: Sequence[RotationState],
+) -> list[tuple[np.ndarray, float]]:
+    """Worker entry point: one DP solve, rolled out from every bed's start."""
+    solution = solve(compile_model(problem), rewards, keep_values=False)
+    return [
+        (solution.actions(initial), solution.value_of(initial))
+        for initial in initials
+    ]
+
+
+def _priced_budget(price: np.ndarray, budget: np.ndarray) -> float:
+    finite = np.isfinite(budget)
+    return float(price[finite] @ budget[finite])
+
+
+def _as_budget(
+    budget: float | Sequence[float] | None, horizon: int
+) -> np.ndarray:
+    if budget is None:
+        return np.full(horizon, np.inf)
+    values = np.broadcast_to(np.asarray(budget, dtype=np.float64), (horizon,))
+    return values.copy()
+
+
+def _season_usage(
+    beds: Sequence[Bed], actions: np.ndarray, horizon: int
+) -> tuple[np.ndarray, np.ndarray]:
+    water_used = np.zeros(horizon)
+    compost_used = np.zeros(horizon)
+    for bed, row in zip(beds, actions):
+        water, compost = _usage(bed.problem)
+        planted = row >= 0
+        water_used[planted] += water[row[planted]]
+        compost_used[planted] += compost[row[planted]]
+    return water_used, compost_used
+
+
+def solve_multibed(
+    beds: Sequence[Bed],
+    water_budget: float | Sequence[float],
+    compost_budget: float | Sequence[float] | None = None,
+    *,
+    max_iter: int = 30,
+    step: float = 0.5,
+    tol: float = 1e-3,
+    max_workers: int | None = None,
+) -> MultiBedSolution:
+    """Plan all beds jointly under shared per-season water and compost budgets.
+
+    Parameters
+    ----------
+    beds:
+        Beds to plan. All problems must share the same horizon.
+    water_budget:
+        Farm-wide water units available per season (scalar or one per season).
+    compost_budget:
+        Farm-wide compost credits that may be drawn per season; ``None`` leaves
+        compost unconstrained.
+    max_iter:
+        Maximum number of multiplier updates.
+    step:
+        Initial subgradient step as a fraction of the largest reward per unit
+        of the resource. Steps shrink as ``1/sqrt(k)``.
+    tol:
+        Stop once the relative duality gap of a feasible iterate is below this.
+    max_workers:
+        Worker processes for the per-bed DPs; ``1`` solves in-process.
+    """
+    if not beds:
+        raise ValueError("At least one bed is required")
+    horizon = beds[0].problem.horizon
+    if any(bed.problem.horizon != horizon for bed in beds):
+        raise ValueError("All beds must share the same horizon")
+
+    water_cap = _as_budget(water_budget, horizon)
+    compost_cap = _as_budget(compost_budget, horizon)
+    groups: dict[RotationProblem, list[int]] = {}
+    for b, bed in enumerate(beds):
+        groups.setdefault(bed.problem, []).append(b)
+
+    base = {problem: reward_table(problem) for problem in groups}
+    reward_scale = max(
+        float(np.abs(rewards).max()) for rewards in base.values()
+    )
+    water_scale = reward_scale / max(
+        max(c.water for p in groups for c in p.crops), 1
+    )
+    compost_scale = reward_scale / max(
+        max(max(0, -c.compost) for p in groups for c in p.crops), 1
+    )
+
+    water_price = np.zeros(horizon)
+    compost_price = np.zeros(horizon)
+    actions = np.full((len(beds), horizon), -1, dtype=np.int16)
+    best: tuple[float, np.ndarray] | None = None
+    upper_bound = np.inf
+    executor: Executor | None = None
+    if max_workers != 1 and len(groups) > 1:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        iterations = 0
+        for k in range(max_iter):
+            iterations = k + 1
+            jobs = [
+                (
+                    problem,
+                    _priced_rewards(
+                        problem, base[problem], water_price, compost_price
+                    ),
+                    [beds[b].initial for b in members],
+                )
+                for problem, members in groups.items()
+            ]
+            if executor is None:
+                results = [_solve_group(*job) for job in jobs]
+            else:
+                results = list(executor.map(_solve_group, *zip(*jobs)))
+
+            dual = _priced_budget(water_price, water_cap)
+            dual += _priced_budget(compost_price, compost_cap)
+            for members, group_results in zip(groups.values(), results):
+                for b, (row, value) in zip(members, group_results):
+                    actions[b] = row
+                    dual += value
+            upper_bound = min(upper_bound, dual)
+
+            water_used, compost_used = _season_usage(beds, actions, horizon)
+            water_excess = np.where(
+                np.isfinite(water_cap), water_used - water_cap, 0.0
+            )
+            compost_excess = np.where(
+                np.isfinite(compost_cap), compost_used - compost_cap, 0.0
+            )
+            if (
+                (actions >= 0).all()
+                and (water_excess <= 0).all()
+                and (compost_excess <= 0).all()
+            ):
+                profit = _plan_profits(beds, base, actions).sum()
+                if best is None or profit > best[0]:
+                    best = (profit, actions.copy())
+                if upper_bound - profit <= tol * max(abs(upper_bound), 1e-9):
+                    break
+
+            shrink = step / np.sqrt(k + 1)
+            water_price = _price_step(
+                water_price, water_excess, shrink * water_scale
+            )
+            compost_price = _price_step(
+                compost_price, compost_excess, shrink * compost_scale
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    actions = _repair(
+        beds, base, actions, water_cap, compost_cap, water_price, compost_price
+    )
+    profits = _plan_profits(beds, base, actions)
+    if best is not None and best[0] >= profits[actions[:, 0] >= 0].sum():
+        actions = best[1]
+        profits = _plan_profits(beds, base, actions)
+    water_used, compost_used = _season_usage(beds, actions, horizon)
+    return MultiBedSolution(
+        actions=actions,
+        profits=profits,
+        water_used=water_used,
+        compost_used=compost_used,
+        water_price=water_price,
+        compost_price=compost_price,
+        upper_bound=float(upper_bound),
+        iterations=iterations,
+    )
+
+
+def _price_step(
+    price: np.ndarray, excess: np.ndarray, size: float
+) -> np.ndarray:
+    """Projected subgradient step, normalized by the largest violation."""
+    scale = np.abs(excess).max()
+    if scale == 0:
+        return price
+    return np.maximum(0.0, price + size * excess / scale)
+
+
+def _plan_profits(
+    beds: Sequence[Bed],
+    base: dict[RotationProblem, np.ndarray],
+    actions: np.ndarray,
+) -> np.ndarray:
+    profits = np.zeros(len(beds))
+    for b, (bed, row) in enumerate(zip(beds, actions)):
+        planted = np.flatnonzero(row >= 0)
+        profits[b] = base[bed.problem][planted, row[planted]].sum()
+    return profits
+
+
+def _repair(
+    beds: Sequence[Bed],
+    base: dict[RotationProblem, np.ndarray],
+    actions: np.ndarray,
+    water_cap: np.ndarray,
+    compost_cap: np.ndarray,
+    water_price: np.ndarray,
+    compost_price: np.ndarray,
+) -> np.ndarray:
+    """Commit beds in order, re-planning those that no longer fit the budgets.
+
+    Each bed may use the remaining capacity minus a reserve holding the
+    cheapest action of every bed still to be planned, so early beds cannot
+    starve later ones. The last masked solve per problem is reused while the
+    mask is unchanged.
+    """
+    usage = [_usage(bed.problem) for bed in beds]
+    water_reserve = sum(water.min() for water, _ in usage)
+    compost_reserve = sum(compost.min() for _, compost in usage)
+    water_left = water_cap.copy()
+    compost_left = compost_cap.copy()
+    repaired = np.full_like(actions, -1)
+    cache: dict[RotationProblem, tuple[bytes, TabularSolution]] = {}
+    for b, bed in enumerate(beds):
+        water, compost = usage[b]
+        water_reserve -= water.min()
+        compost_reserve -= compost.min()
+        water_room = water_left - water_reserve
+        compost_room = compost_left - compost_reserve
+        row = actions[b]
+        fits = (row >= 0).all() and (
+            (water[row] <= water_room).all()
+            and (compost[row] <= compost_room).all()
+        )
+        if not fits:
+            allowed = (water[None, :] <= water_room[:, None]) & (
+                compost[None, :] <= compost_room[:, None]
+            )
+            key = allowed.tobytes()
+            cached = cache.get(bed.problem)
+            if cached is None or cached[0] != key:
+                rewards = _priced_rewards(
+                    bed.problem, base[bed.problem], water_price, compost_price
+                )
+                rewards[~allowed] = -np.inf
+                model = compile_model(bed.problem)
+                cached = (key, solve(model, rewards, keep_values=False))
+                cache[bed.problem] = cached
+            row = cached[1].actions(bed.initial)
+            if (row < 0).any():
+                continue
+        repaired[b] = row
+        water_left -= water[row]
+        compost_left -= compost[row]
+    return repaired
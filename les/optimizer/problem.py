@@ -0,0 +1,142 @@
+"""Problem definition for the crop rotation optimizer.
+
+A :class:`RotationProblem` bundles the crop palette, soil/resource bounds and
+horizon that the tabular solver compiles into dense transition and reward
+arrays. Instances are frozen and hashable so compiled structures can be cached.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, NamedTuple, Sequence
+
+from les_state_reduction import SoilBounds, canonical_rotation_phase
+
+
+@dataclass(frozen=True)
+class Crop:
+    """A single action in the rotation palette.
+
+    ``yields`` and ``costs`` hold one seasonal cycle; season ``t`` uses the
+    entry at ``canonical_rotation_phase(t, len(cycle))``.
+    """
+
+    name: str
+    family: str
+    price: float
+    yields: tuple[float, ...]
+    costs: tuple[float, ...]
+    soil_delta: tuple[int, int, int] = (0, 0, 0)
+    disease_delta: int = 0
+    water: int = 0
+    compost: int = 0
+
+    def yield_at(self, t: int) -> float:
+        return self.yields[canonical_rotation_phase(t, len(self.yields))]
+
+    def cost_at(self, t: int) -> float:
+        return self.costs[canonical_rotation_phase(t, len(self.costs))]
+
+    def profit(self, t: int) -> float:
+        return self.price * self.yield_at(t) - self.cost_at(t)
+
+
+class RotationState(NamedTuple):
+    """Bed state at the start of a season."""
+
+    n: int
+    c: int
+    s: int
+    d: int
+    k: int
+    family: str | None = None
+    cooldown: int = 0
+
+
+@dataclass(frozen=True)
+class RotationProblem:
+    """Single-bed rotation problem over a finite horizon of seasons."""
+
+    crops: tuple[Crop, ...]
+    horizon: int
+    n_max: int = 5
+    c_max: int = 5
+    s_max: int = 5
+    d_max: int = 5
+    bounds: SoilBounds = SoilBounds(min_n=2, min_c=2, min_s=2, max_d=5)
+    disease_half_life: int = 8
+    water_budget: int = 6
+    k_max: int = 6
+    cover_family: str = "Cover"
+    cooldown_crop: str | None = "Tomato"
+    cooldown_seasons: int = 8
+
+    def __post_init__(self) -> None:
+        if not self.crops:
+            raise ValueError("At least one crop is required")
+        if self.horizon < 0:
+            raise ValueError("horizon must be non-negative")
+        names = [crop.name for crop in self.crops]
+        if len(set(names)) != len(names):
+            raise ValueError("Crop names must be unique")
+        for crop in self.crops:
+            if crop.price < 0:
+                raise ValueError(f"Negative price for {crop.name}")
+            if not crop.yields or not crop.costs:
+                raise ValueError(f"Empty yield or cost cycle for {crop.name}")
+            if any(y < 0 for y in crop.yields):
+                raise ValueError(f"Negative yield for {crop.name}")
+            if any(c < 0 for c in crop.costs):
+                raise ValueError(f"Negative cost for {crop.name}")
+
+    @property
+    def families(self) -> tuple[str, ...]:
+        """Distinct crop families in palette order."""
+        return tuple(dict.fromkeys(crop.family for crop in self.crops))
+
+    @property
+    def crop_names(self) -> tuple[str, ...]:
+        return tuple(crop.name for crop in self.crops)
+
+    @classmethod
+    def from_tables(
+        cls,
+        prices: Mapping[str, float],
+        family: Mapping[str, str],
+        yields: Mapping[str, Sequence[float]],
+        costs: Mapping[str, Sequence[float]],
+        soil_delta: Mapping[str, tuple[int, int, int]],
+        disease_delta: Mapping[str, int],
+        resource_delta: Mapping[str, tuple[int, int]],
+        horizon: int,
+        **kwargs,
+    ) -> "RotationProblem":
+        """Build a problem from the per-action tables used by ``demo.py``."""
+        tables = {
+            "family": family,
+            "yields": yields,
+            "costs": costs,
+            "soil_delta": soil_delta,
+            "disease_delta": disease_delta,
+            "resource_delta": resource_delta,
+        }
+        keys = set(prices)
+        for name, mapping in tables.items():
+            if set(mapping) != keys:
+                raise ValueError(
+                    f"Action keys mismatch in {name}: {set(mapping) ^ keys}"
+                )
+        crops = tuple(
+            Crop(
+                name=act,
+                family=family[act],
+                price=float(prices[act]),
+                yields=tuple(float(y) for y in yields[act]),
+                costs=tuple(float(c) for c in costs[act]),
+                soil_delta=tuple(soil_delta[act]),
+                disease_delta=int(disease_delta[act]),
+                water=int(resource_delta[act][0]),
+                compost=int(resource_delta[act][1]),
+            )
+            for act in prices
+        )
+        return cls(crops=crops, horizon=horizon, **kwargs)
@@ -0,0 +1,322 @@
+"""Forward rotation planner with monotonicity-based dominance pruning.
+
+When every action's soil transition is monotone (certified with
+:func:`les_state_reduction.check_monotone_lattice`), the value-to-go is
+monotone in the bed state: more N/C/S/K and less disease never hurts, because
+rewards do not depend on soil and the guards are lower bounds on N/C/S/K and an
+upper bound on disease. The planner exploits that in three ways:
+
+* a partial plan is dropped when another plan reaching the same family and
+  cooldown has earned at least as much and ends in a dominating soil state;
+* a crop is dropped for a season when a crop of the same family earns at least
+  as much there and leaves the soil no worse;
+* a partial plan is dropped when its profit plus an optimistic bound falls
+  below a known feasible plan. The bound comes from a soil-free relaxation,
+  whose single state per (family, cooldown) dominates every soil state.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from les_state_reduction import check_monotone_lattice
+
+from .problem import RotationProblem, RotationState
+from .tabular import (
+    PlanStep,
+    RotationModel,
+    _state_shape,
+    compile_rest_table,
+    compile_soil_table,
+    decode_state,
+    encode_state,
+    reward_table,
+    state_digits,
+)
+
+
+@dataclass
+class PruneStats:
+    certified: bool = False
+    states_expanded: int = 0
+    labels_generated: int = 0
+    pruned_dominated: int = 0
+    pruned_bound: int = 0
+    actions_pruned: int = 0
+    actions_total: int = 0
+
+
+@dataclass(eq=False)
+class PrunedSolution:
+    value: float
+    plan: list[PlanStep]
+    stats: PruneStats = field(default_factory=PruneStats)
+
+
+@lru_cache(maxsize=8)
+def certify_monotone(problem: RotationProblem) -> bool:
+    """Check every crop's guarded soil transition for monotonicity.
+
+    States are compared in the dominance order (N, C, S up, disease down), so
+    disease is mirrored before the componentwise check. Infeasible moves map
+    below every state, which also certifies that feasibility is upward closed.
+    """
+    limits = {
+        "n": problem.n_max,
+        "c": problem.c_max,
+        "s": problem.s_max,
+        "d": problem.d_max,
+    }
+    soil = compile_soil_table(problem)
+    shape = tuple(limits[name] + 1 for name in "ncsd")
+    d_max = problem.d_max
+
+    for a in range(len(problem.crops)):
+        def transition(states: np.ndarray, a: int = a) -> np.ndarray:
+            n, c, s = states[:, 0], states[:, 1], states[:, 2]
+            d = d_max - states[:, 3]
+            index = np.ravel_multi_index((n, c, s, d), shape)
+            nxt = soil[index, a].astype(np.intp)
+            image = np.stack(
+                np.unravel_index(np.maximum(nxt, 0), shape), axis=1
+            )
+            image[:, 3] = d_max - image[:, 3]
+            image[nxt < 0] = -1
+            return image
+
+        if not check_monotone_lattice(limits, transition, vectorized=True).ok:
+            return False
+    return True
+
+
+class _Successors:
+    """On-demand successors with the state encoding of :func:`compile_model`.
+
+    Only the two small tables :func:`compile_model` is built from are
+    compiled, so the search never allocates the dense ``(A, S)`` transition
+    array.
+    """
+
+    def __init__(self, problem: RotationProblem) -> None:
+        self.problem = problem
+        self.shape = _state_shape(problem)
+        self.rest_table = compile_rest_table(problem)
+        self.n_rest = self.rest_table.shape[1]
+        self.soil = compile_soil_table(problem).tolist()
+        self.rest = self.rest_table.tolist()
+
+    def next(self, a: int, code: int) -> int:
+        """Successor of ``code`` under action ``a``; ``-1`` if infeasible."""
+        soil, rest = divmod(code, self.n_rest)
+        soil2 = self.soil[soil][a]
+        rest2 = self.rest[a][rest]
+        if soil2 < 0 or rest2 < 0:
+            return -1
+        return soil2 * self.n_rest + rest2
+
+    def digits(self, code: int) -> tuple[int, ...]:
+        return state_digits(self.shape, code)
+
+    def encode(self, state: RotationState) -> int:
+        return encode_state(self.problem, self.shape, state)
+
+    def decode(self, code: int) -> RotationState:
+        return decode_state(self.problem, self.shape, code)
+
+
+class _ModelSuccessors(_Successors):
+    """Successors read from an already compiled :class:`RotationModel`."""
+
+    def __init__(self, model: RotationModel) -> None:
+        super().__init__(model.problem)
+        self.next_state = model.next_state
+
+    def next(self, a: int, code: int) -> int:
+        return int(self.next_state[a, code])
+
+
+def _relaxed_bound(
+    rest_table: np.ndarray, rewards: np.ndarray, shape
+) -> np.ndarray:
+    """Soil-free upper bound ``ub[t, family, cooldown]`` on profit-to-go.
+
+    Reads the rest-table rows at full compost, which admit every action that
+    any compost level does; family and cooldown moves do not depend on it.
+    """
+    horizon = rewards.shape[0]
+    n_fam, n_cd = shape[5], shape[6]
+    n_tail = n_fam * n_cd
+    top = rest_table[:, -n_tail:]
+    feasible = top >= 0
+    tail2 = top % n_tail
+    ub = np.full((horizon + 1, n_tail), -np.inf)
+    ub[horizon] = 0.0
+    for t in range(horizon - 1, -1, -1):
+        cand = rewards[t, :, None] + ub[t + 1][tail2]
+        cand[~feasible] = -np.inf
+        ub[t] = cand.max(axis=0, initial=-np.inf)
+    return ub.reshape(horizon + 1, n_fam, n_cd)
+
+
+def _dominated_actions(
+    problem: RotationProblem, rewards: np.ndarray
+) -> np.ndarray:
+    """``dominated[t, a]`` when another crop is as good in season ``t``."""
+    crops = problem.crops
+    horizon = rewards.shape[0]
+    dominated = np.zeros((horizon, len(crops)), dtype=bool)
+    for a, ca in enumerate(crops):
+        for b, cb in enumerate(crops):
+            if a == b or ca.family != cb.family:
+                continue
+            if problem.cooldown_crop in (ca.name, cb.name):
+                continue
+            no_worse = (
+                all(x <= y for x, y in zip(ca.soil_delta, cb.soil_delta))
+                and ca.disease_delta >= cb.disease_delta
+                and ca.compost <= cb.compost
+                and (
+                    ca.water > problem.water_budget
+                    or cb.water <= problem.water_budget
+                )
+            )
+            if not no_worse:
+                continue
+            # Strictly worse reward, or a tie broken towards the earlier crop.
+            dominated[:, a] |= (rewards[:, a] < rewards[:, b]) | (
+                (rewards[:, a] == rewards[:, b]) & (b < a)
+            )
+    return dominated
+
+
+def _dominates(u: tuple, v: tuple) -> bool:
+    """Whether ``u`` dominates ``v`` on ``(n, c, s, d, k)``.
+
+    It has no less soil or compost and no more disease.
+    """
+    return (
+        u[0] >= v[0]
+        and u[1] >= v[1]
+        and u[2] >= v[2]
+        and u[3] <= v[3]
+        and u[4] >= v[4]
+    )
+
+
+def solve_pruned(
+    problem: RotationProblem | RotationModel,
+    initial: RotationState,
+    rewards: np.ndarray | None = None,
+) -> PrunedSolution:
+    """Find the optimal plan from ``initial`` by pruned forward search.
+
+    Returns the same optimal value as :func:`les.optimizer.solve`. Dominance
+    pruning is only applied when :func:`certify_monotone` succeeds; bound
+    pruning is always valid. Given a problem, successors are computed on
+    demand for surviving labels only; a compiled model's table is reused.
+    """
+    if isinstance(problem, RotationModel):
+        model = _ModelSuccessors(problem)
+    else:
+        model = _Successors(problem)
+    problem = model.problem
+    if rewards is None:
+        rewards = reward_table(problem)
+    horizon, n_actions = rewards.shape
+    stats = PruneStats(certified=certify_monotone(problem))
+    ub = _relaxed_bound(model.rest_table, rewards, model.shape)
+    if stats.certified:
+        dominated = _dominated_actions(problem, rewards)
+    else:
+        dominated = np.zeros((horizon, n_actions), dtype=bool)
+    stats.actions_total = horizon * n_actions
+    stats.actions_pruned = int(dominated.sum())
+    live = [np.flatnonzero(~dominated[t]).tolist() for t in range(horizon)]
+
+    lower = _greedy_lower_bound(model, rewards, ub, live, initial)
+    start = model.encode(initial)
+    layers: list[dict[int, tuple[float, int, int]]] = [{start: (0.0, -1, -1)}]
+    for t in range(horizon):
+        labels: dict[int, tuple[float, int, int]] = {}
+        for code, (g, _, _) in layers[-1].items():
+            stats.states_expanded += 1
+            for a in live[t]:
+                nxt = model.next(a, code)
+                if nxt < 0:
+                    continue
+                stats.labels_generated += 1
+                g2 = g + rewards[t, a]
+                known = labels.get(nxt)
+                if known is None or g2 > known[0]:
+                    labels[nxt] = (g2, code, int(a))
+
+        survivors: dict[int, tuple[float, int, int]] = {}
+        groups: dict[tuple[int, int], list[tuple[float, tuple, int]]] = {}
+        for nxt, label in labels.items():
+            n, c, s, d, k, fam, cd = model.digits(nxt)
+            if label[0] + ub[t + 1, fam, cd] < lower - 1e-9:
+                stats.pruned_bound += 1
+                continue
+            groups.setdefault((fam, cd), []).append(
+                (label[0], (n, c, s, d, k), nxt)
+            )
+        for members in groups.values():
+            members.sort(key=lambda m: -m[0])
+            kept: list[tuple[float, tuple, int]] = []
+            for g2, soil, nxt in members:
+                if stats.certified and any(
+                    _dominates(ks, soil) for _, ks, _ in kept
+                ):
+                    stats.pruned_dominated += 1
+                    continue
+                kept.append((g2, soil, nxt))
+                survivors[nxt] = labels[nxt]
+        layers.append(survivors)
+        if not survivors:
+            break
+
+    final = layers[-1] if len(layers) == horizon + 1 else {}
+    if not final:
+        return PrunedSolution(value=float("-inf"), plan=[], stats=stats)
+    code = max(final, key=lambda c: final[c][0])
+    value = final[code][0]
+    plan: list[PlanStep] = []
+    for t in range(horizon, 0, -1):
+        _, parent, action = layers[t][code]
+        plan.append(
+            PlanStep(
+                t=t - 1,
+                crop=problem.crops[action],
+                profit=float(rewards[t - 1, action]),
+                state=model.decode(parent),
+                next_state=model.decode(code),
+            )
+        )
+        code = parent
+    plan.reverse()
+    return PrunedSolution(value=float(value), plan=plan, stats=stats)
+
+
+def _greedy_lower_bound(
+    model, rewards, ub, live, initial: RotationState
+) -> float:
+    """Profit of a bound-guided greedy rollout; ``-inf`` if it gets stuck."""
+    code = model.encode(initial)
+    total = 0.0
+    for t in range(rewards.shape[0]):
+        best = None
+        for a in live[t]:
+            nxt = model.next(a, code)
+            if nxt < 0:
+                continue
+            _, _, _, _, _, fam, cd = model.digits(nxt)
+            score = rewards[t, a] + ub[t + 1, fam, cd]
+            if best is None or score > best[0]:
+                best = (score, a, nxt)
+        if best is None:
+            return float("-inf")
+        total += rewards[t, best[1]]
+        code = best[2]
+    return total
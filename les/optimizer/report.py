@@ -0,0 +1,103 @@
+"""Tabular reports for rotation plans.
+
+Rows are plain dictionaries so callers that only need numbers never import
+pandas; :func:`plan_frame` imports it on demand.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Sequence
+
+from .problem import RotationProblem, RotationState
+from .tabular import PlanStep
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import pandas as pd
+
+PLAN_COLUMNS = [
+    "Season", "Action", "Family",
+    "Price(AUD/kg)", "Yield(kg/bed)", "Cost(AUD/bed)", "Profit(AUD)",
+    "N", "C", "S", "D", "K",
+    "N_next", "C_next", "S_next", "D_next", "K_next", "W_used",
+]
+
+
+def plan_rows(
+    problem: RotationProblem, initial: RotationState, steps: Sequence[PlanStep]
+) -> list[dict[str, Any]]:
+    """One row per planned season, plus a closing row for an early end."""
+    rows: list[dict[str, Any]] = []
+    state = initial
+    for step in steps:
+        crop = step.crop
+        nxt = step.next_state
+        rows.append({
+            "Season": step.t + 1,
+            "Action": crop.name,
+            "Family": crop.family,
+            "Price(AUD/kg)": crop.price,
+            "Yield(kg/bed)": crop.yield_at(step.t),
+            "Cost(AUD/bed)": crop.cost_at(step.t),
+            "Profit(AUD)": round(step.profit, 2),
+            "N": state.n, "C": state.c, "S": state.s,
+            "D": state.d, "K": state.k,
+            "N_next": nxt.n, "C_next": nxt.c, "S_next": nxt.s,
+            "D_next": nxt.d, "K_next": nxt.k,
+            "W_used": crop.water,
+        })
+        state = nxt
+    if len(steps) < problem.horizon:
+        row = dict.fromkeys(PLAN_COLUMNS)
+        row.update(
+            Season=len(steps) + 1,
+            N=state.n, C=state.c, S=state.s, D=state.d, K=state.k,
+        )
+        rows.append(row)
+    return rows
+
+
+def plan_summary(
+    problem: RotationProblem, initial: RotationState, steps: Sequence[PlanStep]
+) -> dict[str, Any]:
+    end = steps[-1].next_state if steps else initial
+    bounds = problem.bounds
+    max_d = problem.d_max if bounds.max_d is None else bounds.max_d
+    return {
+        "Total profit (AUD)": round(sum(step.profit for step in steps), 2),
+        "End soil (N,C,S,D)": (end.n, end.c, end.s, end.d),
+        "End resources (K)": (end.k,),
+        "Constraints": (
+            f"N,C,S >= ({bounds.min_n},{bounds.min_c},{bounds.min_s}); "
+            f"D <= {max_d}; "
+            "no same-family back-to-back (Cover resets); "
+            f"{problem.cooldown_crop} cooldown "
+            f"{problem.cooldown_seasons} seasons."
+        ),
+    }
+
+
+def plan_frame(rows: Sequence[dict[str, Any]]) -> "pd.DataFrame":
+    """Return ``rows`` as a DataFrame; requires pandas."""
+    try:
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ImportError(
+            "plan_frame requires pandas (pip install pandas)"
+        ) from exc
+    return pd.DataFrame(list(rows), columns=PLAN_COLUMNS)
+
+
+def format_table(
+    rows: Sequence[dict[str, Any]], columns: Sequence[str] = PLAN_COLUMNS
+) -> str:
+    """Render rows as a fixed-width text table without pandas."""
+    cells = [
+        ["" if row.get(c) is None else str(row.get(c)) for c in columns]
+        for row in rows
+    ]
+    widths = [
+        max([len(c)] + [len(r[i]) for r in cells])
+        for i, c in enumerate(columns)
+    ]
+    lines = ["  ".join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.rjust(w) for v, w in zip(r, widths)) for r in cells]
+    return "\n".join(lines)
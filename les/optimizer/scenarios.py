@@ -0,0 +1,332 @@
+"""Batch scenario sweeps for the rotation optimizer.
+
+A sweep re-solves one rotation problem under many price/yield/cost tables and
+initial states. The dynamics do not depend on those inputs, so the compiled
+transition array is built once and placed in shared memory; worker processes
+attach to it without copying and only rebuild the small ``(T, A)`` reward table
+per scenario. Results stream to a columnar file as scenarios complete.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+import numpy as np
+
+from les_state_reduction import SoilBounds
+
+from .problem import RotationProblem, RotationState
+from .tabular import (
+    RotationModel,
+    _state_shape,
+    compile_model,
+    reward_table,
+    solve,
+)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Overrides applied to a base problem for one sweep run.
+
+    ``prices`` maps crop names to prices; ``yields`` and ``costs`` map crop
+    names to seasonal cycles. Crops not mentioned keep their base values.
+    """
+
+    name: str
+    initial: RotationState
+    prices: Mapping[str, float] = field(default_factory=dict)
+    yields: Mapping[str, Sequence[float]] = field(default_factory=dict)
+    costs: Mapping[str, Sequence[float]] = field(default_factory=dict)
+
+    def apply(self, problem: RotationProblem) -> RotationProblem:
+        crops = tuple(
+            replace(
+                crop,
+                price=float(self.prices.get(crop.name, crop.price)),
+                yields=tuple(self.yields.get(crop.name, crop.yields)),
+                costs=tuple(self.costs.get(crop.name, crop.costs)),
+            )
+            for crop in problem.crops
+        )
+        return replace(problem, crops=crops)
+
+
+@dataclass
+class SweepStats:
+    scenarios: int = 0
+    elapsed_s: float = 0.0
+    output: Path | None = None
+
+    @property
+    def scenarios_per_second(self) -> float:
+        return self.scenarios / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def result_columns(first_k: int) -> list[str]:
+    columns = ["scenario", "total_profit",
+               "end_n", "end_c", "end_s", "end_d", "end_k"]
+    return columns + [f"action_{i + 1}" for i in range(first_k)]
+
+
+def _evaluate(
+    model: RotationModel, scenario: Scenario, first_k: int
+) -> list[Any]:
+    rewards = reward_table(scenario.apply(model.problem))
+    solution = solve(model, rewards, keep_values=False)
+    steps = solution.plan(scenario.initial)
+    end = steps[-1].next_state if steps else scenario.initial
+    names = [step.crop.name for step in steps[:first_k]]
+    names += [""] * (first_k - len(names))
+    return [
+        scenario.name,
+        solution.value_of(scenario.initial),
+        end.n,
+        end.c,
+        end.s,
+        end.d,
+        end.k,
+        *names,
+    ]
+
+
+# Per-worker state populated by ``_attach``.
+_WORKER: dict[str, Any] = {}
+
+
+def _share_model(
+    model: RotationModel,
+) -> tuple[shared_memory.SharedMemory, list[Any]]:
+    """Copy ``next_state`` and the compacted feasible pairs into one block.
+
+    Returns the block and a layout of ``(offset, shape, dtype)`` entries:
+    ``next_state`` first, then ``src``/``dst`` for each action.
+    """
+    arrays = [model.next_state]
+    for src, dst in model.feasible_pairs:
+        arrays.extend((src, dst))
+    layout, offset = [], 0
+    for arr in arrays:
+        layout.append((offset, arr.shape, arr.dtype.str))
+        offset += -(-arr.nbytes // 8) * 8
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for arr, view in zip(arrays, _views(shm, layout)):
+        view[...] = arr
+    return shm, layout
+
+
+def _views(
+    shm: shared_memory.SharedMemory, layout: list[Any]
+) -> list[np.ndarray]:
+    return [
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        for offset, shape, dtype in layout
+    ]
+
+
+def _attach(
+    problem: RotationProblem, shm_name: str, layout: list[Any]
+) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    next_state, *flat = _views(shm, layout)
+    _WORKER["shm"] = shm
+    _WORKER["model"] = RotationModel(
+        problem=problem,
+        shape=_state_shape(problem),
+        next_state=next_state,
+        pairs=list(zip(flat[::2], flat[1::2])),
+    )
+
+
+def _evaluate_in_worker(scenario: Scenario, first_k: int) -> list[Any]:
+    return _evaluate(_WORKER["model"], scenario, first_k)
+
+
+def run_sweep(
+    problem: RotationProblem,
+    scenarios: Iterable[Scenario],
+    *,
+    first_k: int = 4,
+    workers: int | None = None,
+) -> Iterator[list[Any]]:
+    """Yield one result row per scenario, in input order.
+
+    Rows follow :func:`result_columns`. With ``workers=1`` scenarios are solved
+    in-process; otherwise a process pool attaches to the compiled transitions
+    and feasible-pair index arrays in shared memory, and at most a few
+    scenarios per worker are kept in flight.
+    """
+    model = compile_model(problem)
+    if workers == 1:
+        for scenario in scenarios:
+            yield _evaluate(model, scenario, first_k)
+        return
+
+    shm, layout = _share_model(model)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach,
+            initargs=(problem, shm.name, layout),
+        ) as executor:
+            window = 4 * (workers or os.cpu_count() or 1)
+            pending: deque[Future] = deque()
+            for scenario in scenarios:
+                pending.append(
+                    executor.submit(_evaluate_in_worker, scenario, first_k)
+                )
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def write_results(
+    rows: Iterable[list[Any]],
+    path: Path,
+    columns: Sequence[str],
+    group_size: int = 1024,
+) -> tuple[int, Path]:
+    """Stream rows to ``path``; return the row count and the path written.
+
+    ``.parquet`` paths are written one row group per ``group_size`` rows when
+    ``pyarrow`` is installed; otherwise rows go to a CSV file next to ``path``
+    with a ``.csv`` suffix.
+    """
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:  # pragma: no cover - optional dependency
+            path = path.with_suffix(".csv")
+        else:  # pragma: no cover - exercised only with pyarrow installed
+            schema = None
+            writer = None
+            count = 0
+            batch: list[list[Any]] = []
+
+            def columnar(batch: list[list[Any]]) -> "pa.Table":
+                return pa.table(
+                    {c: [r[i] for r in batch] for i, c in enumerate(columns)}
+                )
+
+            for row in rows:
+                batch.append(row)
+                count += 1
+                if len(batch) == group_size:
+                    table = columnar(batch)
+                    schema = schema or table.schema
+                    writer = writer or pq.ParquetWriter(str(path), schema)
+                    writer.write_table(table.cast(schema))
+                    batch = []
+            if batch or writer is None:
+                table = columnar(batch)
+                writer = writer or pq.ParquetWriter(
+                    str(path), schema or table.schema
+                )
+                writer.write_table(table.cast(schema or table.schema))
+            writer.close()
+            return count, path
+    count = 0
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count, path
+
+
+def load_problem(path: Path) -> RotationProblem:
+    """Load a problem from JSON holding ``demo.py``-style per-action tables.
+
+    Keys are the arguments of :meth:`RotationProblem.from_tables`; ``bounds``
+    may be given as a mapping of :class:`SoilBounds` fields.
+    """
+    data = json.loads(path.read_text())
+    if isinstance(data.get("bounds"), Mapping):
+        data["bounds"] = SoilBounds(**data["bounds"])
+    return RotationProblem.from_tables(**data)
+
+
+def load_scenarios(path: Path) -> Iterator[Scenario]:
+    """Read scenarios from a JSON-lines file, one object per line.
+
+    Each object has ``initial`` as ``[n, c, s, d, k]`` (optionally followed by
+    family and cooldown) plus optional ``name``, ``prices``, ``yields`` and
+    ``costs`` overrides.
+    """
+    with path.open() as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            yield Scenario(
+                name=str(data.get("name", i)),
+                initial=RotationState(*data["initial"]),
+                prices=data.get("prices", {}),
+                yields=data.get("yields", {}),
+                costs=data.get("costs", {}),
+            )
+
+
+def main(argv: Sequence[str] | None = None) -> SweepStats:
+    parser = argparse.ArgumentParser(
+        description="Sweep the rotation optimizer over scenarios"
+    )
+    parser.add_argument(
+        "problem", type=Path, help="JSON file with the base problem tables"
+    )
+    parser.add_argument(
+        "scenarios",
+        type=Path,
+        help="JSON-lines file with one scenario per line",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("sweep.csv"),
+        help="Result file (.csv, or .parquet when pyarrow is installed)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes"
+    )
+    parser.add_argument(
+        "--first-k", type=int, default=4, help="Leading actions to report"
+    )
+    args = parser.parse_args(argv)
+
+    problem = load_problem(args.problem)
+    stats = SweepStats()
+    start = time.perf_counter()
+    rows = run_sweep(
+        problem,
+        load_scenarios(args.scenarios),
+        first_k=args.first_k,
+        workers=args.workers,
+    )
+    stats.scenarios, stats.output = write_results(
+        rows, args.output, result_columns(args.first_k)
+    )
+    stats.elapsed_s = time.perf_counter() - start
+    print(
+        f"{stats.scenarios} scenarios in {stats.elapsed_s:.2f}s "
+        f"({stats.scenarios_per_second:.1f} scenarios/s) -> {stats.output}"
+    )
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""Stationary, phase-indexed rotation policies for unbounded horizons.
+
+Yields and costs repeat with the seasonal cycle, so once time is folded into
+``canonical_rotation_phase(t, period)`` the rotation problem becomes a periodic
+Markov decision process. Value iteration over one cycle of phases (discounted,
+or relative value iteration for average reward) converges to a policy indexed
+by phase and state; planning any horizon is then a cheap forward rollout.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from les_state_reduction import canonical_rotation_phase
+
+from .problem import RotationProblem, RotationState
+from .tabular import PlanStep, RotationModel, bellman_backup, compile_model
+
+
+def _minimal_period(cycle: Sequence[float]) -> int:
+    """Shortest period ``p`` of ``cycle`` among the divisors of its length."""
+    n = len(cycle)
+    for p in range(1, n + 1):
+        if n % p == 0 and all(cycle[i] == cycle[i % p] for i in range(p, n)):
+            return p
+    return n
+
+
+def seasonal_period(problem: RotationProblem) -> int:
+    """Period of the problem's reward cycle, in seasons."""
+    periods = [_minimal_period(crop.yields) for crop in problem.crops]
+    periods += [_minimal_period(crop.costs) for crop in problem.crops]
+    return math.lcm(*periods)
+
+
+@dataclass(eq=False)
+class StationaryPolicy:
+    """Phase-indexed policy produced by :func:`solve_stationary`.
+
+    ``policy[p, s]`` is the action for state ``s`` in seasons whose phase is
+    ``p``. ``value`` holds discounted values, or relative values when solved
+    for average reward, in which case ``gain`` is the long-run profit per
+    season.
+    """
+
+    model: RotationModel
+    period: int
+    rewards: np.ndarray
+    value: np.ndarray
+    policy: np.ndarray
+    iterations: int
+    converged: bool
+    gain: float | None = None
+
+    def action(self, state: RotationState, t: int) -> int:
+        phase = canonical_rotation_phase(t, self.period)
+        return int(self.policy[phase, self.model.encode(state)])
+
+    def plan(
+        self, initial: RotationState, horizon: int, start: int = 0
+    ) -> list[PlanStep]:
+        """Roll the policy forward ``horizon`` seasons from ``start``."""
+        crops = self.model.problem.crops
+        steps: list[PlanStep] = []
+        code = self.model.encode(initial)
+        for t in range(start, start + horizon):
+            phase = canonical_rotation_phase(t, self.period)
+            action = int(self.policy[phase, code])
+            if action < 0:
+                break
+            nxt = int(self.model.next_state[action, code])
+            steps.append(
+                PlanStep(
+                    t=t,
+                    crop=crops[action],
+                    profit=float(self.rewards[phase, action]),
+                    state=self.model.decode(code),
+                    next_state=self.model.decode(nxt),
+                )
+            )
+            code = nxt
+        return steps
+
+
+def solve_stationary(
+    problem: RotationProblem | RotationModel,
+    *,
+    discount: float = 0.95,
+    average_reward: bool = False,
+    period: int | None = None,
+    tol: float = 1e-6,
+    max_iter: int = 10_000,
+    damping: float = 0.5,
+    patience: int | None = None,
+) -> StationaryPolicy:
+    """Compute a stationary phase-indexed policy by periodic value iteration.
+
+    Parameters
+    ----------
+    problem:
+        Problem (its ``horizon`` is ignored) or compiled model.
+    discount:
+        Per-season discount factor for the discounted criterion.
+    average_reward:
+        Maximize long-run profit per season with relative value iteration
+        instead; ``discount`` is then ignored.
+    period:
+        Seasons per cycle; defaults to :func:`seasonal_period`.
+    tol:
+        Stop when the per-cycle value change (discounted) or the span of the
+        change (average reward) drops below this.
+    max_iter:
+        Maximum number of full cycles.
+    damping:
+        Aperiodicity weight for relative value iteration, in ``(0, 1]``.
+    patience:
+        Also stop once the policy has been unchanged for this many cycles.
+    """
+    if isinstance(problem, RotationModel):
+        model = problem
+    else:
+        model = compile_model(problem)
+    if period is None:
+        period = seasonal_period(model.problem)
+    if not 0 < discount < 1 and not average_reward:
+        raise ValueError("discount must be in (0, 1)")
+    gamma = 1.0 if average_reward else discount
+    crops = model.problem.crops
+    rewards = np.array(
+        [[crop.profit(p) for crop in crops] for p in range(period)],
+        dtype=np.float64,
+    ).reshape(period, len(crops))
+
+    n_states = model.n_states
+    value = np.zeros((period, n_states))
+    policy_dtype = np.int8 if len(crops) <= np.iinfo(np.int8).max else np.int16
+    policy = np.empty((period, n_states), dtype=policy_dtype)
+    start = np.zeros(n_states)
+    previous = np.full_like(policy, -1)
+    stable = 0
+    converged = False
+    gain = None
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        # One cycle: back up from phase 0 of the next cycle through all phases.
+        for p in range(period - 1, -1, -1):
+            v_next = gamma * (start if p == period - 1 else value[p + 1])
+            bellman_backup(model, rewards[p], v_next, value[p], policy[p])
+        stable = stable + 1 if np.array_equal(policy, previous) else 0
+        previous[:] = policy
+
+        updated = value[0]
+        finite = np.isfinite(updated)
+        if not finite.any():
+            break
+        same_support = np.array_equal(finite, np.isfinite(start))
+        delta = updated[finite] - start[finite] if same_support else None
+        settled = patience is not None and stable >= patience
+        if average_reward:
+            if delta is not None and (
+                delta.max() - delta.min() < tol or settled
+            ):
+                gain = float((delta.max() + delta.min()) / 2) / period
+                converged = True
+                break
+            ref = updated[np.flatnonzero(finite)[0]]
+            with np.errstate(invalid="ignore"):
+                damped = (1 - damping) * start + damping * (updated - ref)
+            start = np.where(finite, damped, -np.inf)
+        else:
+            if delta is not None and (np.abs(delta).max() < tol or settled):
+                converged = True
+                break
+            start = updated.copy()
+    return StationaryPolicy(
+        model=model,
+        period=period,
+        rewards=rewards,
+        value=value,
+        policy=policy,
+        iterations=iterations,
+        converged=converged,
+        gain=gain,
+    )
@@ -0,0 +1,420 @@
+"""Tabular backward-induction solver for the rotation problem.
+
+The bed state ``(N, C, S, D, K, previous family, cooldown)`` is encoded as a
+mixed-radix integer. Transitions for every (action, state) pair are compiled
+once into a dense ``int32`` array and rewards into a ``(T, A)`` table, so the
+backward sweep is a sequence of NumPy gathers with a running max over actions.
+The dense array is the product of two small tables, one for the soil digits
+and one for the compost, family and cooldown digits, which the lazy planner in
+:mod:`les.optimizer.pruning` reads directly.
+Memory per time step is ``O(states)`` regardless of the palette size and there
+is no recursion, so long horizons and large palettes stay cheap.
+"""
+from __future__ import annotations
+
+import tracemalloc
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from les_state_reduction import (
+    SoilDelta,
+    compile_soil_transitions,
+    disease_decay_factor,
+)
+
+from .problem import Crop, RotationProblem, RotationState
+
+# Sentinel stored in ``RotationModel.next_state`` for infeasible moves.
+INFEASIBLE = -1
+
+
+class PlanStep(NamedTuple):
+    """One season of a reconstructed plan."""
+
+    t: int
+    crop: Crop
+    profit: float
+    state: RotationState
+    next_state: RotationState
+
+
+@dataclass(eq=False)
+class RotationModel:
+    """Compiled dynamics of a :class:`RotationProblem`.
+
+    ``next_state[a, s]`` is the encoded successor of state ``s`` under action
+    ``a`` or :data:`INFEASIBLE`. The array depends only on the dynamics, not on
+    prices, yields or costs, so it can be shared across reward scenarios.
+    """
+
+    problem: RotationProblem
+    shape: tuple[int, ...]
+    next_state: np.ndarray
+    pairs: list[tuple[np.ndarray, np.ndarray]] | None = field(
+        default=None, repr=False
+    )
+
+    @property
+    def n_states(self) -> int:
+        return int(np.prod(self.shape))
+
+    @property
+    def feasible_pairs(self) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Per action, the feasible source states and their successors.
+
+        Built on first use unless supplied as ``pairs`` (e.g. views into shared
+        memory, see :mod:`les.optimizer.scenarios`).
+        """
+        if self.pairs is None:
+            pairs = []
+            for row in self.next_state:
+                src = np.flatnonzero(row >= 0)
+                pairs.append((src, row[src].astype(np.intp)))
+            self.pairs = pairs
+        return self.pairs
+
+    @property
+    def n_actions(self) -> int:
+        return len(self.problem.crops)
+
+    def encode(self, state: RotationState) -> int:
+        return encode_state(self.problem, self.shape, state)
+
+    def decode(self, code: int) -> RotationState:
+        return decode_state(self.problem, self.shape, code)
+
+
+def state_digits(shape: tuple[int, ...], code: int) -> tuple[int, ...]:
+    """``(n, c, s, d, k, family, cooldown)`` digits of ``code``."""
+    out = []
+    for size in reversed(shape):
+        code, digit = divmod(code, size)
+        out.append(digit)
+    return tuple(reversed(out))
+
+
+def encode_state(
+    problem: RotationProblem, shape: tuple[int, ...], state: RotationState
+) -> int:
+    """Mixed-radix code of ``state`` in a state space of ``shape``.
+
+    Cooldowns beyond the tracked range are clamped; other digits must fit.
+    """
+    families = problem.families
+    fam = (
+        len(families)
+        if state.family is None
+        else families.index(state.family)
+    )
+    cooldown = min(state.cooldown, shape[-1] - 1)
+    code = 0
+    for digit, size in zip((*state[:5], fam, cooldown), shape):
+        if not 0 <= digit < size:
+            raise ValueError(f"{state} is outside the state space {shape}")
+        code = code * size + digit
+    return code
+
+
+def decode_state(
+    problem: RotationProblem, shape: tuple[int, ...], code: int
+) -> RotationState:
+    """Inverse of :func:`encode_state`."""
+    n, c, s, d, k, fam, cooldown = state_digits(shape, int(code))
+    families = problem.families
+    family = families[fam] if fam < len(families) else None
+    return RotationState(n, c, s, d, k, family, cooldown)
+
+
+def _state_shape(problem: RotationProblem) -> tuple[int, ...]:
+    has_cooldown = problem.cooldown_crop in problem.crop_names
+    return (
+        problem.n_max + 1,
+        problem.c_max + 1,
+        problem.s_max + 1,
+        problem.d_max + 1,
+        problem.k_max + 1,
+        len(problem.families) + 1,
+        problem.cooldown_seasons + 1 if has_cooldown else 1,
+    )
+
+
+def compile_soil_table(problem: RotationProblem) -> np.ndarray:
+    """Return soil successors as an ``(n_soil_states, A)`` array view.
+
+    Built from :func:`les_state_reduction.compile_soil_transitions`; soil codes
+    match the leading ``(N, C, S, D)`` digits of the full state encoding.
+    """
+    table = compile_soil_transitions(
+        [
+            SoilDelta(
+                dn=crop.soil_delta[0],
+                dc=crop.soil_delta[1],
+                ds=crop.soil_delta[2],
+                dd=crop.disease_delta,
+            )
+            for crop in problem.crops
+        ],
+        {
+            "n": problem.n_max,
+            "c": problem.c_max,
+            "s": problem.s_max,
+            "d": problem.d_max,
+        },
+        problem.bounds,
+        disease_decay_factor(problem.disease_half_life),
+    )
+    soil = np.frombuffer(table.table, dtype=table.table.typecode)
+    return soil.reshape(table.n_states, table.n_actions)
+
+
+def compile_rest_table(problem: RotationProblem) -> np.ndarray:
+    """Return compost/family/cooldown successors as an ``(A, n_rest)`` array.
+
+    Rest codes are the trailing ``(K, family, cooldown)`` digits of the full
+    state encoding; :data:`INFEASIBLE` marks moves blocked by the water budget,
+    compost, family repetition or the cooldown crop. Soil guards live in
+    :func:`compile_soil_table`.
+    """
+    rest_shape = _state_shape(problem)[4:]
+    k, fam, cooldown = np.indices(rest_shape).reshape(3, -1)
+    families = problem.families
+    cover = (
+        families.index(problem.cover_family)
+        if problem.cover_family in families
+        else -1
+    )
+    cooldown_next = np.maximum(cooldown - 1, 0)
+
+    table = np.empty((len(problem.crops), k.size), dtype=np.int32)
+    for a, crop in enumerate(problem.crops):
+        feasible = k + crop.compost >= 0
+        if crop.water > problem.water_budget:
+            feasible[:] = False
+        k2 = np.clip(k + crop.compost, 0, problem.k_max)
+
+        fam_a = families.index(crop.family)
+        if fam_a != cover:
+            feasible &= (fam == cover) | (fam != fam_a)
+        if crop.name == problem.cooldown_crop:
+            feasible &= cooldown == 0
+            cd2 = np.full_like(cooldown, rest_shape[-1] - 1)
+        else:
+            cd2 = cooldown_next
+
+        codes = np.ravel_multi_index(
+            (k2, np.full_like(fam, fam_a), cd2), rest_shape
+        )
+        table[a] = np.where(feasible, codes, INFEASIBLE)
+    return table
+
+
+@lru_cache(maxsize=4)
+def compile_model(problem: RotationProblem) -> RotationModel:
+    """Compile the transition array for every (action, state) pair."""
+    shape = _state_shape(problem)
+    soil_table = compile_soil_table(problem).astype(np.int64)
+    rest_table = compile_rest_table(problem)
+    n_soil, n_rest = soil_table.shape[0], rest_table.shape[1]
+
+    next_state = np.empty((len(problem.crops), n_soil * n_rest), np.int32)
+    for a in range(len(problem.crops)):
+        soil2 = soil_table[:, a, None]
+        rest2 = rest_table[a]
+        feasible = (soil2 >= 0) & (rest2 >= 0)
+        next_state[a] = np.where(
+            feasible, soil2 * n_rest + rest2, INFEASIBLE
+        ).ravel()
+    return RotationModel(problem=problem, shape=shape, next_state=next_state)
+
+
+def reward_table(problem: RotationProblem) -> np.ndarray:
+    """Return ``profit(act, t)`` as a ``(T, A)`` float array."""
+    rewards = np.empty((problem.horizon, len(problem.crops)), dtype=np.float64)
+    for a, crop in enumerate(problem.crops):
+        for t in range(problem.horizon):
+            rewards[t, a] = crop.profit(t)
+    return rewards
+
+
+@dataclass(frozen=True)
+class SolveStats:
+    """Size of the compiled tables and, optionally, measured peak memory."""
+
+    n_states: int
+    n_actions: int
+    horizon: int
+    transition_bytes: int
+    value_bytes: int
+    policy_bytes: int
+    peak_bytes: int | None = None
+
+    @property
+    def table_bytes(self) -> int:
+        return self.transition_bytes + self.value_bytes + self.policy_bytes
+
+
+@dataclass(eq=False)
+class TabularSolution:
+    """Dense value and policy arrays produced by :func:`solve`.
+
+    ``value[t, s]`` is the best profit-to-go from state ``s`` at season ``t``
+    (``-inf`` when the horizon cannot be completed) and ``policy[t, s]`` is the
+    optimal action index, or ``-1`` when no feasible action exists. When solved
+    with ``keep_values=False`` only the ``t = 0`` value layer is retained.
+    """
+
+    model: RotationModel
+    rewards: np.ndarray
+    value: np.ndarray
+    policy: np.ndarray
+    stats: SolveStats | None = None
+
+    def value_of(self, state: RotationState, t: int = 0) -> float:
+        if t >= self.value.shape[0]:
+            raise ValueError(
+                f"Value layer for t={t} was dropped "
+                "(solved with keep_values=False)"
+            )
+        return float(self.value[t, self.model.encode(state)])
+
+    def actions(self, initial: RotationState) -> np.ndarray:
+        """Return the action index per season from ``initial``.
+
+        Seasons after the plan gets stuck are ``-1``.
+        """
+        actions = np.full(self.policy.shape[0], -1, dtype=np.int16)
+        code = self.model.encode(initial)
+        for t in range(self.policy.shape[0]):
+            action = self.policy[t, code]
+            if action < 0:
+                break
+            actions[t] = action
+            code = self.model.next_state[action, code]
+        return actions
+
+    def plan(self, initial: RotationState) -> list[PlanStep]:
+        """Follow the policy forward from ``initial``.
+
+        The plan stops early if a state without a feasible action is reached.
+        """
+        crops = self.model.problem.crops
+        steps: list[PlanStep] = []
+        code = self.model.encode(initial)
+        for t in range(self.policy.shape[0]):
+            action = int(self.policy[t, code])
+            if action < 0:
+                break
+            nxt = int(self.model.next_state[action, code])
+            steps.append(
+                PlanStep(
+                    t=t,
+                    crop=crops[action],
+                    profit=float(self.rewards[t, action]),
+                    state=self.model.decode(code),
+                    next_state=self.model.decode(nxt),
+                )
+            )
+            code = nxt
+        return steps
+
+
+def bellman_backup(
+    model: RotationModel,
+    rewards: np.ndarray,
+    v_next: np.ndarray,
+    out_value: np.ndarray,
+    out_policy: np.ndarray,
+) -> None:
+    """Backward step: ``out_value[s] = max_a rewards[a] + v_next[next(s, a)]``.
+
+    Only feasible (state, action) pairs are visited. Ties keep the first action
+    in palette order, as the original recursive DP did.
+    """
+    out_value.fill(-np.inf)
+    out_policy.fill(-1)
+    for a, (src, dst) in enumerate(model.feasible_pairs):
+        cand = v_next[dst]
+        cand += rewards[a]
+        better = cand > out_value[src]
+        improved = src[better]
+        out_value[improved] = cand[better]
+        out_policy[improved] = a
+
+
+def solve(
+    problem: RotationProblem | RotationModel,
+    rewards: np.ndarray | None = None,
+    *,
+    value_dtype: np.dtype | type = np.float64,
+    keep_values: bool = True,
+    measure_memory: bool = False,
+) -> TabularSolution:
+    """Solve the rotation problem by backward induction over all states.
+
+    Parameters
+    ----------
+    problem:
+        Problem to solve, or an already compiled :class:`RotationModel`.
+    rewards:
+        Optional ``(T, A)`` reward table overriding :func:`reward_table`.
+    value_dtype:
+        Value table dtype; ``np.float32`` halves its size.
+    keep_values:
+        Keep every value layer. When ``False`` only two layers are live
+        during the sweep and just ``t = 0`` is returned; the policy alone is
+        enough for forward plan reconstruction.
+    measure_memory:
+        Record peak traced allocation during the solve with :mod:`tracemalloc`.
+    """
+    started_tracing = measure_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif measure_memory:
+        tracemalloc.reset_peak()
+    try:
+        if isinstance(problem, RotationModel):
+            model = problem
+        else:
+            model = compile_model(problem)
+        if rewards is None:
+            rewards = reward_table(model.problem)
+        horizon = rewards.shape[0]
+        n_states = model.n_states
+        n_actions = rewards.shape[1]
+
+        layers = horizon + 1 if keep_values else min(2, horizon + 1)
+        value = np.empty((layers, n_states), dtype=value_dtype)
+        value[horizon % layers] = 0.0
+        policy_dtype = (
+            np.int8 if n_actions <= np.iinfo(np.int8).max else np.int16
+        )
+        policy = np.empty((horizon, n_states), dtype=policy_dtype)
+
+        for t in range(horizon - 1, -1, -1):
+            nxt, cur = value[(t + 1) % layers], value[t % layers]
+            bellman_backup(model, rewards[t], nxt, cur, policy[t])
+        if not keep_values:
+            value = value[:1].copy()
+        peak = tracemalloc.get_traced_memory()[1] if measure_memory else None
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    transition_bytes = model.next_state.nbytes + sum(
+        src.nbytes + dst.nbytes for src, dst in model.feasible_pairs
+    )
+    stats = SolveStats(
+        n_states=n_states,
+        n_actions=n_actions,
+        horizon=horizon,
+        transition_bytes=transition_bytes,
+        value_bytes=value.nbytes,
+        policy_bytes=policy.nbytes,
+        peak_bytes=peak,
+    )
+    return TabularSolution(
+        model=model, rewards=rewards, value=value, policy=policy, stats=stats
+    )
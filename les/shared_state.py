@@ -0,0 +1,245 @@
+"""State registry in shared memory for multi-process deployments.
+
+Sensor polling, simulation stepping and metrics export can run in separate
+processes that all map the same :class:`multiprocessing.shared_memory` block.
+The block holds a small header with the variable schema, one version counter
+per slot and the float64 values, so reads and writes are plain memory access
+with no pickling or IPC round-trip.
+
+Writes follow a per-slot seqlock: the slot's version is made odd, the value
+stored, and the version made even again. A reader retries while a version is
+odd or changed during its read. Each slot must have a single writing process
+(e.g. the sensor process owns ``aq.*``).
+
+The counters and values are plain numpy loads and stores with no memory
+fences, so the seqlock relies on the CPU keeping stores in program order, as
+x86 (TSO) does. There :meth:`SharedStateRegistry.snapshot` returns values
+that all held at one instant. Weakly ordered CPUs such as aarch64 may let a
+reader see a new version with an old value, so on those hosts reads are
+only per-slot best effort and the registry warns when it is mapped.
+"""
+from __future__ import annotations
+
+import json
+import math
+import platform
+import struct
+import warnings
+from dataclasses import asdict, replace
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from .state import _KINDS, StateRegistry, Variable
+
+_MAGIC = b"LESSTAT1"
+_HEADER = struct.Struct("<8sQQ")  # magic, slot count, schema length
+_ONE = np.uint64(1)
+# CPUs whose memory model keeps the seqlock's stores in program order.
+ORDERED_STORES = platform.machine().lower() in {
+    "x86_64", "amd64", "i386", "i686", "x86"
+}
+
+
+class TornRead(RuntimeError):
+    """Raised when no consistent read was obtained within the retry budget."""
+
+
+def _padded(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def _typed(var: Variable, value: float) -> Any:
+    return None if math.isnan(value) else _KINDS[var.dtype](value)
+
+
+class SharedStateRegistry:
+    """Typed state variables stored in a shared memory block.
+
+    Create the block once with :meth:`create` (or :meth:`from_registry`) and
+    :meth:`attach` to it by name from other processes. The set of variables
+    is fixed at creation; the key-based ``get``/``set`` API matches
+    :class:`~les.state.StateRegistry` so alert and exporter code work on
+    either.
+    Attach from processes started by the creator (e.g. via
+    :mod:`multiprocessing`), which share its resource tracker.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        variables: List[Variable],
+        owner: bool,
+    ) -> None:
+        if not ORDERED_STORES:
+            warnings.warn(
+                "SharedStateRegistry snapshots are only consistent on x86; "
+                f"{platform.machine()} may reorder the seqlock's stores",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+        self._shm = shm
+        self._owner = owner
+        self._variables = variables
+        self._slots = {var.key: var.slot for var in variables}
+        n = len(variables)
+        offset = _padded(_HEADER.size + _schema_size(shm.buf))
+        self._versions = np.ndarray(
+            (n,), dtype=np.uint64, buffer=shm.buf, offset=offset
+        )
+        self._values = np.ndarray(
+            (n,), dtype=np.float64, buffer=shm.buf, offset=offset + 8 * n
+        )
+
+    @classmethod
+    def create(
+        cls,
+        variables: Iterable[Union[str, Variable]],
+        name: Optional[str] = None,
+    ) -> "SharedStateRegistry":
+        """Allocate a block for ``variables`` (keys or :class:`Variable`)."""
+        specs = []
+        for slot, var in enumerate(variables):
+            if isinstance(var, str):
+                var = Variable(var, slot)
+            specs.append(replace(var, slot=slot))
+        if len({var.key for var in specs}) != len(specs):
+            raise ValueError("Duplicate variable keys")
+        schema = json.dumps([asdict(var) for var in specs]).encode()
+        n = len(specs)
+        size = _padded(_HEADER.size + len(schema)) + 16 * n
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=max(size, 1)
+        )
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, n, len(schema))
+        shm.buf[_HEADER.size:_HEADER.size + len(schema)] = schema
+        registry = cls(shm, specs, owner=True)
+        registry._versions[:] = 0
+        registry._values[:] = math.nan
+        return registry
+
+    @classmethod
+    def from_registry(
+        cls, registry: StateRegistry, name: Optional[str] = None
+    ) -> "SharedStateRegistry":
+        """Copy a :class:`StateRegistry`'s typed variables to shared memory."""
+        shared = cls.create(registry.variables, name=name)
+        shared._values[:] = registry.as_array()
+        return shared
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedStateRegistry":
+        """Map an existing block by name; its header holds the schema."""
+        shm = shared_memory.SharedMemory(name=name)
+        magic, n, length = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC:
+            shm.close()
+            raise ValueError(
+                f"Shared memory block {name!r} is not a state registry"
+            )
+        raw = json.loads(bytes(shm.buf[_HEADER.size:_HEADER.size + length]))
+        return cls(shm, [Variable(**spec) for spec in raw], owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def variables(self) -> List[Variable]:
+        return list(self._variables)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    def slot(self, key: str) -> int:
+        if key not in self._slots:
+            raise KeyError(f"Variable {key!r} is not registered")
+        return self._slots[key]
+
+    # -- writes ------------------------------------------------------------
+    def set_slot(self, slot: int, value: float) -> None:
+        versions = self._versions
+        versions[slot] += _ONE
+        self._values[slot] = value
+        versions[slot] += _ONE
+
+    def set(self, key: str, value: Any) -> None:
+        self.set_slot(self.slot(key), math.nan if value is None else value)
+
+    def register(self, key: str, value: Any = None) -> None:
+        """Set an existing variable; the shared schema cannot grow."""
+        self.set(key, value)
+
+    def update(self, values: Mapping[str, Any]) -> None:
+        """Write several variables; snapshots see all or none of them."""
+        slots = np.fromiter(
+            (self.slot(key) for key in values),
+            dtype=np.intp,
+            count=len(values),
+        )
+        data = np.array(
+            [math.nan if v is None else v for v in values.values()],
+            dtype=np.float64,
+        )
+        self._versions[slots] += _ONE
+        self._values[slots] = data
+        self._versions[slots] += _ONE
+
+    # -- reads -------------------------------------------------------------
+    def get_slot(self, slot: int, retries: int = 10_000) -> float:
+        versions, values = self._versions, self._values
+        for _ in range(retries):
+            before = versions[slot]
+            if before & _ONE:
+                continue
+            value = values[slot]
+            if versions[slot] == before:
+                return float(value)
+        raise TornRead(f"Slot {slot} kept changing during the read")
+
+    def get(self, key: str) -> Any:
+        slot = self.slot(key)
+        return _typed(self._variables[slot], self.get_slot(slot))
+
+    def version(self, key: str) -> int:
+        return int(self._versions[self.slot(key)])
+
+    def snapshot_array(self, retries: int = 10_000) -> np.ndarray:
+        """Copy of all values, taken while no slot was being written."""
+        for _ in range(retries):
+            before = self._versions.copy()
+            if (before & _ONE).any():
+                continue
+            values = self._values.copy()
+            if np.array_equal(before, self._versions):
+                return values
+        raise TornRead("State kept changing during the snapshot")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """``{key: value}`` view of every variable (consistent on x86)."""
+        values = self.snapshot_array()
+        return {
+            var.key: _typed(var, values[var.slot]) for var in self._variables
+        }
+
+    # -- lifetime ----------------------------------------------------------
+    def close(self) -> None:
+        # Views into the buffer must go before the mapping can be closed.
+        self._versions = self._values = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedStateRegistry":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+        if self._owner:
+            self.unlink()
+
+
+def _schema_size(buf: memoryview) -> int:
+    return _HEADER.unpack_from(buf, 0)[2]
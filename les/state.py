@@ -1,29 +1,393 @@
 """State registry for LES."""
-from typing import Any, Dict
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - numpy is only needed for array views
+    import asyncio
+
+    import numpy as np
+
+# Called as ``callback(key, value, version)`` when a subscribed key changes.
+ChangeCallback = Callable[[str, Any, int], None]
+
+# Kinds a declared variable's float64 slot is converted to by ``get``.
+_KINDS = {"float": float, "int": int, "bool": bool}
+
+
+@dataclass(frozen=True)
+class Variable:
+    """Declaration of a typed numeric state variable."""
+
+    key: str
+    slot: int
+    dtype: str = "float"
+    units: str = ""
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Handle returned by :meth:`StateRegistry.subscribe`.
+
+    ``pattern`` is an exact key or a prefix ending in ``*`` such as ``aq.*``.
+    """
+
+    pattern: str
+    callback: ChangeCallback
+    registry: "StateRegistry"
+
+    def matches(self, key: str) -> bool:
+        if self.pattern.endswith("*"):
+            return key.startswith(self.pattern[:-1])
+        return key == self.pattern
+
+    def unsubscribe(self) -> None:
+        self.registry.unsubscribe(self)
 
 
 class StateRegistry:
-    """Simple dictionary-backed state registry."""
+    """Dictionary-backed state registry with optional typed numeric slots.
+
+    Variables registered with :meth:`register` hold arbitrary objects.
+    Variables declared with :meth:`declare` live in one contiguous float64
+    buffer; the returned slot handle gives hot loops O(1) unboxed access via
+    :meth:`get_slot`/:meth:`set_slot` (or :meth:`set_slots` for vectorized
+    writes), while ``get``/``set`` by key keep working. An unset typed value
+    is stored as NaN and read back as ``None``.
+
+    Writes only store the value and mark the variable dirty. Changes are
+    collected lazily, under a lock, when a consumer reads :attr:`version`,
+    :attr:`dirty`, :meth:`changes_since` or :meth:`clear_dirty`, or calls
+    :meth:`publish`: each changed variable is stamped with the next value of
+    a registry-wide, monotonically increasing version and subscribers are
+    notified. Several writes to a variable between two collections count as
+    one change. Writers on other threads (e.g. sensor refreshes) are safe;
+    subscriber callbacks run on the thread that collects.
+    """
 
     def __init__(self) -> None:
         self._state: Dict[str, Any] = {}
+        self._slots: Dict[str, int] = {}
+        self._variables: List[Variable] = []
+        self._values = array("d")
+        # Written-since-last-collection flags: one byte per slot, and the
+        # untyped keys.
+        self._written = bytearray()
+        self._written_keys: Set[str] = set()
+        self._lock = threading.RLock()
+        self._version = 0
+        self._dirty: Set[str] = set()
+        # Key -> version of its last write, ordered oldest to newest.
+        self._changes: Dict[str, int] = {}
+        self._exact: Dict[str, List[Subscription]] = {}
+        self._prefixed: List[Subscription] = []
 
     def register(self, key: str, value: Any = None) -> None:
         """Register a new state variable."""
-        self._state[key] = value
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._values[slot] = math.nan if value is None else value
+            self._written[slot] = 1
+        else:
+            self._state[key] = value
+            self._written_keys.add(key)
+
+    def declare(
+        self,
+        key: str,
+        value: Optional[float] = None,
+        *,
+        dtype: str = "float",
+        units: str = "",
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+    ) -> int:
+        """Declare a typed numeric variable and return its slot handle.
+
+        Declaring an existing typed key returns its slot unchanged. The
+        buffer grows in place; while a view from :meth:`as_array` or
+        :attr:`values` is alive it cannot be resized, so the declaration
+        copies it instead and the old view goes stale. Declare everything
+        before entering a hot loop.
+        """
+        if dtype not in _KINDS:
+            raise ValueError(
+                f"Unsupported dtype {dtype!r}; "
+                f"expected one of {sorted(_KINDS)}"
+            )
+        with self._lock:
+            if key in self._slots:
+                return self._slots[key]
+            existing = self._state.pop(key, None)
+            self._written_keys.discard(key)
+            if value is None:
+                value = existing
+            slot = len(self._variables)
+            self._variables.append(
+                Variable(key, slot, dtype, units, low, high)
+            )
+            stored = math.nan if value is None else value
+            try:
+                self._values.append(stored)
+            except BufferError:  # exported to a numpy view
+                self._values = array("d", self._values)
+                self._values.append(stored)
+            self._written.append(1)
+            self._slots[key] = slot
+            return slot
+
+    def slot(self, key: str) -> int:
+        if key not in self._slots:
+            raise KeyError(f"Variable {key!r} is not declared")
+        return self._slots[key]
+
+    def variable(self, key: str) -> Variable:
+        return self._variables[self.slot(key)]
+
+    def get_slot(self, slot: int) -> float:
+        return self._values[slot]
+
+    def set_slot(self, slot: int, value: float) -> None:
+        self._values[slot] = value
+        self._written[slot] = 1
+
+    def set_slots(self, slots, values) -> None:
+        """Vectorized :meth:`set_slot` for arrays of slots and values."""
+        import numpy as np
+
+        slots = np.asarray(slots, dtype=np.intp)
+        np.frombuffer(self._values, dtype=np.float64)[slots] = values
+        np.frombuffer(self._written, dtype=np.uint8)[slots] = 1
 
     def set(self, key: str, value: Any) -> None:
-        if key not in self._state:
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._values[slot] = math.nan if value is None else value
+            self._written[slot] = 1
+        elif key not in self._state:
+            raise KeyError(f"Variable {key!r} is not registered")
+        else:
+            self._state[key] = value
+            self._written_keys.add(key)
+
+    # -- change tracking ---------------------------------------------------
+    def mark_changed(self, key: str) -> None:
+        """Record an in-place change, e.g. to a mutable registered object."""
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._written[slot] = 1
+        elif key in self._state:
+            self._written_keys.add(key)
+        else:
             raise KeyError(f"Variable {key!r} is not registered")
-        self._state[key] = value
+
+    def _collect(self) -> List[Tuple[str, int]]:
+        """Stamp variables written since the last collection; needs the lock.
+
+        Flags are cleared before the value is read, so a write racing with
+        the collection is seen now or by the next one, never lost.
+        """
+        keys = []
+        written = self._written
+        slot = written.find(1)
+        while slot != -1:
+            written[slot] = 0
+            keys.append(self._variables[slot].key)
+            slot = written.find(1, slot + 1)
+        pending = self._written_keys
+        while pending:  # pop in place: writers may add concurrently
+            keys.append(pending.pop())
+        if not keys:
+            return []
+        changes, version = self._changes, self._version
+        stamped = []
+        for key in keys:
+            version += 1
+            changes.pop(key, None)
+            changes[key] = version
+            stamped.append((key, version))
+        self._version = version
+        self._dirty.update(keys)
+        return stamped
+
+    def _notify(self, stamped: List[Tuple[str, int]]) -> None:
+        if not (self._exact or self._prefixed):
+            return
+        for key, version in stamped:
+            subs = self._exact.get(key, []) + [
+                sub for sub in self._prefixed if sub.matches(key)
+            ]
+            if subs:
+                value = self.get(key)
+                for sub in subs:
+                    sub.callback(key, value, version)
+
+    def publish(self) -> int:
+        """Collect pending writes and notify subscribers in this thread.
+
+        Returns the number of changed variables.
+        """
+        with self._lock:
+            stamped = self._collect()
+            self._notify(stamped)
+        return len(stamped)
+
+    @property
+    def version(self) -> int:
+        """Registry version of the most recent change."""
+        self.publish()
+        return self._version
+
+    @property
+    def dirty(self) -> Set[str]:
+        """Keys changed since the last :meth:`clear_dirty`."""
+        with self._lock:
+            self._notify(self._collect())
+            return set(self._dirty)
+
+    def version_of(self, key: str) -> int:
+        """Registry version of the last write to ``key``; 0 if none."""
+        with self._lock:
+            self._notify(self._collect())
+            return self._changes.get(key, 0)
+
+    def changes_since(self, version: int) -> List[str]:
+        """Keys written after ``version``, oldest first.
+
+        Cost is proportional to the number of changes, not of variables.
+        """
+        with self._lock:
+            self._notify(self._collect())
+            keys = []
+            for key in reversed(self._changes):
+                if self._changes[key] <= version:
+                    break
+                keys.append(key)
+        keys.reverse()
+        return keys
+
+    def clear_dirty(self) -> Set[str]:
+        """Return the dirty keys and start a new dirty set."""
+        with self._lock:
+            self._notify(self._collect())
+            dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def subscribe(
+        self, pattern: str, callback: ChangeCallback
+    ) -> Subscription:
+        """Call ``callback(key, value, version)`` per change to a matching key.
+
+        ``pattern`` is an exact key or a prefix ending in ``*`` (``"aq.*"``).
+        Callbacks run when changes are collected (see :meth:`publish`), in
+        the collecting thread, with the variable's value at that moment.
+        """
+        sub = Subscription(pattern, callback, self)
+        with self._lock:
+            # Changes made before subscribing go to the earlier subscribers.
+            self._notify(self._collect())
+            if pattern.endswith("*"):
+                self._prefixed.append(sub)
+            else:
+                self._exact.setdefault(pattern, []).append(sub)
+        return sub
+
+    def subscribe_queue(
+        self,
+        pattern: str,
+        queue: "asyncio.Queue",
+        loop: Optional["asyncio.AbstractEventLoop"] = None,
+    ) -> Subscription:
+        """Feed ``(key, value, version)`` change tuples into an asyncio queue.
+
+        Pass the queue's ``loop`` when changes may be collected outside that
+        event loop's thread; items are then handed over with
+        ``call_soon_threadsafe``.
+        """
+
+        def put(key: str, value: Any, version: int) -> None:
+            if loop is None:
+                queue.put_nowait((key, value, version))
+            else:
+                loop.call_soon_threadsafe(
+                    queue.put_nowait, (key, value, version)
+                )
+
+        return self.subscribe(pattern, put)
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub.pattern.endswith("*"):
+                self._prefixed.remove(sub)
+            else:
+                self._exact[sub.pattern].remove(sub)
+                if not self._exact[sub.pattern]:
+                    del self._exact[sub.pattern]
 
     def get(self, key: str) -> Any:
+        slot = self._slots.get(key)
+        if slot is not None:
+            value = self._values[slot]
+            if math.isnan(value):
+                return None
+            return _KINDS[self._variables[slot].dtype](value)
         if key not in self._state:
             raise KeyError(f"Variable {key!r} is not registered")
         return self._state[key]
 
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots or key in self._state
+
+    @property
+    def variables(self) -> List[Variable]:
+        return list(self._variables)
+
+    @property
+    def values(self) -> memoryview:
+        """Read-only view of the float64 slot buffer, indexed by slot handle.
+
+        Writes go through :meth:`set_slot` or :meth:`set_slots` so that they
+        are tracked as changes.
+        """
+        return memoryview(self._values).toreadonly()
+
+    def as_array(self) -> "np.ndarray":
+        """Read-only zero-copy numpy view of the slot buffer."""
+        import numpy as np
+
+        view = np.frombuffer(self._values, dtype=np.float64)
+        view.flags.writeable = False
+        return view
+
+    def out_of_range(self) -> List[str]:
+        """Keys of typed variables whose value is outside their range."""
+        keys = []
+        for var in self._variables:
+            value = self._values[var.slot]
+            if (var.low is not None and value < var.low) or (
+                var.high is not None and value > var.high
+            ):
+                keys.append(var.key)
+        return keys
+
 
 # Global registry instance
 state = StateRegistry()
+# Untyped so readings keep their Python type; hot loops may ``declare`` them.
 state.register("aq.nitrate")
 state.register("aq.orp")
@@ -12,8 +12,11 @@ indefinitely.
 from __future__ import annotations
 
 import argparse
+import math
 import random
 import time
+from collections import deque
+from typing import Callable
 
 try:  # pragma: no cover - import guarded for environments without prometheus_client
     from prometheus_client import Counter, Gauge, start_http_server
@@ -59,37 +62,167 @@ simulation_throughput = Gauge(
     "simulation_throughput_steps_per_second", "Simulation steps per second"
 )
 
+# Scheduling health of the simulation loop
+simulation_step_latency_p50 = Gauge(
+    "simulation_step_latency_p50_seconds",
+    "Median step duration over the recent window",
+)
+simulation_step_latency_p99 = Gauge(
+    "simulation_step_latency_p99_seconds",
+    "99th percentile step duration over the recent window",
+)
+simulation_tick_lag = Gauge(
+    "simulation_tick_lag_seconds",
+    "How late the most recent step started versus its deadline",
+)
+simulation_overruns_total = Counter(
+    "simulation_overruns_total",
+    "Steps that finished after the next tick's deadline",
+)
+
 
 def run_metrics_server(port: int) -> None:
     """Start the Prometheus metrics HTTP server."""
     start_http_server(port)
 
 
-def simulate(iterations: int | None = None, delay: float = 1.0) -> None:
-    """Update metrics in a loop.
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+class FixedRateScheduler:
+    """Run steps on an absolute tick grid ``start + k * period``.
+
+    Sleeping until the next deadline (rather than for a fixed delay) keeps
+    step time from accumulating as drift. A step that ends past the next
+    deadline counts as an overrun; missed ticks are skipped rather than run
+    back to back. ``period=0`` free-runs as fast as possible for benchmarking.
+
+    Parameters
+    ----------
+    period:
+        Seconds between tick deadlines; ``0`` disables sleeping.
+    window:
+        Number of recent step durations kept for the latency percentiles.
+    clock, sleep:
+        Monotonic clock and sleep function, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        period: float,
+        window: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if period < 0:
+            raise ValueError("period must be non-negative")
+        self.period = period
+        self.clock = clock
+        self.sleep = sleep
+        self.ticks = 0
+        self.overruns = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._start: float | None = None
+        self._next_tick = 0
+
+    def run_step(self, step: Callable[[], None]) -> float:
+        """Run ``step`` at its deadline and wait for the next one.
+
+        Returns the step's duration in seconds.
+        """
+        now = self.clock()
+        if self._start is None:
+            self._start = now
+        if self.period:
+            deadline = self._start + self._next_tick * self.period
+            self.last_lag = max(0.0, now - deadline)
+            self.max_lag = max(self.max_lag, self.last_lag)
+
+        step()
+        finished = self.clock()
+        duration = finished - now
+        self._latencies.append(duration)
+        self.ticks += 1
+
+        if self.period == 0:
+            return duration
+        self._next_tick += 1
+        next_deadline = self._start + self._next_tick * self.period
+        if finished > next_deadline:
+            self.overruns += 1
+            # Skip the ticks we already missed and resume on the grid.
+            missed = math.floor((finished - self._start) / self.period)
+            self._next_tick = missed + 1
+            next_deadline = self._start + self._next_tick * self.period
+        self.sleep(next_deadline - finished)
+        return duration
+
+    def latency_percentiles(self, *qs: float) -> tuple[float, ...]:
+        if not self._latencies:
+            return tuple(0.0 for _ in qs)
+        ordered = sorted(self._latencies)
+        return tuple(_percentile(ordered, q) for q in qs)
+
+
+def simulate(
+    iterations: int | None = None,
+    delay: float = 1.0,
+    scheduler: FixedRateScheduler | None = None,
+    report_interval: float = 1.0,
+) -> FixedRateScheduler:
+    """Update metrics in a loop at a fixed tick rate.
 
     Parameters
     ----------
     iterations:
         Number of simulation iterations to perform. ``None`` runs indefinitely.
     delay:
-        Seconds to wait between iterations.
+        Seconds between tick deadlines; ``0`` free-runs as fast as possible.
+    scheduler:
+        Scheduler to drive the loop; defaults to one with ``period=delay``.
+    report_interval:
+        Minimum seconds between latency percentile updates. Sorting the
+        latency window costs more than a free-running step, so the
+        percentile gauges are refreshed at this rate and after the last
+        iteration rather than on every step.
     """
-    start_time = time.time()
+    scheduler = scheduler or FixedRateScheduler(delay)
+    start_time = time.perf_counter()
     steps = 0
-    while iterations is None or steps < iterations:
+    overruns_reported = scheduler.overruns
+    next_report = 0.0  # elapsed seconds at which percentiles are next due
+
+    def step() -> None:
         # Simulate readings
         water_ph.set(7.0 + random.uniform(-0.3, 0.3))
         dissolved_oxygen.set(8.0 + random.uniform(-1.0, 1.0))
 
-        # Update counters and throughput
+    while iterations is None or steps < iterations:
+        scheduler.run_step(step)
+
+        # Update counters, throughput and scheduling health
         simulation_steps_total.inc()
         steps += 1
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         if elapsed > 0:
             simulation_throughput.set(steps / elapsed)
-
-        time.sleep(delay)
+        if elapsed >= next_report or steps == iterations:
+            p50, p99 = scheduler.latency_percentiles(0.5, 0.99)
+            simulation_step_latency_p50.set(p50)
+            simulation_step_latency_p99.set(p99)
+            next_report = elapsed + report_interval
+        simulation_tick_lag.set(scheduler.last_lag)
+        if scheduler.overruns > overruns_reported:
+            simulation_overruns_total.inc(
+                scheduler.overruns - overruns_reported
+            )
+            overruns_reported = scheduler.overruns
+    return scheduler
 
 
 def main() -> None:
@@ -104,7 +237,10 @@ def main() -> None:
         help="Number of simulation iterations; default runs indefinitely",
     )
     parser.add_argument(
-        "--delay", type=float, default=1.0, help="Delay between iterations in seconds"
+        "--delay",
+        type=float,
+        default=1.0,
+        help="Seconds between tick deadlines; 0 runs as fast as possible",
     )
     args = parser.parse_args()
 
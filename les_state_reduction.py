@@ -7,8 +7,28 @@ optimizers or simulations without heavy dependencies.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Iterable, Mapping, Sequence
+import math
+import random
+import time
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import product
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+SOIL_VARIABLES = ("n", "c", "s", "d")
 
 
 @dataclass(frozen=True)
@@ -43,6 +63,48 @@ class BucketConfig:
         step = span / self.buckets
         return self.min_value + (bucket + 0.5) * step
 
+    def bucket_dtype(self) -> str:
+        """Smallest signed integer dtype that holds every bucket index."""
+        if self.buckets <= 128:
+            return "int8"
+        return "int16" if self.buckets <= 2**15 else "int32"
+
+    def bucketize_array(
+        self, values, out: "np.ndarray | None" = None
+    ) -> "np.ndarray":
+        """Array counterpart of :meth:`bucketize`, identical per element.
+
+        NaN clamps to the top bucket, as in the scalar comparison chain.
+        """
+        import numpy as np
+
+        x = np.array(values, dtype=np.float64)
+        if out is None:
+            out = np.empty(x.shape, dtype=self.bucket_dtype())
+        span = self.max_value - self.min_value
+        if self.buckets <= 1 or span <= 0:
+            out[...] = 0
+            return out
+        x[np.isnan(x)] = self.max_value
+        np.clip(x, self.min_value, self.max_value, out=x)
+        x -= self.min_value
+        x /= span
+        x *= self.buckets
+        np.minimum(x, self.buckets - 1, out=x)
+        out[...] = x  # truncates like int(); values are already >= 0
+        return out
+
+    def midpoint_array(self, buckets) -> "np.ndarray":
+        """Array counterpart of :meth:`midpoint`."""
+        import numpy as np
+
+        buckets = np.asarray(buckets)
+        if self.buckets <= 1:
+            return np.full(buckets.shape, self.min_value, dtype=np.float64)
+        index = np.clip(buckets, 0, self.buckets - 1).astype(np.float64)
+        step = (self.max_value - self.min_value) / self.buckets
+        return self.min_value + (index + 0.5) * step
+
     def refine(self, factor: int) -> "BucketConfig":
         if factor <= 1:
             return self
@@ -51,7 +113,260 @@ class BucketConfig:
         )
 
 
+class QuantileSketch:
+    """Streaming quantile sketch (KLL-style compactors) with bounded memory.
+
+    Level ``h`` holds items of weight ``2**h``. When a level fills up it is
+    sorted and every other item (random offset) is promoted, so memory stays
+    ``O(k)`` while rank error shrinks roughly as ``1/k``. NaN readings are
+    ignored.
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = None) -> None:
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.count = 0
+        self.min_value = math.inf
+        self.max_value = -math.inf
+        self._levels: list[list[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def update(self, value: float) -> None:
+        if value != value:
+            return
+        self.count += 1
+        self.min_value = min(self.min_value, value)
+        self.max_value = max(self.max_value, value)
+        self._levels[0].append(value)
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.update(float(value))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold ``other`` into this sketch."""
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for mine, theirs in zip(self._levels, other._levels):
+            mine.extend(theirs)
+        self.count += other.count
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        self._compress()
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self._levels):
+            level = self._levels[h]
+            if len(level) >= self._capacity(h):
+                if h + 1 == len(self._levels):
+                    self._levels.append([])
+                level.sort()
+                keep = [level.pop()] if len(level) % 2 else []
+                self._levels[h + 1].extend(level[self._rng.randrange(2)::2])
+                self._levels[h] = keep
+            h += 1
+
+    @property
+    def retained(self) -> int:
+        return sum(len(level) for level in self._levels)
+
+    def quantiles(self, qs: Sequence[float]) -> list[float]:
+        """Approximate quantiles for ``qs`` in ``[0, 1]``."""
+        if not self.count:
+            raise ValueError("sketch is empty")
+        items = sorted(
+            (value, 1 << h)
+            for h, level in enumerate(self._levels)
+            for value in level
+        )
+        total = sum(weight for _, weight in items)
+        out = []
+        for q in qs:
+            if q <= 0:
+                out.append(self.min_value)
+                continue
+            if q >= 1:
+                out.append(self.max_value)
+                continue
+            target = q * total
+            seen = 0
+            for value, weight in items:
+                seen += weight
+                if seen >= target:
+                    out.append(value)
+                    break
+        return out
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+
 @dataclass(frozen=True)
+class QuantileBucketConfig:
+    """Non-uniform buckets over ``[min_value, max_value]`` split at ``edges``.
+
+    Bucket ``i`` covers ``[edges[i-1], edges[i])``; lookup is a bisect, so it
+    is a drop-in replacement for :class:`BucketConfig` in the reducers.
+    """
+
+    min_value: float
+    max_value: float
+    edges: tuple[float, ...] = ()
+
+    def __post_init__(self) -> None:
+        if any(b <= a for a, b in zip(self.edges, self.edges[1:])):
+            raise ValueError("edges must be strictly increasing")
+        lo, hi = self.min_value, self.max_value
+        if self.edges and not lo <= self.edges[0] <= self.edges[-1] <= hi:
+            raise ValueError("edges must lie within [min_value, max_value]")
+
+    @classmethod
+    def from_sketch(
+        cls,
+        sketch: QuantileSketch,
+        buckets: int,
+        min_value: float | None = None,
+        max_value: float | None = None,
+    ) -> "QuantileBucketConfig":
+        """Equal-mass buckets from a sketch; tied edges merge together."""
+        lo = sketch.min_value if min_value is None else min_value
+        hi = sketch.max_value if max_value is None else max_value
+        cuts = sketch.quantiles([i / buckets for i in range(1, buckets)])
+        edges: list[float] = []
+        for cut in cuts:
+            if lo < cut < hi and (not edges or cut > edges[-1]):
+                edges.append(cut)
+        return cls(min_value=lo, max_value=hi, edges=tuple(edges))
+
+    @classmethod
+    def from_sample(
+        cls, values: Iterable[float], buckets: int, k: int = 200
+    ) -> "QuantileBucketConfig":
+        sketch = QuantileSketch(k=k, seed=0)
+        sketch.extend(values)
+        return cls.from_sketch(sketch, buckets)
+
+    @property
+    def buckets(self) -> int:
+        return len(self.edges) + 1
+
+    def bounds(self, bucket: int) -> tuple[float, float]:
+        bucket = self.clamp_bucket(bucket)
+        cuts = (self.min_value, *self.edges, self.max_value)
+        return cuts[bucket], cuts[bucket + 1]
+
+    def bucketize(self, value: float) -> int:
+        clamped = max(self.min_value, min(self.max_value, value))
+        return bisect_right(self.edges, clamped)
+
+    def clamp_bucket(self, bucket: int) -> int:
+        return max(0, min(self.buckets - 1, bucket))
+
+    def midpoint(self, bucket: int) -> float:
+        lo, hi = self.bounds(bucket)
+        return (lo + hi) / 2
+
+    def refine(self, factor: int) -> "QuantileBucketConfig":
+        """Split every bucket into ``factor`` equal-width parts."""
+        if factor <= 1:
+            return self
+        edges: list[float] = []
+        cuts = (self.min_value, *self.edges, self.max_value)
+        for lo, hi in zip(cuts, cuts[1:]):
+            edges.extend(lo + (hi - lo) * j / factor for j in range(1, factor))
+            edges.append(hi)
+        edges.pop()
+        unique = tuple(
+            e for i, e in enumerate(edges) if i == 0 or e > edges[i - 1]
+        )
+        return QuantileBucketConfig(self.min_value, self.max_value, unique)
+
+    def bucket_dtype(self) -> str:
+        if self.buckets <= 128:
+            return "int8"
+        return "int16" if self.buckets <= 2**15 else "int32"
+
+    def bucketize_array(
+        self, values, out: "np.ndarray | None" = None
+    ) -> "np.ndarray":
+        """Array counterpart of :meth:`bucketize`; NaN is the top bucket."""
+        import numpy as np
+
+        x = np.array(values, dtype=np.float64)
+        x[np.isnan(x)] = self.max_value
+        np.clip(x, self.min_value, self.max_value, out=x)
+        edges = np.asarray(self.edges, dtype=np.float64)
+        index = np.searchsorted(edges, x, side="right")
+        if out is None:
+            out = np.empty(x.shape, dtype=self.bucket_dtype())
+        out[...] = index
+        return out
+
+    def midpoint_array(self, buckets) -> "np.ndarray":
+        import numpy as np
+
+        cuts = np.array(
+            (self.min_value, *self.edges, self.max_value), dtype=np.float64
+        )
+        index = np.clip(np.asarray(buckets), 0, self.buckets - 1)
+        return (cuts[index] + cuts[index + 1]) / 2
+
+
+class AdaptiveBuckets:
+    """Feeds live readings into a sketch and periodically refits the edges.
+
+    ``config`` starts as ``initial`` and is replaced by a
+    :class:`QuantileBucketConfig` on :meth:`refit`, which runs automatically
+    every ``refit_every`` observations when set. ``version`` counts refits so
+    consumers know when bucket indices (and anything compiled from them)
+    changed.
+    """
+
+    def __init__(
+        self,
+        initial: BucketConfig | QuantileBucketConfig,
+        buckets: int | None = None,
+        refit_every: int | None = None,
+        k: int = 200,
+        seed: int | None = None,
+    ) -> None:
+        self.config = initial
+        self.buckets = initial.buckets if buckets is None else buckets
+        self.refit_every = refit_every
+        self.sketch = QuantileSketch(k=k, seed=seed)
+        self.version = 0
+        self._since_refit = 0
+
+    def observe(self, value: float) -> int:
+        """Record ``value`` and return its bucket under the current config."""
+        self.sketch.update(value)
+        self._since_refit += 1
+        if self.refit_every and self._since_refit >= self.refit_every:
+            self.refit()
+        return self.config.bucketize(value)
+
+    def refit(self) -> QuantileBucketConfig | BucketConfig:
+        if self.sketch.count:
+            self.config = QuantileBucketConfig.from_sketch(
+                self.sketch,
+                self.buckets,
+                self.config.min_value,
+                self.config.max_value,
+            )
+            self.version += 1
+        self._since_refit = 0
+        return self.config
+
+
+@dataclass(frozen=True, slots=True)
 class SoilBuckets:
     n: int
     c: int
@@ -92,6 +407,63 @@ def reduce_raw_soil(
     return SoilBuckets(n=n, c=c, s=s, d=d, f=family)
 
 
+def reduce_raw_soil_arrays(
+    raw: Mapping[str, "np.ndarray"],
+    configs: Mapping[str, BucketConfig],
+    chunk_size: int | None = None,
+    out: MutableMapping[str, "np.ndarray"] | None = None,
+) -> dict[str, "np.ndarray"]:
+    """Reduce gridded soil fields to bucket arrays, one array per variable.
+
+    ``raw`` maps ``"n"``, ``"c"``, ``"s"`` and ``"d"`` to arrays of one shape
+    (NumPy or memory-mapped); missing variables default to the config minimum
+    as in :func:`reduce_raw_soil`. With ``chunk_size`` the fields are processed
+    that many cells at a time so temporaries stay bounded, and ``out`` may
+    supply preallocated (e.g. memory-mapped) result arrays.
+    """
+    import numpy as np
+
+    fields = {
+        name: np.asarray(raw[name]) for name in SOIL_VARIABLES if name in raw
+    }
+    if not fields:
+        raise ValueError("raw must contain at least one soil variable")
+    shapes = {field.shape for field in fields.values()}
+    if len(shapes) != 1:
+        raise ValueError(
+            f"Soil fields must share one shape, got {sorted(shapes)}"
+        )
+    (shape,) = shapes
+    result: dict[str, np.ndarray] = {}
+    for name in SOIL_VARIABLES:
+        config = configs[name]
+        target = out[name] if out is not None and name in out else None
+        if target is None:
+            target = np.empty(shape, dtype=config.bucket_dtype())
+        elif target.shape != shape:
+            raise ValueError(
+                f"out[{name!r}] has shape {target.shape}, expected {shape}"
+            )
+        if name not in fields:
+            target[...] = config.bucketize(config.min_value)
+        elif chunk_size is None:
+            config.bucketize_array(fields[name], out=target)
+        else:
+            source = fields[name].reshape(-1)
+            flat = target.reshape(-1)
+            if not np.shares_memory(flat, target):
+                raise ValueError(
+                    f"out[{name!r}] must be contiguous for chunked reduction"
+                )
+            for start in range(0, source.size, chunk_size):
+                stop = start + chunk_size
+                config.bucketize_array(
+                    source[start:stop], out=flat[start:stop]
+                )
+        result[name] = target
+    return result
+
+
 def canonical_rotation_phase(step: int, period: int) -> int:
     """Canonicalize periodic state such as rotation phase or season index."""
     if period <= 0:
@@ -140,6 +512,219 @@ def apply_soil_delta_guarded(
     return updated
 
 
+@dataclass
+class SoilBatch:
+    """Struct-of-arrays counterpart of :class:`SoilBuckets` for many cells.
+
+    ``n``, ``c``, ``s``, ``d`` and ``f`` are parallel integer arrays of one
+    shape, e.g. the outputs of :func:`reduce_raw_soil_arrays`.
+    """
+
+    n: "np.ndarray"
+    c: "np.ndarray"
+    s: "np.ndarray"
+    d: "np.ndarray"
+    f: "np.ndarray"
+
+    @classmethod
+    def from_states(
+        cls, states: Iterable[SoilBuckets], dtype: str = "int8"
+    ) -> "SoilBatch":
+        import numpy as np
+
+        rows = np.array([state.as_tuple() for state in states], dtype=dtype)
+        rows = rows.reshape(-1, 5)
+        return cls(*(rows[:, i].copy() for i in range(5)))
+
+    def __len__(self) -> int:
+        return self.n.size
+
+    def state(self, index) -> SoilBuckets:
+        return SoilBuckets(*(int(column[index]) for column in self.columns()))
+
+    def columns(self) -> tuple["np.ndarray", ...]:
+        return (self.n, self.c, self.s, self.d, self.f)
+
+
+def _batch_deltas(
+    delta: SoilDelta | Sequence[SoilDelta], actions
+) -> tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+    import numpy as np
+
+    if isinstance(delta, SoilDelta):
+        if actions is not None:
+            raise ValueError("actions require a palette of deltas")
+        steps = (delta.dn, delta.dc, delta.ds, delta.dd)
+        return tuple(np.int16(v) for v in steps)
+    if actions is None:
+        raise ValueError("a palette of deltas requires one action per cell")
+    palette = np.array(
+        [(item.dn, item.dc, item.ds, item.dd) for item in delta],
+        dtype=np.int16,
+    ).reshape(-1, 4)
+    actions = np.asarray(actions)
+    return tuple(palette[:, i][actions] for i in range(4))
+
+
+def apply_soil_delta_batch(
+    batch: SoilBatch,
+    delta: SoilDelta | Sequence[SoilDelta],
+    limits: Mapping[str, int],
+    actions=None,
+) -> SoilBatch:
+    """Vectorized :func:`apply_soil_delta`.
+
+    ``delta`` is either one delta for every cell or a palette indexed by the
+    per-cell ``actions`` array.
+    """
+    import numpy as np
+
+    deltas = _batch_deltas(delta, actions)
+    updated = []
+    for name, column, step in zip(SOIL_VARIABLES, batch.columns(), deltas):
+        total = column.astype(np.int16) + step
+        updated.append(np.clip(total, 0, limits[name]).astype(column.dtype))
+    return SoilBatch(*updated, f=batch.f)
+
+
+def check_soil_invariants_batch(
+    batch: SoilBatch, bounds: SoilBounds
+) -> "np.ndarray":
+    """Vectorized :func:`check_soil_invariants`; ``True`` for valid cells."""
+    ok = (
+        (batch.n >= bounds.min_n)
+        & (batch.c >= bounds.min_c)
+        & (batch.s >= bounds.min_s)
+    )
+    if bounds.max_d is not None:
+        ok &= batch.d <= bounds.max_d
+    return ok
+
+
+def apply_soil_delta_guarded_batch(
+    batch: SoilBatch,
+    delta: SoilDelta | Sequence[SoilDelta],
+    limits: Mapping[str, int],
+    bounds: SoilBounds,
+    actions=None,
+) -> tuple[SoilBatch, "np.ndarray"]:
+    """Vectorized :func:`apply_soil_delta_guarded`; masks instead of raising.
+
+    Returns ``(updated, ok)``. Cells where ``ok`` is ``False`` would have
+    violated the invariants and keep their previous state, as the scalar
+    version leaves its input untouched when it raises.
+    """
+    import numpy as np
+
+    updated = apply_soil_delta_batch(batch, delta, limits, actions)
+    ok = check_soil_invariants_batch(updated, bounds)
+    kept = [
+        np.where(ok, new, old)
+        for new, old in zip(updated.columns(), batch.columns())
+    ]
+    return SoilBatch(*kept), ok
+
+
+def disease_decay_factor(half_life_seasons: int) -> float:
+    """Per-step multiplicative decay of disease pressure for a half-life."""
+    if half_life_seasons <= 0:
+        raise ValueError("half-life must be positive")
+    return 0.5 ** (1.0 / half_life_seasons)
+
+
+@dataclass(frozen=True, eq=False)
+class SoilTransitionTable:
+    """Precompiled guarded soil transitions for a fixed action palette.
+
+    Soil states ``(n, c, s, d)`` are encoded as mixed-radix integers over the
+    limits. ``table[code * n_actions + action]`` holds the encoded successor or
+    :attr:`INFEASIBLE` when the guarded transition violates the bounds.
+    """
+
+    INFEASIBLE = -1
+
+    limits: tuple[int, int, int, int]
+    n_actions: int
+    table: array
+
+    @property
+    def n_states(self) -> int:
+        n, c, s, d = self.limits
+        return (n + 1) * (c + 1) * (s + 1) * (d + 1)
+
+    def encode(self, n: int, c: int, s: int, d: int) -> int:
+        _, lc, ls, ld = self.limits
+        return ((n * (lc + 1) + c) * (ls + 1) + s) * (ld + 1) + d
+
+    def decode(self, code: int) -> tuple[int, int, int, int]:
+        _, lc, ls, ld = self.limits
+        code, d = divmod(code, ld + 1)
+        code, s = divmod(code, ls + 1)
+        n, c = divmod(code, lc + 1)
+        return (n, c, s, d)
+
+    def next_code(self, code: int, action: int) -> int:
+        return self.table[code * self.n_actions + action]
+
+    def step(
+        self, n: int, c: int, s: int, d: int, action: int
+    ) -> tuple[int, int, int, int] | None:
+        """Return the successor ``(n, c, s, d)`` or ``None`` if infeasible."""
+        nxt = self.table[self.encode(n, c, s, d) * self.n_actions + action]
+        if nxt == self.INFEASIBLE:
+            return None
+        return self.decode(nxt)
+
+
+def compile_soil_transitions(
+    deltas: Sequence[SoilDelta],
+    limits: Mapping[str, int],
+    bounds: SoilBounds,
+    disease_decay: float = 1.0,
+) -> SoilTransitionTable:
+    """Compile guarded transitions for every (bucket state, action) pair.
+
+    Disease pressure is decayed by ``disease_decay`` (rounded to a bucket)
+    before each action's delta is applied. Tables are cached per
+    configuration.
+    """
+    key = (limits["n"], limits["c"], limits["s"], limits["d"])
+    return _compile_soil_transitions(tuple(deltas), key, bounds, disease_decay)
+
+
+@lru_cache(maxsize=32)
+def _compile_soil_transitions(
+    deltas: tuple[SoilDelta, ...],
+    limits: tuple[int, int, int, int],
+    bounds: SoilBounds,
+    disease_decay: float,
+) -> SoilTransitionTable:
+    limit_map = dict(zip("ncsd", limits))
+    n_states = (
+        (limits[0] + 1) * (limits[1] + 1) * (limits[2] + 1) * (limits[3] + 1)
+    )
+    table = array("h" if n_states < 2**15 else "i")
+    compiled = SoilTransitionTable(
+        limits=limits, n_actions=len(deltas), table=table
+    )
+    for code in range(n_states):
+        n, c, s, d = compiled.decode(code)
+        state = SoilBuckets(n=n, c=c, s=s, d=d, f=0)
+        decay = int(round(d * disease_decay)) - d
+        for delta in deltas:
+            step = SoilDelta(
+                dn=delta.dn, dc=delta.dc, ds=delta.ds, dd=delta.dd + decay
+            )
+            updated = apply_soil_delta(state, step, limit_map)
+            if check_soil_invariants(updated, bounds):
+                table.append(
+                    compiled.encode(updated.n, updated.c, updated.s, updated.d)
+                )
+            else:
+                table.append(SoilTransitionTable.INFEASIBLE)
+    return compiled
+
+
 def is_componentwise_leq(a: SoilBuckets, b: SoilBuckets) -> bool:
     return a.n <= b.n and a.c <= b.c and a.s <= b.s and a.d <= b.d
 
@@ -161,15 +746,238 @@ def check_monotone_transition(
     return violations
 
 
+@dataclass(frozen=True)
+class BucketLattice:
+    """Packed mixed-radix codes for the ``(n, c, s, d, family)`` lattice.
+
+    Codes follow :func:`enumerate_bucket_states` order (family varies
+    fastest), so a state's code is also its index in that list and, with a
+    single family, matches :class:`SoilTransitionTable` soil codes. Code
+    ranges can be streamed or sharded without materializing
+    :class:`SoilBuckets` instances.
+    """
+
+    limits: tuple[int, int, int, int]
+    families: tuple[int, ...] = (0,)
+
+    @classmethod
+    def from_limits(
+        cls, limits: Mapping[str, int], families: Iterable[int] = (0,)
+    ) -> "BucketLattice":
+        return cls(
+            tuple(limits[name] for name in SOIL_VARIABLES), tuple(families)
+        )
+
+    @property
+    def shape(self) -> tuple[int, int, int, int, int]:
+        n, c, s, d = self.limits
+        return (n + 1, c + 1, s + 1, d + 1, len(self.families))
+
+    def __len__(self) -> int:
+        n, c, s, d, f = self.shape
+        return n * c * s * d * f
+
+    def encode(self, state: SoilBuckets) -> int:
+        code = 0
+        digits = (state.n, state.c, state.s, state.d)
+        for value, size in zip(digits, self.shape):
+            if not 0 <= value < size:
+                raise ValueError(
+                    f"{state} is outside the lattice limits {self.limits}"
+                )
+            code = code * size + value
+        return code * len(self.families) + self.families.index(state.f)
+
+    def decode(self, code: int) -> SoilBuckets:
+        if not 0 <= code < len(self):
+            raise IndexError(
+                f"code {code} out of range for {len(self)} states"
+            )
+        _, lc, ls, ld, nf = self.shape
+        code, f = divmod(code, nf)
+        code, d = divmod(code, ld)
+        code, s = divmod(code, ls)
+        n, c = divmod(code, lc)
+        return SoilBuckets(n=n, c=c, s=s, d=d, f=self.families[f])
+
+    def iter_states(
+        self, start: int = 0, stop: int | None = None
+    ) -> Iterator[SoilBuckets]:
+        """Lazily yield the states with codes in ``[start, stop)``."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start == 0 and stop == len(self):
+            ranges = [range(size) for size in self.shape[:4]]
+            for n, c, s, d in product(*ranges):
+                for f in self.families:
+                    yield SoilBuckets(n=n, c=c, s=s, d=d, f=f)
+            return
+        for code in range(start, stop):
+            yield self.decode(code)
+
+    def shard(self, index: int, count: int) -> range:
+        """Contiguous code range for shard ``index`` of ``count``."""
+        if not 0 <= index < count:
+            raise ValueError("shard index must be in [0, count)")
+        size = len(self)
+        return range(size * index // count, size * (index + 1) // count)
+
+    def encode_array(self, n, c, s, d, f=None) -> "np.ndarray":
+        """Vectorized :meth:`encode`; ``f`` defaults to the first family."""
+        import numpy as np
+
+        digits = np.ravel_multi_index((n, c, s, d), self.shape[:4])
+        digits = digits.astype(np.int64)
+        if f is None:
+            return digits * len(self.families)
+        families = np.asarray(self.families)
+        order = np.argsort(families, kind="stable")
+        pos = np.searchsorted(families[order], f).clip(0, len(families) - 1)
+        index = order[pos]
+        if not np.array_equal(families[index], f):
+            raise ValueError("family values outside the lattice")
+        return digits * len(self.families) + index
+
+    def decode_array(self, codes, dtype: str = "int16") -> "np.ndarray":
+        """Vectorized :meth:`decode` as ``(m, 5)`` rows of ``(n, c, s, d, f)``.
+
+        ``block[:, i]`` are column views; see :meth:`columns` for them by name.
+        """
+        import numpy as np
+
+        codes = np.asarray(codes, dtype=np.int64)
+        block = np.empty((codes.size, 5), dtype=dtype)
+        digits = np.unravel_index(codes.ravel(), self.shape)
+        for i, column in enumerate(digits[:4]):
+            block[:, i] = column
+        block[:, 4] = np.asarray(self.families)[digits[4]]
+        return block
+
+    def columns(
+        self, codes, dtype: str = "int16"
+    ) -> dict[str, "np.ndarray"]:
+        """Decode ``codes`` into named column views over one packed block."""
+        block = self.decode_array(codes, dtype)
+        names = SOIL_VARIABLES + ("f",)
+        return {name: block[:, i] for i, name in enumerate(names)}
+
+
+def iter_bucket_states(
+    limits: Mapping[str, int], families: Iterable[int]
+) -> Iterator[SoilBuckets]:
+    """Lazily enumerate states in :func:`enumerate_bucket_states` order."""
+    return BucketLattice.from_limits(limits, families).iter_states()
+
+
 def enumerate_bucket_states(
     limits: Mapping[str, int], families: Iterable[int]
 ) -> list[SoilBuckets]:
     """Helper to enumerate a small bucketed state space for monotonicity checks."""
-    states: list[SoilBuckets] = []
-    for n in range(limits["n"] + 1):
-        for c in range(limits["c"] + 1):
-            for s in range(limits["s"] + 1):
-                for d in range(limits["d"] + 1):
-                    for f in families:
-                        states.append(SoilBuckets(n=n, c=c, s=s, d=d, f=f))
-    return states
+    return list(iter_bucket_states(limits, families))
+
+
+@dataclass
+class MonotonicityReport:
+    """Result of :func:`check_monotone_lattice`.
+
+    ``violations`` holds covering pairs ``(a, b)`` with ``a <= b`` whose
+    images are not ordered; any violating pair of the full lattice implies at
+    least one.
+    """
+
+    violations: list[tuple[SoilBuckets, SoilBuckets]] = field(
+        default_factory=list
+    )
+    states: int = 0
+    pairs_checked: int = 0
+    transitions_evaluated: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+
+def _covering_offsets(
+    limits: Mapping[str, int], n_families: int
+) -> list[tuple[int, int, int]]:
+    """``(axis, stride, size)`` for the n/c/s/d axes of the enumeration."""
+    sizes = [limits[name] + 1 for name in SOIL_VARIABLES] + [n_families]
+    offsets = []
+    stride = n_families
+    for axis in range(3, -1, -1):
+        offsets.append((axis, stride, sizes[axis]))
+        stride *= sizes[axis]
+    return offsets[::-1]
+
+
+def check_monotone_lattice(
+    limits: Mapping[str, int],
+    transition: Callable,
+    families: Sequence[int] = (0,),
+    vectorized: bool = False,
+) -> MonotonicityReport:
+    """Check monotonicity on the full bucket lattice using covering pairs only.
+
+    The lattice is the one produced by :func:`enumerate_bucket_states`. Every
+    comparable pair is connected by a chain of covering pairs (``+1`` in one of
+    N/C/S/D) and pairs differing only in family, which the componentwise order
+    treats as equivalent; checking those is therefore sufficient and each state
+    is transformed exactly once.
+
+    With ``vectorized=True`` ``transition`` receives an ``(m, 5)`` integer
+    array of ``(n, c, s, d, f)`` rows and returns an ``(m, >=4)`` array of
+    successors, so the whole check runs in NumPy.
+    """
+    start = time.perf_counter()
+    families = list(families)
+    report = MonotonicityReport()
+    offsets = _covering_offsets(limits, len(families))
+    if vectorized:
+        import numpy as np
+
+        lattice = BucketLattice.from_limits(limits, families)
+        shape = lattice.shape
+        grid = lattice.decode_array(np.arange(len(lattice)), dtype="int64")
+        image = np.asarray(transition(grid))[:, :4]
+        report.states = len(grid)
+        report.transitions_evaluated = len(grid)
+        index = np.arange(len(grid)).reshape(shape)
+        lower: list = []
+        upper: list = []
+        for axis, _, size in offsets:
+            lower.append(index.take(range(size - 1), axis=axis).ravel())
+            upper.append(index.take(range(1, size), axis=axis).ravel())
+        for f in range(len(families) - 1):
+            # Family-only neighbours must be ordered both ways.
+            lower += [index[..., f].ravel(), index[..., f + 1].ravel()]
+            upper += [index[..., f + 1].ravel(), index[..., f].ravel()]
+        a = np.concatenate(lower) if lower else np.empty(0, dtype=np.intp)
+        b = np.concatenate(upper) if upper else np.empty(0, dtype=np.intp)
+        report.pairs_checked = len(a)
+        bad = np.flatnonzero((image[a] > image[b]).any(axis=1))
+        report.violations = [
+            (SoilBuckets(*map(int, grid[a[i]])),
+             SoilBuckets(*map(int, grid[b[i]])))
+            for i in bad
+        ]
+    else:
+        states = enumerate_bucket_states(limits, families)
+        images = [transition(state) for state in states]
+        report.states = len(states)
+        report.transitions_evaluated = len(states)
+        n_fam = len(families)
+        for i, state in enumerate(states):
+            pairs = []
+            values = (state.n, state.c, state.s, state.d)
+            for axis, stride, size in offsets:
+                if values[axis] + 1 < size:
+                    pairs.append((i, i + stride))
+            f = i % n_fam
+            if f + 1 < n_fam:
+                pairs += [(i, i + 1), (i + 1, i)]
+            for lo, hi in pairs:
+                report.pairs_checked += 1
+                if not is_componentwise_leq(images[lo], images[hi]):
+                    report.violations.append((states[lo], states[hi]))
+    report.elapsed_s = time.perf_counter() - start
+    return report
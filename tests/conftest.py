@@ -0,0 +1,44 @@
+from typing import Iterable
+
+import pytest
+
+from les.optimizer import Crop, RotationProblem
+from les_state_reduction import SoilBounds
+
+
+@pytest.fixture
+def cabbage() -> Crop:
+    return Crop("Cabbage", "Brassicaceae", 1.2, (80, 90), (90, 95),
+                (-1, -1, 0), 0, 2, 0)
+
+
+@pytest.fixture
+def rotation_problem():
+    """Factory for the small Tomato/Beans/CoverCrop rotation problem.
+
+    ``extra`` crops are placed after Tomato, so action indices and palette
+    order tie-breaks stay the same across the optimizer tests.
+    """
+
+    def make(horizon: int = 6, extra: Iterable[Crop] = ()) -> RotationProblem:
+        crops = (
+            Crop("Tomato", "Solanaceae", 4.0, (120, 80), (180, 160),
+                 (-2, -1, -1), 1, 3, 0),
+            *extra,
+            Crop("Beans", "Legume", 7.0, (45, 55), (130, 135),
+                 (0, -1, 0), -1, 2, 1),
+            Crop("CoverCrop", "Cover", 0.0, (0,), (70,), (2, 2, 1), -2, 1, 2),
+        )
+        return RotationProblem(
+            crops=crops,
+            horizon=horizon,
+            n_max=4,
+            c_max=4,
+            s_max=4,
+            d_max=3,
+            bounds=SoilBounds(min_n=1, min_c=1, min_s=1, max_d=3),
+            k_max=3,
+            cooldown_seasons=2,
+        )
+
+    return make
@@ -1,5 +1,7 @@
-from les.state import state
-from les.alerts import alert_engine
+import pytest
+
+from les.state import StateRegistry, state
+from les.alerts import AlertEngine, alert_engine
 
 
 def test_threshold_alerts_trigger():
@@ -15,3 +17,54 @@ def test_threshold_alerts_clear():
     state.set('aq.orp', 300)
     alerts = alert_engine.check(state)
     assert alerts == []
+
+
+def test_global_readings_keep_their_python_type():
+    state.set('aq.nitrate', 200)
+    assert state.get('aq.nitrate') == 200
+    assert isinstance(state.get('aq.nitrate'), int)
+    alert = 'aq.nitrate above threshold (200 > 150.0)'
+    assert alert in alert_engine.check(state)
+    state.set('aq.nitrate', '5')
+    assert state.get('aq.nitrate') == '5'
+    state.set('aq.nitrate', 50)
+
+
+def test_check_only_reevaluates_changed_keys():
+    reads = []
+
+    class CountingRegistry(StateRegistry):
+        def get(self, key):
+            reads.append(key)
+            return super().get(key)
+
+    registry = CountingRegistry()
+    for i in range(50):
+        registry.register(f'aq.sensor{i}', 1.0)
+    engine = AlertEngine()
+    for i in range(50):
+        engine.register_threshold(f'aq.sensor{i}', low=0.0, high=10.0)
+
+    assert engine.check(registry) == [] and len(reads) == 50
+    reads.clear()
+    registry.set('aq.sensor7', 12.0)
+    alert = 'aq.sensor7 above threshold (12.0 > 10.0)'
+    assert engine.check(registry) == [alert]
+    assert reads == ['aq.sensor7']
+    reads.clear()
+    assert engine.check(registry) == [alert]
+    assert reads == []
+
+
+def test_vectorized_slot_writes_are_checked():
+    registry = StateRegistry()
+    slot = registry.declare('aq.temp', 20.0)
+    engine = AlertEngine()
+    engine.register_threshold('aq.temp', high=30.0)
+    assert engine.check(registry) == []
+
+    view = registry.as_array()
+    with pytest.raises(ValueError):  # untracked writes are refused
+        view[slot] = 99.0
+    registry.set_slots([slot], [99.0])
+    assert engine.check(registry) == ['aq.temp above threshold (99.0 > 30.0)']
@@ -0,0 +1,75 @@
+import pytest
+
+from les.aq import Aquarium
+from les.coupler import SECONDS_PER_DAY, SECONDS_PER_HOUR, Coupler
+from les.modules.energy.usage import update_energy_usage
+from les.modules.pumps import PumpController
+
+
+def test_modules_run_at_their_own_rates_with_scaled_dt():
+    state = {"sensors": {"quality": 10.0}}
+    pump = PumpController(
+        state, 2.0, "sensors.quality", 0.0, 10.0, cycle_duration=60.0
+    )
+    aq = Aquarium(pump_w=100)
+    aq.pump_on = True
+    seasons = []
+
+    coupler = Coupler()
+    coupler.register("pump", pump.update, 1.0)
+    coupler.register(
+        "energy", lambda dt: update_energy_usage(aq, dt), SECONDS_PER_HOUR,
+        dt_scale=1 / SECONDS_PER_HOUR,
+    )
+    coupler.register(
+        "optimizer",
+        seasons.append,
+        90 * SECONDS_PER_DAY,
+        dt_scale=1 / SECONDS_PER_DAY,
+    )
+
+    coupler.run_until(2 * SECONDS_PER_HOUR)
+    stats = coupler.stats
+    assert stats["pump"].steps == 7200
+    assert stats["energy"].steps == 2
+    assert stats["optimizer"].steps == 0
+    assert pump.total_volume == pytest.approx(2.0 * 7200)
+    assert aq.energy_kwh == pytest.approx(0.2)
+
+    coupler.unregister("pump")
+    coupler.run_until(180 * SECONDS_PER_DAY)
+    assert seasons == [90.0, 90.0]
+    assert coupler.now == 180 * SECONDS_PER_DAY
+
+
+def test_ties_follow_priority_and_cost_is_recorded():
+    ticks = iter(range(100))
+    order = []
+    coupler = Coupler(clock=lambda: next(ticks))
+    coupler.register("late", lambda dt: order.append("late"), 2.0, priority=1)
+    coupler.register(
+        "early", lambda dt: order.append("early"), 1.0, priority=0
+    )
+    coupler.register("offset", lambda dt: order.append(dt), 2.0, offset=0.5)
+    coupler.run_until(2.5)
+    assert order == ["early", "early", "late", 2.5]
+    assert coupler.stats["early"].mean_s == 1
+
+
+def test_failing_step_is_counted_and_rescheduled():
+    calls = []
+
+    def flaky(dt):
+        calls.append(dt)
+        if len(calls) == 1:
+            raise RuntimeError("sensor offline")
+
+    coupler = Coupler()
+    coupler.register("flaky", flaky, 1.0)
+    with pytest.raises(RuntimeError):
+        coupler.step()
+    assert coupler.next_due() == 2.0
+    assert coupler.run_until(3.0) == 2
+    assert calls == [1.0, 1.0, 1.0]
+    assert coupler.stats["flaky"].errors == 1
+    assert coupler.stats["flaky"].steps == 3
@@ -1,8 +1,22 @@
 import csv
+from collections import deque
+
+import pytest
 
 from les.modules.events import logger
 
 
+@pytest.fixture
+def event_file(tmp_path, monkeypatch):
+    """Point the logger at a temporary file and a private, empty ring."""
+    path = tmp_path / "events.csv"
+    monkeypatch.setattr(logger, "_EVENT_LOG_FILE", path)
+    monkeypatch.setattr(
+        logger, "_EVENT_LOG", deque(maxlen=logger._EVENT_LOG_MAXLEN)
+    )
+    return path
+
+
 def test_log_event_persists_and_limits(tmp_path, monkeypatch):
     temp_file = tmp_path / "events.csv"
     monkeypatch.setattr(logger, "_EVENT_LOG_FILE", temp_file)
@@ -20,3 +34,32 @@ def test_log_event_persists_and_limits(tmp_path, monkeypatch):
     with temp_file.open() as f:
         rows = list(csv.DictReader(f))
     assert len(rows) == 2
+
+
+def test_tail_events_reads_only_the_end(event_file):
+    for i in range(2000):
+        logger.log_event("bulk", f"event {i}")
+    logger.log_event("note", 'multi\nline, "quoted"')
+    logger.log_event("bulk", "last")
+
+    events = logger.tail_events(event_file, 3, block_size=64)
+    assert [e["details"] for e in events] == [
+        "event 1999",
+        'multi\nline, "quoted"',
+        "last",
+    ]
+    assert len(logger.tail_events(event_file, 5000, block_size=64)) == 2002
+
+    # A restart with an empty ring reads only the requested tail.
+    logger._EVENT_LOG.clear()
+    recent = logger.get_recent_events(limit=2)
+    assert recent[-1]["details"] == "last"
+    assert len(logger._EVENT_LOG) == 2
+
+
+def test_event_ring_is_bounded(event_file):
+    maxlen = logger._EVENT_LOG_MAXLEN
+    for i in range(maxlen + 10):
+        logger.log_event("bulk", str(i))
+    assert len(logger._EVENT_LOG) == maxlen
+    assert logger.get_recent_events(limit=1)[0]["details"] == str(maxlen + 9)
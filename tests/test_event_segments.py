@@ -0,0 +1,138 @@
+import csv
+import gzip
+import threading
+from collections import deque
+
+from les.modules.events import logger, segments
+from les.modules.events.segments import SegmentedEventLog
+
+
+def _event(minute, event_type="bulk"):
+    return {
+        "timestamp": f"2025-01-01T{minute // 60:02d}:{minute % 60:02d}:00",
+        "event_type": event_type,
+        "details": f"m{minute}",
+    }
+
+
+def test_segments_rotate_compress_and_skip_by_manifest(tmp_path):
+    log = SegmentedEventLog(
+        tmp_path, max_bytes=10_000, max_age=600, compression="gzip"
+    )
+    for minute in range(0, 120):
+        event_type = "hardware_failure" if minute == 30 else "bulk"
+        log.append(_event(minute, event_type))
+    log.wait_sealed()
+
+    # Ten-minute spans force a seal every 11 events; sealed segments are gzip
+    # files.
+    assert [(s.first[-8:], s.count) for s in log.segments[:2]] == [
+        ("00:00:00", 11), ("00:11:00", 11)
+    ]
+    assert not list(tmp_path.glob("events-000001.csv"))
+    with gzip.open(tmp_path / log.segments[0].name, "rt") as f:
+        assert f.readline().startswith("timestamp")
+
+    read = []
+    original = log._read_segment
+    log._read_segment = lambda info: read.append(info.name) or original(info)
+    assert [e["details"] for e in log.recent(3)] == ["m117", "m118", "m119"]
+    assert read == []
+    failures = log.query(
+        "hardware_failure", since="2025-01-01T00:25", until="2025-01-01T00:40"
+    )
+    assert [e["details"] for e in failures] == ["m30"]
+    assert read == [log.segments[3].name, log.segments[2].name]
+    log.close()
+
+
+def test_retention_and_reopen(tmp_path):
+    with SegmentedEventLog(tmp_path, max_age=60, retain_segments=3) as log:
+        for minute in range(0, 600, 10):
+            log.append(_event(minute))
+        log.wait_sealed()
+        assert len(log.segments) == 3
+        assert len(list(tmp_path.glob("events-*.csv*"))) == 4
+
+    reopened = SegmentedEventLog(tmp_path, max_age=60, retain_segments=3)
+    assert len(reopened) == len(log)
+    assert reopened.recent(1)[0]["details"] == "m590"
+    reopened.close()
+
+
+def test_log_event_uses_segmented_log(tmp_path, monkeypatch):
+    csv_file = tmp_path / "events.csv"
+    monkeypatch.setattr(
+        logger, "_EVENT_LOG", deque(maxlen=logger._EVENT_LOG_MAXLEN)
+    )
+    monkeypatch.setattr(logger, "_EVENT_LOG_FILE", csv_file)
+    logger.log_event("type1", "before migration")
+
+    segments = logger.use_segmented_log(
+        tmp_path / "segments", migrate_csv=True
+    )
+    try:
+        logger.log_event("type2", "after migration")
+        logger._EVENT_LOG.clear()
+        events = logger.get_recent_events(limit=5)
+        assert [e["details"] for e in events] == [
+            "before migration", "after migration"
+        ]
+        assert len(segments) == 2
+    finally:
+        logger.close_segmented_log()
+
+
+def test_appends_are_buffered_and_recent_is_served_from_memory(
+    tmp_path, monkeypatch
+):
+    log = SegmentedEventLog(
+        tmp_path, compression=None, flush_every=100, flush_interval=60.0
+    )
+    for minute in range(10):
+        log.append(_event(minute))
+    path = tmp_path / "events-000001.csv"
+    assert path.stat().st_size == 0  # still in the write buffer
+
+    with monkeypatch.context() as patch:
+        patch.setattr(segments.csv, "DictReader", None)  # no file reads
+        assert [e["details"] for e in log.recent(2)] == ["m8", "m9"]
+        assert len(log.query("bulk")) == 10
+
+    log.flush()
+    with path.open(newline="") as f:
+        assert len(list(csv.DictReader(f))) == 10
+    log.close()
+
+
+def test_rotation_seals_off_the_appending_thread(tmp_path, monkeypatch):
+    sealed_on = []
+    gzip_open = segments._CODECS["gzip"][1]
+
+    def opener(path, mode):
+        if "w" in mode:
+            sealed_on.append(threading.current_thread())
+        return gzip_open(path, mode)
+
+    monkeypatch.setitem(segments._CODECS, "gzip", (".gz", opener))
+    log = SegmentedEventLog(tmp_path, max_age=60, compression="gzip")
+    for minute in range(0, 40, 10):
+        log.append(_event(minute))
+    # Segments rotated but not yet sealed are readable as plain CSV.
+    assert len(log.query("bulk")) == 4
+    log.wait_sealed()
+    assert len(sealed_on) == 3
+    assert threading.current_thread() not in sealed_on
+    assert [s.compression for s in log.segments] == ["gzip"] * 3
+    assert [e["details"] for e in log.query("bulk")] == [
+        "m0", "m10", "m20", "m30"
+    ]
+    log.close()
+
+
+def test_max_bytes_counts_encoded_bytes(tmp_path):
+    log = SegmentedEventLog(tmp_path, compression=None)
+    log.append({**_event(0), "details": "température élevée ✓"})
+    log.flush()
+    assert log._open_size == (tmp_path / "events-000001.csv").stat().st_size
+    log.close()
@@ -0,0 +1,64 @@
+import sys
+
+from les.cli import main
+from les.modules.events import logger
+from les.modules.events.store import SQLiteEventStore, migrate_csv
+from les.modules.events.types import EventType
+
+
+def _event(day, event_type, details):
+    timestamp = f"2025-01-{day:02d}T12:00:00"
+    return {
+        "timestamp": timestamp, "event_type": event_type, "details": details
+    }
+
+
+def test_store_range_and_period_queries_use_the_index(tmp_path):
+    with SQLiteEventStore(tmp_path / "events.db") as store:
+        store.append_many(
+            _event(day, "hardware_failure" if day % 3 == 0 else "mortalities",
+                   f"d{day}")
+            for day in range(1, 29)
+        )
+        failures = store.query(
+            EventType.HARDWARE_FAILURE, since="2025-01-05", until="2025-01-16"
+        )
+        assert [e["details"] for e in failures] == ["d6", "d9", "d12", "d15"]
+        assert store.query(limit=2)[-1]["details"] == "d28"
+        assert store.count("mortalities") == 19
+        weekly = store.counts("week", "mortalities")
+        assert sum(n for _, n in weekly) == 19
+        assert len(weekly) == 5
+
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM events "
+            "WHERE event_type = ? AND timestamp >= ?",
+            ("mortalities", "2025-01-05"),
+        ).fetchall()
+        assert any("events_type_time" in row[-1] for row in plan)
+
+
+def test_migrate_csv_then_cli_filters(tmp_path, monkeypatch, capsys):
+    csv_file = tmp_path / "events.csv"
+    db_file = tmp_path / "events.db"
+    monkeypatch.setattr(logger, "_EVENT_LOG", [])
+    monkeypatch.setattr(logger, "_EVENT_LOG_FILE", csv_file)
+    logger.log_event(EventType.FILTER_CHANGE, "Filter replaced")
+    logger.log_event(EventType.HARDWARE_FAILURE, "Pump failure")
+
+    assert migrate_csv(csv_file, db_file) == 2
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "prog", "--db", str(db_file),
+            "--show-events", "--type", "hardware_failure",
+        ],
+    )
+    try:
+        main()
+    finally:
+        logger.close_event_store()
+    out = capsys.readouterr().out
+    assert "hardware_failure: Pump failure" in out
+    assert "filter_change" not in out
@@ -0,0 +1,57 @@
+import csv
+
+from les.modules.events import benchmark, logger
+from les.modules.events.logger import BufferedEventWriter
+
+
+def _rows(path):
+    with path.open() as f:
+        return list(csv.DictReader(f))
+
+
+def test_writer_batches_rows_and_flushes_on_close(tmp_path):
+    path = tmp_path / "events.csv"
+    writer = BufferedEventWriter(path, flush_every=10, flush_interval=60.0)
+    for i in range(25):
+        writer.write(
+            {"timestamp": str(i), "event_type": "t", "details": f"e{i}"}
+        )
+    assert writer.flush(timeout=5)
+    details = [row["details"] for row in _rows(path)]
+    assert details == [f"e{i}" for i in range(25)]
+    # Two full batches plus the explicit flush, not one flush per event.
+    assert writer.flushes == 3
+
+    writer.write({"timestamp": "25", "event_type": "t", "details": "last"})
+    writer.close()
+    assert _rows(path)[-1]["details"] == "last"
+    assert writer.written == 26
+
+
+def test_buffered_log_event_is_readable_after_reload(tmp_path, monkeypatch):
+    path = tmp_path / "events.csv"
+    monkeypatch.setattr(logger, "_EVENT_LOG_FILE", path)
+    monkeypatch.setattr(logger, "_EVENT_LOG", [])
+    logger.enable_buffered_writes(flush_every=1000, flush_interval=60.0)
+    try:
+        logger.log_event("type1", "first event")
+        logger.log_event("type2", "second event")
+        # Simulate a restart: the in-memory log is gone, the file must be
+        # complete.
+        logger._EVENT_LOG.clear()
+        events = logger.get_recent_events(limit=5)
+    finally:
+        logger.disable_buffered_writes()
+    assert [e["event_type"] for e in events] == ["type1", "type2"]
+    assert len(_rows(path)) == 2
+
+
+def test_benchmark_reports_events_per_second(tmp_path):
+    rates = {
+        mode: benchmark.measure(
+            500, tmp_path / f"{mode}.csv", buffered=mode == "buffered"
+        )
+        for mode in ("sync", "buffered")
+    }
+    assert all(rate > 0 for rate in rates.values())
+    assert len(_rows(tmp_path / "buffered.csv")) == 500
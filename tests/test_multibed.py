@@ -0,0 +1,42 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from les.optimizer import (
+    Bed,
+    RotationState,
+    solve,
+    solve_multibed,
+)
+
+
+def test_loose_budget_matches_independent_beds(rotation_problem, cabbage):
+    problem = rotation_problem(extra=[cabbage])
+    initials = [RotationState(3, 3, 3, 1, 1), RotationState(4, 4, 4, 0, 0)]
+    beds = [Bed(problem, initial) for initial in initials]
+
+    result = solve_multibed(beds, water_budget=100, max_workers=1)
+
+    solution = solve(problem)
+    expected = sum(solution.value_of(initial) for initial in initials)
+    assert result.total_profit == pytest.approx(expected)
+    assert result.unplanned == []
+
+
+def test_tight_budget_is_respected_across_worker_processes(
+    rotation_problem, cabbage
+):
+    problem = rotation_problem(extra=[cabbage])
+    other = replace(problem, k_max=2)
+    beds = [Bed(problem, RotationState(3, 3, 3, 1, 1)) for _ in range(3)]
+    beds += [Bed(other, RotationState(4, 4, 4, 0, 0)) for _ in range(3)]
+
+    unconstrained = solve_multibed(beds, water_budget=100, max_workers=1)
+    budget = unconstrained.water_used.max() - 4
+    result = solve_multibed(beds, water_budget=budget, max_workers=2)
+
+    assert result.unplanned == []
+    assert np.all(result.water_used <= budget)
+    assert result.total_profit <= result.upper_bound + 1e-6
+    assert result.total_profit <= unconstrained.total_profit
@@ -5,6 +5,7 @@ import builtins
 import pytest
 
 from les.modules.sensors.nutrients import poll_nitrate, poll_orp
+from les.modules.sensors.polling import EZO_NO_DATA, EZO_PENDING
 
 
 def _fake_bus_factory(data):
@@ -44,6 +45,16 @@ def test_poll_returns_none_on_invalid_data(monkeypatch, func):
     assert func() is None
 
 
+@pytest.mark.parametrize("func", [poll_nitrate, poll_orp])
+@pytest.mark.parametrize("status", [EZO_PENDING, EZO_NO_DATA])
+def test_poll_returns_none_on_probe_status(monkeypatch, func, status):
+    data = [status] + [0] * 31
+    fake_module = types.SimpleNamespace(SMBus=_fake_bus_factory(data))
+    monkeypatch.setitem(sys.modules, "smbus2", fake_module)
+    monkeypatch.setattr("time.sleep", lambda x: None)
+    assert func() is None
+
+
 @pytest.mark.parametrize("func", [poll_nitrate, poll_orp])
 def test_poll_returns_none_on_import_error(monkeypatch, func):
     real_import = builtins.__import__
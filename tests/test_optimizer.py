@@ -0,0 +1,93 @@
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from les.optimizer import (
+    RotationProblem,
+    RotationState,
+    compile_model,
+    solve,
+)
+
+
+def _reference_value(
+    problem: RotationProblem, initial: RotationState
+) -> float:
+    """Plain recursive DP mirroring the original ``demo.dp``."""
+    model = compile_model(problem)
+
+    @lru_cache(None)
+    def dp(t: int, code: int) -> float:
+        if t == problem.horizon:
+            return 0.0
+        best = float("-inf")
+        for a, crop in enumerate(problem.crops):
+            nxt = int(model.next_state[a, code])
+            if nxt >= 0:
+                best = max(best, crop.profit(t) + dp(t + 1, nxt))
+        return best
+
+    return dp(0, model.encode(initial))
+
+
+def test_solve_matches_recursive_reference(rotation_problem, cabbage):
+    problem = rotation_problem(extra=[cabbage])
+    solution = solve(problem)
+    initial = RotationState(n=3, c=3, s=3, d=1, k=1)
+    expected = _reference_value(problem, initial)
+    assert solution.value_of(initial) == pytest.approx(expected)
+
+    plan = solution.plan(initial)
+    assert len(plan) == problem.horizon
+    assert sum(step.profit for step in plan) == pytest.approx(expected)
+    for prev, step in zip(plan, plan[1:]):
+        assert step.state == prev.next_state
+
+
+def test_compiled_transitions_respect_rules(rotation_problem, cabbage):
+    problem = rotation_problem(extra=[cabbage])
+    model = compile_model(problem)
+    tomato = problem.crop_names.index("Tomato")
+    cover = problem.crop_names.index("CoverCrop")
+
+    after_tomato = RotationState(
+        3, 3, 3, 0, 0, family="Solanaceae", cooldown=0
+    )
+    assert model.next_state[tomato, model.encode(after_tomato)] < 0
+
+    cooling = RotationState(3, 3, 3, 0, 0, family="Cover", cooldown=1)
+    assert model.next_state[tomato, model.encode(cooling)] < 0
+
+    depleted = RotationState(1, 1, 1, 0, 0, family="Legume", cooldown=0)
+    assert model.next_state[tomato, model.encode(depleted)] < 0
+    nxt = model.decode(int(model.next_state[cover, model.encode(depleted)]))
+    assert nxt == RotationState(3, 3, 2, 0, 2, family="Cover", cooldown=0)
+
+
+def test_compact_solve_drops_value_layers_and_reports_memory(
+    rotation_problem, cabbage
+):
+    problem = rotation_problem(extra=[cabbage])
+    initial = RotationState(n=3, c=3, s=3, d=1, k=1)
+    full = solve(problem)
+    compact = solve(
+        problem, value_dtype=np.float32, keep_values=False, measure_memory=True
+    )
+
+    assert compact.value.shape == (1, full.model.n_states)
+    assert compact.policy.dtype == np.int8
+    assert compact.value_of(initial) == pytest.approx(
+        full.value_of(initial), rel=1e-6
+    )
+    assert compact.plan(initial) == full.plan(initial)
+    with pytest.raises(ValueError):
+        compact.value_of(initial, t=1)
+
+    assert (
+        compact.stats.value_bytes * 2 * (problem.horizon + 1)
+        == full.stats.value_bytes
+    )
+    assert compact.stats.table_bytes < full.stats.table_bytes
+    assert compact.stats.peak_bytes > 0
+    assert full.stats.peak_bytes is None
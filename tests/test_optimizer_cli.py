@@ -0,0 +1,105 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from les.optimizer.cli import main
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cold-start budget for importing the demo in a fresh interpreter: about 0.15 s
+# locally, nearly all of it numpy.
+STARTUP_BUDGET_S = 0.5
+
+# Modules only the sweep, multi-bed and CLI paths need; ``import demo``
+# must not load them.
+HEAVY_MODULES = (
+    "pandas",
+    "argparse",
+    "concurrent.futures",
+    "multiprocessing",
+    "les.optimizer.evaluate",
+    "les.optimizer.multibed",
+    "les.optimizer.scenarios",
+)
+
+
+def _problem_json(tmp_path: Path) -> Path:
+    tables = {
+        "prices": {"Tomato": 4.0, "Beans": 7.0, "CoverCrop": 0.0},
+        "family": {
+            "Tomato": "Solanaceae", "Beans": "Legume", "CoverCrop": "Cover"
+        },
+        "yields": {"Tomato": [120, 80], "Beans": [45, 55], "CoverCrop": [0]},
+        "costs": {
+            "Tomato": [180, 160], "Beans": [130, 135], "CoverCrop": [70]
+        },
+        "soil_delta": {
+            "Tomato": [-2, -1, -1], "Beans": [0, -1, 0], "CoverCrop": [2, 2, 1]
+        },
+        "disease_delta": {"Tomato": 1, "Beans": -1, "CoverCrop": -2},
+        "resource_delta": {
+            "Tomato": [3, 0], "Beans": [2, 1], "CoverCrop": [1, 2]
+        },
+        "horizon": 6,
+        "n_max": 4, "c_max": 4, "s_max": 4, "d_max": 3, "k_max": 3,
+        "bounds": {"min_n": 1, "min_c": 1, "min_s": 1, "max_d": 3},
+        "cooldown_seasons": 2,
+    }
+    path = tmp_path / "problem.json"
+    path.write_text(json.dumps(tables))
+    return path
+
+
+def test_cli_prints_plan_as_json(tmp_path, capsys):
+    path = _problem_json(tmp_path)
+    args = [str(path), "--initial", "4", "4", "4", "0", "2"]
+    assert main(args + ["--format", "json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert len(report["plan"]) == 6
+    total = sum(row["Profit(AUD)"] for row in report["plan"])
+    assert abs(report["summary"]["Total profit (AUD)"] - total) < 1e-6
+
+
+def _import_demo():
+    """Import ``demo`` in a fresh interpreter and report what it cost."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import demo\n"
+        "elapsed = time.perf_counter() - start\n"
+        "from les.optimizer.tabular import compile_model\n"
+        f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps([elapsed, loaded, "
+        "compile_model.cache_info().currsize]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_does_not_solve_or_load_heavy_modules():
+    _, loaded, compiled = _import_demo()
+    assert loaded == []
+    assert compiled == 0
+
+
+@pytest.mark.benchmark
+def test_import_is_fast():
+    elapsed, _, _ = _import_demo()
+    assert elapsed < STARTUP_BUDGET_S
+
+
+def test_lazy_exports_resolve_to_submodule_objects():
+    import les.optimizer as optimizer
+    from les.optimizer import scenarios
+
+    assert optimizer.run_sweep is scenarios.run_sweep
+    assert set(optimizer.__all__) <= set(dir(optimizer))
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from les.optimizer import (
+    RotationState,
+    base_tables,
+    evaluate_policy,
+    solve,
+)
+
+
+def test_policy_scored_against_price_scenarios(rotation_problem, cabbage):
+    problem = rotation_problem(extra=[cabbage])
+    solution = solve(problem)
+    initial = RotationState(3, 3, 3, 1, 1)
+    prices, _, _ = base_tables(problem)
+    factors = np.linspace(0.5, 1.5, 201)
+    shocks = factors[:, None] * prices[None, :]
+
+    result = evaluate_policy(solution.model, solution, initial, prices=shocks)
+
+    assert result.profits.shape == (201,)
+    assert result.feasible.all()
+    assert factors[100] == 1.0
+    assert result.profits[100] == pytest.approx(solution.value_of(initial))
+    assert result.profits[-1] > result.profits[0]
+
+
+def test_fixed_sequence_reports_infeasible_trajectories(
+    rotation_problem, cabbage
+):
+    problem = rotation_problem(extra=[cabbage])
+    initials = [RotationState(4, 4, 4, 0, 0), RotationState(1, 1, 1, 0, 0)]
+    plan = ["Tomato", "CoverCrop", "Beans",
+            "CoverCrop", "Cabbage", "CoverCrop"]
+
+    result = evaluate_policy(problem, plan, initials)
+
+    assert result.feasible.tolist() == [True, False]
+    expected = sum(
+        problem.crops[problem.crop_names.index(a)].profit(t)
+        for t, a in enumerate(plan)
+    )
+    assert result.profits[0] == pytest.approx(expected)
+    assert result.profits[1] == 0.0
+    assert (result.actions[1] == -1).all()
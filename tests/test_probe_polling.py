@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+from les.modules.sensors.polling import (
+    BusPool,
+    FakeBus,
+    Probe,
+    poll_all,
+    poll_probes,
+)
+
+
+def _rack(buses, reads=None):
+    """Two buses of six probes; ``reads`` logs the writes seen per read."""
+
+    def probe_text(bus, i):
+        def read():
+            if reads is not None:
+                reads.append(sum(len(b.writes) for b in buses.values()))
+            return f"{bus}.{i}"
+
+        return read
+
+    def factory(bus):
+        buses[bus] = FakeBus({0x60 + i: probe_text(bus, i) for i in range(6)})
+        return buses[bus]
+
+    probes = [Probe(f"p{bus}{i}", 0x60 + i, bus=bus, conversion_s=0.05)
+              for bus in (1, 2) for i in range(6)]
+    return factory, probes
+
+
+def test_rack_samples_in_one_conversion_time_with_shared_handles():
+    buses, reads = {}, []
+    factory, probes = _rack(buses, reads)
+    with BusPool(factory) as pool:
+        readings = poll_all(probes, pool)
+        poll_all(probes, pool)
+        assert sorted(buses) == [1, 2]  # one handle per bus, reused
+    # Every probe was told to convert before the first result was read.
+    assert reads[:12] == [12] * 12
+    assert readings["p23"].value == pytest.approx(2.3)
+    assert all(r.ok and r.attempts == 1 for r in readings.values())
+    assert buses[1].closed
+
+
+@pytest.mark.benchmark
+def test_rack_poll_takes_about_one_conversion_time():
+    factory, probes = _rack({})
+    with BusPool(factory) as pool:
+        start = time.perf_counter()
+        poll_all(probes, pool)
+        elapsed = time.perf_counter() - start
+    assert elapsed < 0.05 * 3
+
+
+def test_retries_pending_and_failed_reads_then_times_out():
+    bus = FakeBus(
+        {0x64: "12.5", 0x62: "240", 0x63: "7"},
+        pending={0x64: 1},
+        failures={0x62: 5},
+    )
+    pool = BusPool(lambda _: bus)
+    probes = [
+        Probe("nitrate", 0x64, conversion_s=0.01),
+        Probe("orp", 0x62, conversion_s=0.01),
+        Probe("slow", 0x63, conversion_s=1.0),
+    ]
+    readings = asyncio.run(
+        poll_probes(probes, pool, timeout=0.3, retries=2, retry_delay=0.0)
+    )
+    assert readings["nitrate"].value == 12.5
+    assert readings["nitrate"].attempts == 2
+    assert not readings["orp"].ok
+    assert readings["orp"].attempts == 3
+    assert "failed" in readings["orp"].error
+    assert readings["slow"].error == "timeout"
@@ -0,0 +1,77 @@
+import dataclasses
+
+import pytest
+
+from les.optimizer import (
+    Crop,
+    RotationState,
+    certify_monotone,
+    compile_model,
+    solve,
+    solve_pruned,
+)
+
+_BRASSICAS = (
+    Crop("Cabbage", "Brassica", 3.0, (90, 70), (150, 140),
+         (-1, -1, 0), 1, 2, 0),
+    Crop("Kale", "Brassica", 3.0, (80, 60), (150, 140),
+         (-1, -1, -1), 1, 2, 0),
+)
+
+
+@pytest.mark.parametrize(
+    "initial",
+    [
+        RotationState(4, 4, 4, 0, 2),
+        RotationState(2, 2, 2, 2, 0),
+        RotationState(3, 1, 4, 1, 1),
+    ],
+)
+def test_pruned_search_matches_full_solve(initial, rotation_problem):
+    problem = rotation_problem(8, extra=_BRASSICAS)
+    pruned = solve_pruned(problem, initial)
+    assert pruned.value == pytest.approx(solve(problem).value_of(initial))
+    assert sum(step.profit for step in pruned.plan) == pytest.approx(
+        pruned.value
+    )
+    assert [step.state for step in pruned.plan[1:]] == [
+        step.next_state for step in pruned.plan[:-1]
+    ]
+
+
+def test_dominated_crops_and_states_are_pruned(rotation_problem):
+    problem = rotation_problem(8, extra=_BRASSICAS)
+    assert certify_monotone(problem)
+    stats = solve_pruned(problem, RotationState(4, 4, 4, 0, 2)).stats
+    # Kale earns less than Cabbage and depletes more sulfur in every season.
+    assert stats.actions_pruned == problem.horizon
+    assert stats.pruned_dominated > 0
+    assert stats.labels_generated > stats.states_expanded
+
+
+def test_pruned_search_does_not_compile_the_dense_model(rotation_problem):
+    compile_model.cache_clear()
+    problem = rotation_problem(8, extra=_BRASSICAS)
+    initial = RotationState(4, 4, 4, 0, 2)
+    pruned = solve_pruned(problem, initial)
+    assert compile_model.cache_info().currsize == 0
+    # A compiled model gives the same answer through its table.
+    assert solve_pruned(compile_model(problem), initial).plan == pruned.plan
+
+
+@pytest.mark.parametrize("water_budget", [6, 2])
+def test_lazy_successors_match_the_compiled_table(
+    water_budget, rotation_problem
+):
+    problem = dataclasses.replace(
+        rotation_problem(5, extra=_BRASSICAS), water_budget=water_budget
+    )
+    model = compile_model(problem)
+    for initial in (
+        RotationState(4, 4, 4, 0, 3),
+        RotationState(1, 1, 1, 3, 0, "Legume"),
+        RotationState(2, 3, 1, 1, 1, "Solanaceae", 2),
+    ):
+        lazy = solve_pruned(problem, initial)
+        assert solve_pruned(model, initial).plan == lazy.plan
+        assert lazy.value == pytest.approx(solve(model).value_of(initial))
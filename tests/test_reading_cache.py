@@ -0,0 +1,91 @@
+import threading
+from dataclasses import replace
+
+from les.modules.sensors import cache as cache_module
+from les.modules.sensors.cache import Quality, ReadingCache, nutrient_cache
+from les.modules.sensors.polling import BusPool, FakeBus
+from les.state import StateRegistry
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_concurrent_reads_share_one_refresh_and_publish():
+    calls = []
+    release = threading.Event()
+
+    def slow_probe():
+        calls.append(1)
+        release.wait(1.0)
+        return 42.0
+
+    registry = StateRegistry()
+    registry.register("aq.nitrate")
+    with ReadingCache(registry, ttl=5.0) as cache:
+        cache.register("nitrate", slow_probe, "aq.nitrate")
+        readings = [cache.get("nitrate") for _ in range(100)]
+        assert {r.quality for r in readings} == {Quality.MISSING}
+
+        # Joins the refresh started by get(), which is still blocked.
+        inflight = cache.refresh("nitrate")
+        assert not inflight.done()
+        release.set()
+        assert inflight.result(1.0) == 42.0
+        assert len(calls) == 1
+        assert cache.get("nitrate").quality is Quality.FRESH
+        assert registry.get("aq.nitrate") == 42.0
+
+
+def test_stale_value_served_while_revalidating_and_errors_flagged():
+    clock = _Clock()
+    values = iter([7.0])
+    with ReadingCache(ttl=2.0, clock=clock) as cache:
+        cache.register("orp", lambda: next(values, None))
+        cache.refresh("orp", wait=True)
+
+        clock.now = 5.0
+        stale = cache.get("orp")
+        assert (stale.value, stale.quality) == (7.0, Quality.STALE)
+        cache.refresh("orp", wait=True)
+        failed = cache.get("orp")
+        assert (failed.value, failed.quality) == (7.0, Quality.STALE)
+        assert failed.error == "no reading"
+
+
+def test_nutrient_cache_polls_both_probes_once_on_a_shared_pool(monkeypatch):
+    for name in ("NITRATE_PROBE", "ORP_PROBE"):
+        probe = getattr(cache_module, name)
+        monkeypatch.setattr(
+            cache_module, name, replace(probe, conversion_s=0.0)
+        )
+    opened = []
+
+    def factory(bus):
+        opened.append(FakeBus({0x64: "12.5", 0x62: "240"}))
+        return opened[-1]
+
+    registry = StateRegistry()
+    with BusPool(factory) as pool:
+        with nutrient_cache(registry, ttl=60.0, pool=pool) as cache:
+            cache.refresh_all(wait=True, timeout=1.0)
+            assert cache.value("nitrate") == 12.5
+            assert cache.value("orp") == 240.0
+        assert len(opened) == 1
+        # One poll: a single read command per probe.
+        assert sorted(opened[0].writes) == [(0x62, ord("R")), (0x64, ord("R"))]
+        assert not opened[0].closed  # a caller's pool stays open
+    assert registry.get("aq.nitrate") == 12.5
+
+
+def test_close_runs_on_close_callbacks():
+    closed = []
+    with ReadingCache(on_close=[lambda: closed.append("pool")]) as cache:
+        cache.register("orp", lambda: 1.0)
+        cache.refresh("orp", wait=True)
+        assert closed == []
+    assert closed == ["pool"]
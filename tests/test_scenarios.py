@@ -0,0 +1,112 @@
+import csv
+import json
+import sys
+
+import pytest
+
+from les.optimizer import (
+    RotationState,
+    compile_model,
+    solve,
+)
+from les.optimizer.scenarios import (
+    _WORKER,
+    Scenario,
+    _attach,
+    _share_model,
+    main,
+    run_sweep,
+    write_results,
+)
+
+
+def test_sweep_matches_individual_solves_in_worker_pool(rotation_problem):
+    problem = rotation_problem(horizon=5)
+    scenarios = [
+        Scenario("base", RotationState(3, 3, 3, 1, 1)),
+        Scenario(
+            "cheap-beans", RotationState(3, 3, 3, 1, 1), prices={"Beans": 1.0}
+        ),
+        Scenario(
+            "poor-soil",
+            RotationState(2, 2, 2, 0, 0),
+            yields={"Tomato": [10, 10]},
+        ),
+    ]
+
+    serial = list(run_sweep(problem, scenarios, first_k=2, workers=1))
+    pooled = list(run_sweep(problem, scenarios, first_k=2, workers=2))
+    assert pooled == serial
+
+    for scenario, row in zip(scenarios, serial):
+        expected = solve(scenario.apply(problem)).value_of(scenario.initial)
+        assert row[0] == scenario.name
+        assert row[1] == pytest.approx(expected)
+
+
+def test_cli_streams_csv_and_reports_throughput(tmp_path, capsys):
+    problem_file = tmp_path / "problem.json"
+    problem_file.write_text(json.dumps({
+        "prices": {"Beans": 7.0, "CoverCrop": 0.0},
+        "family": {"Beans": "Legume", "CoverCrop": "Cover"},
+        "yields": {"Beans": [45, 55], "CoverCrop": [0]},
+        "costs": {"Beans": [130, 135], "CoverCrop": [70]},
+        "soil_delta": {"Beans": [0, -1, 0], "CoverCrop": [2, 2, 1]},
+        "disease_delta": {"Beans": -1, "CoverCrop": -2},
+        "resource_delta": {"Beans": [2, 1], "CoverCrop": [1, 2]},
+        "horizon": 4,
+        "bounds": {"min_n": 2, "min_c": 2, "min_s": 2, "max_d": 5},
+    }))
+    scenario_file = tmp_path / "scenarios.jsonl"
+    scenario_file.write_text(
+        json.dumps({"name": "a", "initial": [4, 4, 4, 1, 2]})
+        + "\n"
+        + json.dumps(
+            {"name": "b", "initial": [4, 4, 4, 1, 2], "prices": {"Beans": 9.0}}
+        )
+        + "\n"
+    )
+    output = tmp_path / "out.csv"
+
+    stats = main([
+        str(problem_file), str(scenario_file), "--output", str(output),
+        "--workers", "1", "--first-k", "3",
+    ])
+
+    assert stats.scenarios == 2
+    assert "scenarios/s" in capsys.readouterr().out
+    with output.open() as f:
+        rows = list(csv.DictReader(f))
+    assert [row["scenario"] for row in rows] == ["a", "b"]
+    assert float(rows[1]["total_profit"]) > float(rows[0]["total_profit"])
+    assert rows[0]["action_1"] in {"Beans", "CoverCrop"}
+
+
+def test_worker_model_views_shared_pairs_without_copies(rotation_problem):
+    problem = rotation_problem(horizon=5)
+    model = compile_model(problem)
+    shm, layout = _share_model(model)
+    try:
+        _attach(problem, shm.name, layout)
+        shared = _WORKER["model"]
+        assert not shared.next_state.flags.owndata
+        for (src, dst), (s_src, s_dst) in zip(
+            model.feasible_pairs, shared.feasible_pairs
+        ):
+            assert not s_src.flags.owndata and not s_dst.flags.owndata
+            assert (src == s_src).all() and (dst == s_dst).all()
+    finally:
+        _WORKER.clear()
+        shm.close()
+        shm.unlink()
+
+
+def test_parquet_output_falls_back_to_csv_and_reports_it(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    count, written = write_results(
+        [["a", 1.0]], tmp_path / "out.parquet", ["scenario", "v"]
+    )
+    assert count == 1 and written == tmp_path / "out.csv"
+    assert written.read_text().splitlines() == ["scenario,v", "a,1.0"]
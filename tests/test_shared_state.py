@@ -0,0 +1,51 @@
+import multiprocessing
+
+import pytest
+
+from les.shared_state import ORDERED_STORES, SharedStateRegistry
+from les.state import StateRegistry
+
+
+def test_attach_reads_schema_and_shares_values():
+    local = StateRegistry()
+    local.declare('aq.nitrate', 40.0, units='mg/L')
+    local.declare('pumps.on', dtype='int')
+    with SharedStateRegistry.from_registry(local) as shared:
+        other = SharedStateRegistry.attach(shared.name)
+        assert [v.units for v in other.variables] == ['mg/L', '']
+        assert other.get('aq.nitrate') == 40.0
+        assert other.get('pumps.on') is None
+
+        shared.update({'aq.nitrate': 55.5, 'pumps.on': 2})
+        assert other.snapshot() == {'aq.nitrate': 55.5, 'pumps.on': 2}
+        assert other.version('pumps.on') == 2
+        with pytest.raises(KeyError):
+            other.set('aq.orp', 1.0)
+        other.close()
+
+
+def _writer(name, count):
+    shared = SharedStateRegistry.attach(name)
+    for i in range(count):
+        shared.update({'a': float(i), 'b': float(-i)})
+    shared.close()
+
+
+@pytest.mark.skipif(
+    not ORDERED_STORES, reason="the seqlock needs x86 store ordering"
+)
+def test_snapshots_are_consistent_across_processes():
+    with SharedStateRegistry.create(['a', 'b']) as shared:
+        shared.update({'a': 0.0, 'b': 0.0})
+        proc = multiprocessing.Process(
+            target=_writer, args=(shared.name, 20_000)
+        )
+        proc.start()
+        seen = 0
+        while proc.is_alive():
+            snap = shared.snapshot()
+            assert snap['a'] == -snap['b']
+            seen += 1
+        proc.join()
+        assert proc.exitcode == 0
+        assert shared.get('a') == 19_999.0 and seen > 0
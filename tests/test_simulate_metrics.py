@@ -1,9 +1,16 @@
+import pytest
+
 from les_core import (
+    FixedRateScheduler,
     simulate,
     water_ph,
     dissolved_oxygen,
     simulation_steps_total,
     simulation_throughput,
+    simulation_overruns_total,
+    simulation_step_latency_p50,
+    simulation_step_latency_p99,
+    simulation_tick_lag,
 )
 
 
@@ -19,3 +26,62 @@ def test_simulate_updates_metrics():
     assert dissolved_oxygen._value.get() != initial_oxygen
     assert simulation_steps_total._value.get() > initial_steps
     assert simulation_throughput._value.get() != initial_throughput
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.starts: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_scheduler_keeps_absolute_deadlines_and_counts_overruns():
+    clock = _FakeClock()
+    scheduler = FixedRateScheduler(1.0, clock=clock, sleep=clock.sleep)
+    durations = iter([0.3, 0.3, 2.5, 0.3, 0.3] + [0.01] * 95)
+
+    def step():
+        clock.starts.append(clock.now)
+        clock.now += next(durations)
+
+    for _ in range(100):
+        scheduler.run_step(step)
+
+    # The 2.5 s step misses two ticks; every other step starts on the grid.
+    assert clock.starts[:5] == [100.0, 101.0, 102.0, 105.0, 106.0]
+    assert clock.starts[-1] == 201.0
+    assert scheduler.overruns == 1
+    p50, p99 = scheduler.latency_percentiles(0.5, 0.99)
+    assert p50 == pytest.approx(0.01) and p99 == pytest.approx(0.3)
+
+
+def test_free_running_simulate_exports_scheduler_metrics():
+    overruns = simulation_overruns_total._value.get()
+    scheduler = simulate(iterations=5, delay=0)
+    assert scheduler.ticks == 5
+    p50 = simulation_step_latency_p50._value.get()
+    assert simulation_step_latency_p99._value.get() >= p50
+    assert simulation_tick_lag._value.get() == 0.0
+    assert simulation_overruns_total._value.get() == overruns
+
+
+def test_free_running_simulate_computes_percentiles_at_report_interval(
+    monkeypatch,
+):
+    scheduler = FixedRateScheduler(0)
+    calls = []
+    percentiles = scheduler.latency_percentiles
+
+    def counted(*qs):
+        calls.append(scheduler.ticks)
+        return percentiles(*qs)
+
+    monkeypatch.setattr(scheduler, "latency_percentiles", counted)
+    simulate(iterations=2000, scheduler=scheduler, report_interval=60.0)
+    # Once on the first step and once after the last one.
+    assert calls == [1, 2000]
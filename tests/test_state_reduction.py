@@ -1,11 +1,27 @@
+import random
+
+import numpy as np
+
 from les_state_reduction import (
+    AdaptiveBuckets,
     BucketConfig,
+    BucketLattice,
+    QuantileBucketConfig,
+    QuantileSketch,
+    SoilBatch,
     SoilBounds,
     SoilBuckets,
     SoilDelta,
+    apply_soil_delta_batch,
     apply_soil_delta_guarded,
+    apply_soil_delta_guarded_batch,
+    check_monotone_lattice,
     check_monotone_transition,
+    compile_soil_transitions,
     enumerate_bucket_states,
+    iter_bucket_states,
+    reduce_raw_soil,
+    reduce_raw_soil_arrays,
 )
 
 
@@ -55,3 +71,225 @@ def test_monotone_transition_detects_violation() -> None:
 
     violations = check_monotone_transition(states, transition)
     assert violations
+
+
+def test_compiled_soil_transitions_match_guarded_apply() -> None:
+    limits = {"n": 3, "c": 3, "s": 3, "d": 3}
+    bounds = SoilBounds(min_n=1, min_c=1, min_s=0, max_d=2)
+    deltas = [
+        SoilDelta(dn=-1, dc=-1, ds=0, dd=1),
+        SoilDelta(dn=2, dc=1, ds=1, dd=-2),
+    ]
+    compiled = compile_soil_transitions(deltas, limits, bounds)
+
+    for state in enumerate_bucket_states(limits, families=[0]):
+        for action, delta in enumerate(deltas):
+            try:
+                updated = apply_soil_delta_guarded(
+                    state, delta, limits, bounds
+                )
+                expected = (updated.n, updated.c, updated.s, updated.d)
+            except ValueError:
+                expected = None
+            assert (
+                compiled.step(state.n, state.c, state.s, state.d, action)
+                == expected
+            )
+
+    assert compile_soil_transitions(deltas, dict(limits), bounds) is compiled
+
+
+def test_bucketize_array_matches_scalar_semantics() -> None:
+    cfg = BucketConfig(min_value=-1.5, max_value=7.25, buckets=7)
+    values = np.concatenate([
+        np.linspace(-3.0, 9.0, 1001),
+        [np.nan, np.inf, -np.inf, -1.5, 7.25, 0.0],
+    ])
+    buckets = cfg.bucketize_array(values)
+    assert buckets.dtype == np.int8
+    assert buckets.tolist() == [cfg.bucketize(float(v)) for v in values]
+    midpoints = [cfg.midpoint(int(b)) for b in buckets]
+    assert cfg.midpoint_array(buckets).tolist() == midpoints
+    assert BucketConfig(0.0, 1.0, 1).bucketize_array(values).max() == 0
+
+
+def test_reduce_raw_soil_arrays_chunked_matches_scalar(tmp_path) -> None:
+    configs = {
+        "n": BucketConfig(0.0, 50.0, 6),
+        "c": BucketConfig(0.0, 5.0, 6),
+        "s": BucketConfig(0.0, 30.0, 6),
+        "d": BucketConfig(0.0, 1.0, 6),
+    }
+    rng = np.random.default_rng(0)
+    raw = {
+        "n": rng.uniform(-5, 55, (37, 41)),
+        "c": rng.uniform(-1, 6, (37, 41)),
+    }
+    mapped = np.lib.format.open_memmap(
+        tmp_path / "s.npy", mode="w+", shape=(37, 41)
+    )
+    mapped[:] = rng.uniform(-3, 33, (37, 41))
+    raw["s"] = mapped
+
+    whole = reduce_raw_soil_arrays(raw, configs)
+    chunked = reduce_raw_soil_arrays(raw, configs, chunk_size=100)
+    for name in "ncsd":
+        assert np.array_equal(whole[name], chunked[name])
+    for i, j in [(0, 0), (5, 17), (36, 40)]:
+        cell = {k: float(v[i, j]) for k, v in raw.items()}
+        scalar = reduce_raw_soil(cell, configs)
+        assert (scalar.n, scalar.c, scalar.s, scalar.d) == tuple(
+            int(whole[name][i, j]) for name in "ncsd"
+        )
+
+
+def test_lattice_checker_agrees_with_pairwise_checker() -> None:
+    limits = {"n": 2, "c": 1, "s": 2, "d": 2}
+    families = [0, 1]
+    states = enumerate_bucket_states(limits, families)
+    calls = []
+
+    def monotone(s: SoilBuckets) -> SoilBuckets:
+        calls.append(s)
+        return SoilBuckets(
+            n=min(2, s.n + 1), c=s.c, s=max(0, s.s - 1), d=s.d // 2, f=s.f
+        )
+
+    def dips(s: SoilBuckets) -> SoilBuckets:
+        n = 0 if s.s == 2 and s.d == 1 else s.n
+        return SoilBuckets(n=n, c=s.c, s=s.s, d=s.d, f=s.f)
+
+    report = check_monotone_lattice(limits, monotone, families)
+    assert report.ok
+    assert report.transitions_evaluated == len(states) == len(calls)
+    assert not check_monotone_transition(states, monotone)
+
+    report = check_monotone_lattice(limits, dips, families)
+    assert not report.ok and check_monotone_transition(states, dips)
+    for a, b in report.violations:
+        assert sum(abs(x - y) for x, y in zip(a.as_tuple(), b.as_tuple())) == 1
+
+
+def test_lattice_checker_vectorized_matches_scalar() -> None:
+    limits = {"n": 3, "c": 2, "s": 2, "d": 3}
+
+    def scalar(s: SoilBuckets) -> SoilBuckets:
+        return SoilBuckets(n=s.n, c=s.c, s=s.s, d=(s.d * s.f + 1) % 4, f=s.f)
+
+    def vectorized(states: np.ndarray) -> np.ndarray:
+        out = states.copy()
+        out[:, 3] = (states[:, 3] * states[:, 4] + 1) % 4
+        return out
+
+    expected = check_monotone_lattice(limits, scalar, [0, 1])
+    report = check_monotone_lattice(
+        limits, vectorized, [0, 1], vectorized=True
+    )
+    assert sorted(report.violations, key=str) == sorted(
+        expected.violations, key=str
+    )
+    assert report.pairs_checked == expected.pairs_checked
+
+
+def test_bucket_lattice_codes_follow_enumeration_order() -> None:
+    limits = {"n": 2, "c": 1, "s": 3, "d": 1}
+    families = [3, 0, 7]
+    states = enumerate_bucket_states(limits, families)
+    lattice = BucketLattice.from_limits(limits, families)
+    assert len(lattice) == len(states)
+    assert list(iter_bucket_states(limits, families)) == states
+    codes = list(range(len(states)))
+    assert [lattice.encode(state) for state in states] == codes
+    assert list(lattice.iter_states(10, 25)) == states[10:25]
+    shards = [lattice.shard(i, 4) for i in range(4)]
+    assert [code for shard in shards for code in shard] == codes
+    assert not hasattr(states[0], "__dict__")
+
+
+def test_bucket_lattice_array_codec_round_trips() -> None:
+    limits = {"n": 5, "c": 5, "s": 5, "d": 5}
+    lattice = BucketLattice.from_limits(limits, families=range(5))
+    codes = np.arange(3, len(lattice), 97)
+    cols = lattice.columns(codes)
+    assert cols["n"].base is cols["f"].base
+    encoded = lattice.encode_array(*(cols[name] for name in "ncsdf"))
+    assert np.array_equal(encoded, codes)
+    assert [tuple(row) for row in lattice.decode_array(codes)] == [
+        lattice.decode(int(code)).as_tuple() for code in codes
+    ]
+
+
+def test_soil_batch_guarded_deltas_match_scalar_per_cell() -> None:
+    limits = {"n": 3, "c": 3, "s": 2, "d": 3}
+    bounds = SoilBounds(min_n=1, min_c=0, min_s=1, max_d=2)
+    palette = [
+        SoilDelta(dn=-1, dc=-1, ds=0, dd=1),
+        SoilDelta(dn=2, dc=1, ds=1, dd=-2),
+    ]
+    states = enumerate_bucket_states(limits, families=[0, 1])
+    actions = np.arange(len(states)) % len(palette)
+    batch = SoilBatch.from_states(states)
+
+    updated, ok = apply_soil_delta_guarded_batch(
+        batch, palette, limits, bounds, actions
+    )
+    for i, (state, action) in enumerate(zip(states, actions)):
+        try:
+            expected = apply_soil_delta_guarded(
+                state, palette[action], limits, bounds
+            )
+            assert ok[i]
+        except ValueError:
+            expected = state
+            assert not ok[i]
+        assert updated.state(i) == expected
+    assert updated.n.dtype == np.int8
+
+
+def test_soil_batch_single_delta_broadcasts() -> None:
+    batch = SoilBatch(*(np.zeros((4, 5), dtype=np.int8) for _ in range(5)))
+    limits = {"n": 5, "c": 5, "s": 5, "d": 5}
+    moved = apply_soil_delta_batch(batch, SoilDelta(dn=9, dc=1, ds=-1), limits)
+    assert moved.n.shape == (4, 5)
+    assert (moved.n == 5).all()
+    assert (moved.c == 1).all()
+    assert (moved.s == 0).all()
+
+
+def test_quantile_sketch_tracks_skewed_readings() -> None:
+    rng = random.Random(1)
+    values = [rng.lognormvariate(0.0, 1.5) for _ in range(50_000)]
+    sketch = QuantileSketch(k=200, seed=1)
+    sketch.extend(values)
+    assert sketch.retained < 2_000
+    ordered = sorted(values)
+    for q in (0.1, 0.5, 0.9, 0.99):
+        rank = ordered.index(sketch.quantile(q)) / len(ordered)
+        assert abs(rank - q) < 0.02
+
+    config = QuantileBucketConfig.from_sketch(sketch, buckets=8)
+    counts = np.bincount(
+        config.bucketize_array(values), minlength=config.buckets
+    )
+    assert config.buckets == 8
+    assert counts.min() > 0.8 * len(values) / 8
+    assert config.bucketize_array(values[:500]).tolist() == [
+        config.bucketize(v) for v in values[:500]
+    ]
+
+
+def test_quantile_buckets_refine_and_adaptive_refit() -> None:
+    config = QuantileBucketConfig(0.0, 10.0, edges=(1.0, 4.0))
+    values = (-1, 0.5, 1.0, 3.9, 4.0, 99)
+    assert [config.bucketize(v) for v in values] == [0, 0, 1, 1, 2, 2]
+    assert config.refine(2).edges == (0.5, 1.0, 2.5, 4.0, 7.0)
+    assert config.midpoint(2) == 7.0
+
+    adaptive = AdaptiveBuckets(
+        BucketConfig(0.0, 100.0, 4), refit_every=1000, seed=0
+    )
+    for i in range(2500):
+        adaptive.observe((i % 100) ** 2 / 100)
+    assert adaptive.version == 2
+    assert isinstance(adaptive.config, QuantileBucketConfig)
+    assert adaptive.config.edges[0] < 10.0  # mass sits near zero
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import timeit
+
 import pytest
 
 from les.state import StateRegistry
@@ -18,3 +22,172 @@ def test_state_registry_set_updates_and_error_on_unregistered():
         registry.set('bar', 3)
     with pytest.raises(KeyError):
         registry.get('bar')
+
+
+def test_declared_variables_use_slots_and_keep_key_access():
+    registry = StateRegistry()
+    registry.register('mode', 'auto')
+    temp = registry.declare('aq.temp', 21.5, units='degC', low=10.0, high=30.0)
+    pumps = registry.declare('pumps.on', dtype='int')
+
+    assert registry.declare('aq.temp') == temp
+    assert registry.get('pumps.on') is None
+    registry.set_slot(pumps, 3)
+    registry.set('aq.temp', 35.0)
+    assert registry.get_slot(temp) == 35.0
+    assert registry.get('pumps.on') == 3
+    assert isinstance(registry.get('pumps.on'), int)
+    assert registry.get('mode') == 'auto'
+    assert registry.variable('aq.temp').units == 'degC'
+    assert registry.out_of_range() == ['aq.temp']
+
+    view = registry.as_array()
+    registry.set_slots([temp, pumps], [20.0, 4.0])
+    assert view[temp] == 20.0
+    assert registry.get('aq.temp') == 20.0
+    assert registry.get('pumps.on') == 4
+    with pytest.raises(ValueError):
+        view[temp] = 99.0
+    with pytest.raises(TypeError):
+        registry.values[temp] = 99.0
+    with pytest.raises(KeyError):
+        registry.slot('mode')
+
+
+def test_declare_adopts_registered_value():
+    registry = StateRegistry()
+    registry.register('foo', 4)
+    slot = registry.declare('foo')
+    assert registry.get_slot(slot) == 4.0
+    with pytest.raises(ValueError):
+        registry.declare('bar', dtype='complex')
+
+
+def test_declare_grows_the_buffer_in_place_unless_viewed():
+    registry = StateRegistry()
+    values = registry._values
+    for i in range(100):
+        registry.declare(f'v{i}', float(i))
+    assert registry._values is values and len(values) == 100
+
+    view = registry.as_array()
+    slot = registry.declare('extra', 1.0)  # copies instead of failing
+    assert registry.get_slot(slot) == 1.0 and len(view) == 100
+
+
+def test_versions_dirty_set_and_changes_since():
+    registry = StateRegistry()
+    registry.register('aq.ph', 7.0)
+    slot = registry.declare('aq.temp', 20.0)
+    start = registry.version
+    registry.set('aq.ph', 7.2)
+    registry.set_slot(slot, 21.0)
+    registry.set('aq.ph', 7.1)
+
+    assert registry.changes_since(start) == ['aq.temp', 'aq.ph']
+    assert registry.version_of('aq.ph') == registry.version
+    assert registry.clear_dirty() == {'aq.ph', 'aq.temp'}
+    assert registry.dirty == set()
+
+
+def test_prefix_subscriptions_and_async_queue():
+    registry = StateRegistry()
+    registry.register('aq.nitrate')
+    registry.register('pumps.flow')
+    seen = []
+    sub = registry.subscribe(
+        'aq.*', lambda key, value, version: seen.append((key, value))
+    )
+
+    async def consume():
+        queue = asyncio.Queue()
+        registry.subscribe_queue('pumps.flow', queue)
+        registry.set('pumps.flow', 3.5)
+        assert queue.empty()  # delivered when changes are collected
+        registry.publish()
+        return await asyncio.wait_for(queue.get(), 1.0)
+
+    key, value, version = asyncio.run(consume())
+    registry.set('aq.nitrate', 12.0)
+    assert registry.publish() == 1
+    sub.unsubscribe()
+    registry.set('aq.nitrate', 13.0)
+
+    expected = ('pumps.flow', 3.5, registry.version_of('pumps.flow'))
+    assert (key, value, version) == expected
+    assert seen == [('aq.nitrate', 12.0)]
+
+
+class _DictRegistry:
+    """The registry's write path before typed slots and change tracking."""
+
+    def __init__(self):
+        self._state = {'aq.ph': 7.0}
+
+    def set(self, key, value):
+        if key not in self._state:
+            raise KeyError(f"Variable {key!r} is not registered")
+        self._state[key] = value
+
+
+def test_writes_defer_stamping_and_notification_to_collection():
+    registry = StateRegistry()
+    slot = registry.declare('aq.ph', 7.0)
+    calls = []
+    registry.subscribe('aq.*', lambda key, value, version: calls.append(value))
+    start = registry._version
+    for i in range(2000):
+        registry.set_slot(slot, 7.0 + i / 1000)
+    assert calls == [] and registry._version == start
+    assert registry.publish() == 1
+    assert calls == [8.999]
+    assert registry.version == start + 1
+
+
+@pytest.mark.benchmark
+def test_set_slot_is_not_slower_than_the_old_dict_set():
+    old = _DictRegistry()
+    registry = StateRegistry()
+    slot = registry.declare('aq.ph', 7.0)
+    registry.subscribe('aq.*', lambda key, value, version: None)
+    old_set, set_slot = old.set, registry.set_slot
+    old_best = slot_best = float('inf')
+    for _ in range(30):  # interleaved best-of runs to ride out noise
+        old_best = min(old_best, timeit.timeit(
+            "old_set('aq.ph', 7.1)", globals=locals(), number=2000
+        ))
+        slot_best = min(slot_best, timeit.timeit(
+            "set_slot(slot, 7.1)", globals=locals(), number=2000
+        ))
+    # Eager version stamping and fan-out made this over 4x slower.
+    assert slot_best < 2 * old_best
+
+
+def test_writer_threads_race_with_collection_without_losing_changes():
+    registry = StateRegistry()
+    slots = [registry.declare(f'aq.s{i}', 0.0) for i in range(8)]
+    for i in range(8):
+        registry.register(f'pumps.p{i}', 0)
+    seen = set()
+    registry.clear_dirty()
+
+    def writer(i):
+        for n in range(2000):
+            registry.set_slot(slots[i], float(n))
+            registry.set(f'pumps.p{i}', n)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        seen |= registry.clear_dirty()
+        registry.changes_since(0)
+    for thread in threads:
+        thread.join()
+    seen |= registry.clear_dirty()
+
+    assert len(seen) == 16
+    versions = [registry.version_of(key) for key in registry.changes_since(0)]
+    assert versions == sorted(set(versions))
+    assert versions[-1] == registry.version
+    assert registry.get('aq.s3') == 1999.0 and registry.get('pumps.p5') == 1999
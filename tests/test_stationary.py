@@ -0,0 +1,59 @@
+from dataclasses import replace
+
+import pytest
+
+from les.optimizer import (
+    RotationState,
+    seasonal_period,
+    solve,
+    solve_stationary,
+)
+
+
+def _expanded(problem):
+    # Cycles are stored pre-expanded over the horizon.
+    crops = tuple(
+        replace(crop, yields=crop.yields * 4, costs=crop.costs * 4)
+        for crop in problem.crops
+    )
+    return replace(problem, crops=crops)
+
+
+def test_seasonal_period_folds_expanded_series(rotation_problem):
+    assert seasonal_period(_expanded(rotation_problem(8))) == 2
+
+
+def test_average_reward_gain_matches_long_horizon_dp(rotation_problem):
+    problem = _expanded(rotation_problem(horizon=120))
+    initial = RotationState(3, 3, 3, 1, 1)
+    stationary = solve_stationary(problem, average_reward=True)
+
+    assert stationary.converged
+    assert stationary.policy.shape[0] == 2
+    finite = solve(problem).value_of(initial)
+    assert stationary.gain == pytest.approx(finite / problem.horizon, rel=0.05)
+
+    plan = stationary.plan(initial, horizon=400)
+    assert len(plan) == 400
+    assert all(
+        step.state == prev.next_state for prev, step in zip(plan, plan[1:])
+    )
+
+
+def test_discounted_policy_is_greedy_in_its_own_values(rotation_problem):
+    problem = _expanded(rotation_problem(8))
+    stationary = solve_stationary(problem, discount=0.9, tol=1e-9)
+    assert stationary.converged
+
+    model = stationary.model
+    state = RotationState(3, 3, 3, 1, 1)
+    code = model.encode(state)
+    q = []
+    for a in range(len(problem.crops)):
+        nxt = model.next_state[a, code]
+        if nxt >= 0:
+            q.append(
+                (stationary.rewards[0, a] + 0.9 * stationary.value[1, nxt], a)
+            )
+    assert stationary.action(state, t=0) == max(q)[1]
+    assert stationary.value[0, code] == pytest.approx(max(q)[0])